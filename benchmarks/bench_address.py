@@ -0,0 +1,102 @@
+'''
+Container throughput with SHA-512 (address algo 1) against BLAKE2b-512
+(address algo 2), for making, unpacking and verifying containers of
+various sizes.
+
+Run from the repository root:
+    python benchmarks/bench_address.py
+
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+
+import sys
+import timeit
+
+from golix.cipher import FirstParty2
+from golix.cipher import ThirdParty2
+
+
+SIZES = (4 << 10, 1 << 20, 16 << 20)
+
+
+def _throughput(func, size, number):
+    elapsed = min(timeit.repeat(func, number=number, repeat=3))
+    return size * number / elapsed / (1 << 20)
+    
+    
+def _operations(address_algo, size):
+    author = FirstParty2(address_algo=address_algo)
+    thirdparty = ThirdParty2()
+    secret = author.new_secret()
+    payload = bytes(size)
+    packed = bytes(author.make_container(secret, payload).packed)
+    
+    return (
+        lambda: author.make_container(secret, payload),
+        lambda: thirdparty.verify_object(
+            author.second_party,
+            thirdparty.unpack_container(packed)
+        )
+    )
+    
+    
+def main(number=5):
+    print('Container MiB/s ({} iterations, best of 3)'.format(number))
+    print(
+        '{:>9} {:>10} {:>10} {:>8} {:>10} {:>10} {:>8}'.format(
+            'payload', 'sha make', 'b2 make', 'speedup',
+            'sha load', 'b2 load', 'speedup'
+        )
+    )
+    
+    for size in SIZES:
+        make_1, load_1 = _operations(1, size)
+        make_2, load_2 = _operations(2, size)
+        rates = [
+            _throughput(op, size, number)
+            for op in (make_1, make_2, load_1, load_2)
+        ]
+        print(
+            '{:>8}K {:>10,.1f} {:>10,.1f} {:>7.2f}x {:>10,.1f} {:>10,.1f} '
+            '{:>7.2f}x'.format(
+                size >> 10,
+                rates[0], rates[1], rates[1] / rates[0],
+                rates[2], rates[3], rates[3] / rates[2]
+            )
+        )
+        
+        
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,142 @@
+'''
+Ciphersuite 1 (RSA-4096, Curve25519, AES-CTR) against ciphersuite 2
+(Ed25519, X25519, AES-GCM): identity creation, signing, verification,
+request sealing, and container round trips.
+
+Run from the repository root:
+    python benchmarks/bench_ciphersuites.py
+
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+
+import sys
+import time
+import timeit
+import warnings
+
+from golix import Ghid
+from golix.cipher import FirstParty1
+from golix.cipher import ThirdParty1
+from golix.cipher import FirstParty2
+from golix.cipher import ThirdParty2
+
+
+# Suite 1 uses the deprecated signer/verifier API; don't spam the output.
+warnings.simplefilter('ignore')
+
+
+def _rate(func, number):
+    elapsed = min(timeit.repeat(func, number=number, repeat=3))
+    return number / elapsed
+    
+    
+def _operations(first_cls, third_cls):
+    ''' Returns a list of (name, callable) for the suite.
+    '''
+    sender = first_cls()
+    recipient = first_cls()
+    thirdparty = third_cls()
+    secret = sender.new_secret()
+    payload = b'0' * 4096
+    
+    gobs = sender.make_bind_static(target=Ghid.pseudorandom(1))
+    gobs = thirdparty.unpack_bind_static(gobs.packed)
+    container = sender.make_container(secret, payload)
+    garq = sender.make_request(
+        recipient.second_party,
+        sender.make_ack(target=Ghid.pseudorandom(1))
+    )
+    
+    return [
+        ('sign', lambda: sender.make_bind_static(
+            target = Ghid.pseudorandom(1)
+        )),
+        ('verify', lambda: thirdparty.verify_object(
+            sender.second_party, gobs
+        )),
+        ('container', lambda: sender.make_container(secret, payload)),
+        ('receive', lambda: recipient.receive_container(
+            sender.second_party, secret,
+            recipient.unpack_container(container.packed)
+        )),
+        ('request', lambda: sender.make_request(
+            recipient.second_party,
+            sender.make_ack(target=Ghid.pseudorandom(1))
+        )),
+        ('open req', lambda: recipient.receive_request(
+            sender.second_party,
+            recipient.unpack_request(garq.packed)
+        )),
+    ]
+    
+    
+def _keygen_rate(first_cls, number):
+    start = time.perf_counter()
+    for __ in range(number):
+        first_cls()
+    return number / (time.perf_counter() - start)
+    
+    
+def main(number=50):
+    print('Operations per second ({} iterations, best of 3)'.format(number))
+    print(
+        '{:<10} {:>14} {:>14} {:>8}'.format(
+            'operation', 'suite 1', 'suite 2', 'speedup'
+        )
+    )
+    
+    # Suite 1 keygen is slow enough that a couple of identities will do.
+    keygen_1 = _keygen_rate(FirstParty1, 2)
+    keygen_2 = _keygen_rate(FirstParty2, number)
+    print(
+        '{:<10} {:>14,.1f} {:>14,.1f} {:>7.1f}x'.format(
+            'keygen', keygen_1, keygen_2, keygen_2 / keygen_1
+        )
+    )
+    
+    suite_1 = _operations(FirstParty1, ThirdParty1)
+    suite_2 = _operations(FirstParty2, ThirdParty2)
+    for (name, op_1), (__, op_2) in zip(suite_1, suite_2):
+        rate_1 = _rate(op_1, number)
+        rate_2 = _rate(op_2, number)
+        print(
+            '{:<10} {:>14,.1f} {:>14,.1f} {:>7.1f}x'.format(
+                name, rate_1, rate_2, rate_2 / rate_1
+            )
+        )
+        
+        
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,133 @@
+'''
+Throughput comparison of the struct codec against the smartyparse parsers.
+
+Run from the repository root:
+    python benchmarks/bench_codec.py
+
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+
+import sys
+import timeit
+
+from golix import Ghid
+from golix import _getlow
+from golix.crypto_utils import _sp_lock
+from golix.crypto_utils import _dummy_signature
+from golix.crypto_utils import _dummy_mac
+from golix.crypto_utils import _dummy_asym
+from golix.crypto_utils import _dummy_pubkey
+from golix.crypto_utils import _dummy_pubkey_exchange
+
+
+def _make_objects():
+    author = Ghid.pseudorandom(1)
+    target = Ghid.pseudorandom(1)
+    
+    gidc = _getlow.GIDC(
+        signature_key = _dummy_pubkey,
+        encryption_key = _dummy_pubkey,
+        exchange_key = _dummy_pubkey_exchange,
+    )
+    gidc.pack(cipher=1, address_algo=1)
+    objs = [gidc]
+    
+    for obj in (
+        _getlow.GEOC(author=author, payload=b'0' * 1024),
+        _getlow.GOBS(binder=author, target=target),
+        _getlow.GOBD(
+            binder = author,
+            counter = 3,
+            target_vector = (target, Ghid.pseudorandom(1)),
+            ghid_dynamic = Ghid.pseudorandom(1)
+        ),
+        _getlow.GDXX(debinder=author, target=target)
+    ):
+        obj.pack(cipher=1, address_algo=1)
+        obj.pack_signature(_dummy_signature)
+        objs.append(obj)
+        
+    garq = _getlow.GARQ(recipient=author, payload=_dummy_asym)
+    garq.pack(cipher=1, address_algo=1)
+    garq.pack_signature(_dummy_mac)
+    objs.append(garq)
+    return objs
+    
+    
+def _sp_pack(obj):
+    with _sp_lock:
+        return obj.PARSER.pack(obj._control)
+    
+    
+def _sp_unpack(obj, packed):
+    with _sp_lock:
+        return obj.PARSER.unpack(packed)
+    
+    
+def _rate(func, number):
+    elapsed = min(timeit.repeat(func, number=number, repeat=3))
+    return number / elapsed
+    
+    
+def main(number=500):
+    objs = _make_objects()
+    
+    print('Operations per second ({} iterations, best of 3)'.format(number))
+    print(
+        '{:<6} {:>14} {:>14} {:>8} {:>14} {:>14} {:>8}'.format(
+            'format', 'sp pack', 'struct pack', 'speedup',
+            'sp unpack', 'struct unpack', 'speedup'
+        )
+    )
+    
+    for obj in objs:
+        packed = bytes(obj.packed)
+        sp_pack = _rate(lambda: _sp_pack(obj), number)
+        st_pack = _rate(lambda: obj.CODEC.pack(obj._control), number)
+        sp_unpack = _rate(lambda: _sp_unpack(obj, packed), number)
+        st_unpack = _rate(lambda: obj.CODEC.unpack(packed), number)
+        
+        print(
+            '{:<6} {:>14,.0f} {:>14,.0f} {:>7.1f}x {:>14,.0f} {:>14,.0f} '
+            '{:>7.1f}x'.format(
+                obj.magic.decode(),
+                sp_pack, st_pack, st_pack / sp_pack,
+                sp_unpack, st_unpack, st_unpack / sp_unpack
+            )
+        )
+        
+        
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
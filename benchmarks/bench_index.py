@@ -0,0 +1,129 @@
+'''
+The mmapped GhidIndex against the dict-of-Ghid baseline: memory per
+entry, lookup rate, and time to load on restart (unpickling, for the
+dict).
+
+Run from the repository root:
+    python benchmarks/bench_index.py [entries]
+
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+
+import os
+import sys
+import time
+import pickle
+import random
+import tempfile
+import tracemalloc
+
+from golix import Ghid
+from golix.store import GhidIndex
+from golix.store import Location
+
+
+def _ghids(count):
+    # Ghid.pseudorandom is too slow for millions of these.
+    return [
+        Ghid(1, random.getrandbits(512).to_bytes(64, 'big'))
+        for __ in range(count)
+    ]
+    
+    
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+    
+    
+def main(count=1 << 20):
+    ghids = _ghids(count)
+    probes = random.sample(ghids, min(count, 100000))
+    location = Location(1, 2, 3, b'GEOC')
+    
+    # Baseline: Ghid objects (copies, so that their memory is counted)
+    # mapping to Locations.
+    tracemalloc.start()
+    baseline = {
+        Ghid(ghid.algo, bytes(ghid.address)): Location(1, ii, 3, b'GEOC')
+        for ii, ghid in enumerate(ghids)
+    }
+    dict_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    __, dict_lookup = _timed(lambda: [baseline[ghid] for ghid in probes])
+    pickled = pickle.dumps(baseline)
+    del baseline
+    __, dict_load = _timed(lambda: pickle.loads(pickled))
+    del pickled
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'index.gxi')
+        with GhidIndex(path, capacity=int(count / .7) + 1) as index:
+            def build():
+                for ghid in ghids:
+                    index[ghid] = location
+            __, index_build = _timed(build)
+            index_size = os.path.getsize(path)
+            
+        index, index_load = _timed(lambda: GhidIndex(path, readonly=True))
+        with index:
+            __, index_lookup = _timed(
+                lambda: [index[ghid] for ghid in probes]
+            )
+    
+    print('{:,} entries'.format(count))
+    print('{:<22} {:>14} {:>14}'.format('', 'dict of Ghid', 'GhidIndex'))
+    print('{:<22} {:>14,.0f} {:>14,.0f}'.format(
+        'bytes per entry', dict_memory / count, index_size / count
+    ))
+    print('{:<22} {:>14} {:>14}'.format(
+        '(resides in)', 'heap', 'page cache'
+    ))
+    print('{:<22} {:>14,.0f} {:>14,.0f}'.format(
+        'lookups per second',
+        len(probes) / dict_lookup,
+        len(probes) / index_lookup
+    ))
+    print('{:<22} {:>14.4f} {:>14.4f}'.format(
+        'load seconds', dict_load, index_load
+    ))
+    print('{:<22} {:>14} {:>14.2f}'.format(
+        'build seconds', '', index_build
+    ))
+    
+    
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -61,10 +61,14 @@ else:
     from .core import ThirdParty
     from .core import firstparty_factory
     from .core import thirdparty_factory
+    from .core import SecondPartyRegistry
+    from .chain import DynamicChain
     
     from . import _getlow
     from . import _spec
     from . import cipher
+    from . import aio
+    from . import store
     
     __all__ = [
         'SecurityError',
@@ -76,8 +80,12 @@ else:
         'ThirdParty',
         'firstparty_factory',
         'thirdparty_factory',
+        'SecondPartyRegistry',
+        'DynamicChain',
         'utils',
-        'cipher'
+        'cipher',
+        'aio',
+        'store'
     ]
 
 
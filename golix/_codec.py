@@ -0,0 +1,589 @@
+'''
+Struct-based wire codec for Golix objects. Byte-for-byte compatible with
+the smartyparse definitions in _spec, but without any of the per-field
+callback machinery, so it's faster, and it never mutates shared state
+(so it's safe to use from multiple threads).
+
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+import abc
+import struct
+import functools
+import collections
+
+from smartyparse import ParseError
+
+# Interpackage dependencies
+from .utils import Ghid
+from .utils import _hash_len_lookup
+from .crypto_utils import cipher_length_lookup
+
+
+# Control * imports
+__all__ = [
+    'GIDCCodec',
+    'GEOCCodec',
+    'GOBSCodec',
+    'GOBDCodec',
+    'GDXXCodec',
+    'GARQCodec'
+]
+
+
+# ###############################################
+# Primitives
+# ###############################################
+
+
+# Magic (4 bytes), version (Int32), cipher (Int8)
+_header = struct.Struct('>4sIB')
+_int64 = struct.Struct('>Q')
+_int16 = struct.Struct('>H')
+
+
+def _cipher_lengths(cipher):
+    try:
+        return cipher_length_lookup[cipher]
+    except (KeyError, TypeError):
+        raise ParseError('Unknown cipher: ' + repr(cipher)) from None
+        
+        
+def _address_length(algo):
+    try:
+        return _hash_len_lookup[algo]
+    except (KeyError, TypeError):
+        raise ParseError(
+            'Improper hash algorithm declaration: ' + repr(algo)
+        ) from None
+
+
+class TruncatedError(ParseError):
+    ''' Raised when packed data ends early. Needed is the minimum
+    length the data must have to get any further.
+    '''
+    def __init__(self, needed):
+        super().__init__('Packed data is truncated.')
+        self.needed = needed
+
+
+def _check_length(data, end):
+    if end > len(data):
+        raise TruncatedError(end)
+
+
+def _ghid_size(ghid):
+    ''' Packed size of a ghid, including its algo byte.
+    '''
+    return 1 + _address_length(ghid.algo)
+    
+    
+def _pack_ghid_into(ghid, buffer, offset):
+    address = ghid.address
+    end = offset + 1 + len(address)
+    buffer[offset] = ghid.algo
+    buffer[offset + 1:end] = address
+    return end
+    
+    
+def _pack_blob_into(data, length, buffer, offset):
+    if len(data) != length:
+        raise ParseError('Data length does not match fixed-length field.')
+    end = offset + length
+    buffer[offset:end] = data
+    return end
+    
+    
+def _unpack_ghid(data, offset):
+    _check_length(data, offset + 1)
+    algo = data[offset]
+    end = offset + 1 + _address_length(algo)
+    _check_length(data, end)
+    return Ghid(algo, data[offset + 1:end]), end
+    
+    
+def _unpack_blob(data, offset, length):
+    end = offset + length
+    _check_length(data, end)
+    return data[offset:end], end
+    
+    
+# ###############################################
+# Codecs
+# ###############################################
+
+
+# Everything about a packed object that's fixed by its format, version,
+# cipher, and address algorithm. The tail is everything after the body:
+# the ghid(s) and the signature.
+Layout = collections.namedtuple(
+    'Layout',
+    ['magic', 'version', 'cipher', 'address_algo', 'sig_length',
+     'address_length', 'tail_length']
+)
+
+
+class _CodecBase(metaclass=abc.ABCMeta):
+    ''' Packs and unpacks the same control dictionaries as the
+    smartyparse parsers in _spec. Subclasses declare the format and
+    handle the body; everything else is shared.
+    '''
+    MAGIC = None
+    VERSIONS = frozenset()
+    # The ghids between the body and the signature, in packing order.
+    TAIL_GHIDS = ('ghid',)
+    # The body ghid (always first in the body) reported by peek, if any.
+    PARTY = None
+    
+    def _get_sig_length(self, cipher):
+        return _cipher_lengths(cipher)['sig']
+    
+    @functools.lru_cache(maxsize=None)
+    def layout(self, version, cipher, address_algo):
+        ''' Returns the (cached) fixed layout for the version, cipher,
+        and address algo.
+        '''
+        self._check_version(version)
+        sig_length = self._get_sig_length(cipher)
+        address_length = _address_length(address_algo)
+        return Layout(
+            magic = self.MAGIC,
+            version = version,
+            cipher = cipher,
+            address_algo = address_algo,
+            sig_length = sig_length,
+            address_length = address_length,
+            tail_length = (
+                len(self.TAIL_GHIDS) * (1 + address_length) + sig_length
+            )
+        )
+        
+    def _check_version(self, version):
+        if version not in self.VERSIONS:
+            raise ParseError('No matching version number available.')
+    
+    @abc.abstractmethod
+    def _get_body_size(self, body, cipher):
+        ''' Returns the packed size of body.
+        '''
+        pass
+        
+    @abc.abstractmethod
+    def _pack_body_into(self, body, cipher, buffer, offset):
+        ''' Packs body into buffer at offset, returning the end offset.
+        '''
+        pass
+        
+    @abc.abstractmethod
+    def _unpack_body(self, data, offset, cipher):
+        ''' Unpacks a body from data at offset, returning the body and
+        its end offset.
+        '''
+        pass
+        
+    def packed_size(self, control):
+        ''' Returns the exact packed size of control.
+        '''
+        layout = self.layout(
+            control['version'],
+            control['cipher'],
+            control['ghid'].algo
+        )
+        return (
+            _header.size +
+            self._get_body_size(control['body'], control['cipher']) +
+            layout.tail_length
+        )
+        
+    def _measure_body(self, data, offset, cipher):
+        ''' Returns the end offset of the body in data starting at
+        offset. The body itself need not be complete, as long as its
+        length can be determined.
+        '''
+        return self._unpack_body(data, offset, cipher)[1]
+        
+    def measure(self, data):
+        ''' Returns the total packed length of the object at the start
+        of data, reading as little of it as possible. If data is too short
+        to tell, raises TruncatedError, with the length needed to continue.
+        '''
+        data = memoryview(data)
+        _check_length(data, _header.size)
+        magic, version, cipher = _header.unpack_from(data)
+        if magic != self.MAGIC:
+            raise ParseError(
+                'Mismatched magic: received ' + repr(magic) + ', expected ' +
+                repr(self.MAGIC)
+            )
+        self._check_version(version)
+        
+        offset = self._measure_body(data, _header.size, cipher)
+        # Skip the tail ghids without unpacking them
+        for name in self.TAIL_GHIDS:
+            _check_length(data, offset + 1)
+            offset += 1 + _address_length(data[offset])
+        return offset + self._get_sig_length(cipher)
+        
+    def peek(self, data, limit=None):
+        ''' Reads the header, party, and tail ghids from data, without
+        unpacking (or requiring) the rest of the body. Objects longer than
+        limit are rejected as soon as that can be determined. Returns a
+        dict with magic, version, cipher, length, and the ghid fields.
+        '''
+        data = memoryview(data)
+        _check_length(data, _header.size)
+        magic, version, cipher = _header.unpack_from(data)
+        if magic != self.MAGIC:
+            raise ParseError(
+                'Mismatched magic: received ' + repr(magic) + ', expected ' +
+                repr(self.MAGIC)
+            )
+        self._check_version(version)
+        sig_length = self._get_sig_length(cipher)
+        
+        peeked = {'magic': magic, 'version': version, 'cipher': cipher}
+        if self.PARTY is not None:
+            peeked[self.PARTY] = _unpack_ghid(data, _header.size)[0]
+            
+        offset = self._measure_body(data, _header.size, cipher)
+        if limit is not None and offset + sig_length > limit:
+            raise ParseError('Object exceeds size limit.')
+        
+        for name in self.TAIL_GHIDS:
+            peeked[name], offset = _unpack_ghid(data, offset)
+        offset += sig_length
+        if limit is not None and offset > limit:
+            raise ParseError('Object exceeds size limit.')
+        _check_length(data, offset)
+        
+        peeked['length'] = offset
+        return peeked
+        
+    def pack_into(self, control, buffer, offset=0):
+        ''' Packs control into the writable buffer, starting at offset.
+        Returns the offset of the end of the packed object.
+        '''
+        cipher = control['cipher']
+        layout = self.layout(control['version'], cipher, control['ghid'].algo)
+        
+        _header.pack_into(buffer, offset, self.MAGIC, layout.version, cipher)
+        offset = self._pack_body_into(
+            control['body'],
+            cipher,
+            buffer,
+            offset + _header.size
+        )
+        
+        for name in self.TAIL_GHIDS:
+            offset = _pack_ghid_into(control[name], buffer, offset)
+        if layout.sig_length:
+            offset = _pack_blob_into(
+                control['signature'],
+                layout.sig_length,
+                buffer,
+                offset
+            )
+            
+        return offset
+        
+    def pack(self, control):
+        ''' Packs control into a new bytearray.
+        '''
+        packed = bytearray(self.packed_size(control))
+        self.pack_into(control, packed)
+        return packed
+        
+    def unpack(self, data):
+        ''' Unpacks data into a control dictionary. Like the smartyparse
+        parsers, anything following the object is ignored. Blob fields
+        (keys, payloads, signatures) are memoryview slices of data, not
+        copies.
+        '''
+        data = memoryview(data)
+        _check_length(data, _header.size)
+        magic, version, cipher = _header.unpack_from(data)
+        
+        if magic != self.MAGIC:
+            raise ParseError(
+                'Mismatched magic: received ' + repr(magic) + ', expected ' +
+                repr(self.MAGIC)
+            )
+        self._check_version(version)
+        
+        body, offset = self._unpack_body(data, _header.size, cipher)
+        control = {
+            'magic': magic,
+            'version': version,
+            'cipher': cipher,
+            'body': body
+        }
+        
+        for name in self.TAIL_GHIDS:
+            control[name], offset = _unpack_ghid(data, offset)
+        
+        sig_length = self._get_sig_length(cipher)
+        if sig_length:
+            control['signature'], offset = \
+                _unpack_blob(data, offset, sig_length)
+        else:
+            control['signature'] = None
+        
+        return control
+        
+        
+class GIDCCodec(_CodecBase):
+    MAGIC = b'GIDC'
+    VERSIONS = frozenset({2})
+    _KEYS = (
+        ('signature_key', 'pubkey_sig'),
+        ('encryption_key', 'pubkey_encrypt'),
+        ('exchange_key', 'pubkey_exchange')
+    )
+    
+    def _get_sig_length(self, cipher):
+        # Identities are inherently unsigned. Still check the cipher though.
+        _cipher_lengths(cipher)
+        return 0
+    
+    def _get_body_size(self, body, cipher):
+        lengths = _cipher_lengths(cipher)
+        return sum(lengths[length] for key, length in self._KEYS)
+        
+    def _pack_body_into(self, body, cipher, buffer, offset):
+        lengths = _cipher_lengths(cipher)
+        for key, length in self._KEYS:
+            offset = _pack_blob_into(body[key], lengths[length], buffer, offset)
+        return offset
+        
+    def _unpack_body(self, data, offset, cipher):
+        lengths = _cipher_lengths(cipher)
+        body = {}
+        for key, length in self._KEYS:
+            body[key], offset = _unpack_blob(data, offset, lengths[length])
+        return body, offset
+        
+        
+class GEOCCodec(_CodecBase):
+    MAGIC = b'GEOC'
+    VERSIONS = frozenset({14})
+    PARTY = 'author'
+    
+    def _get_body_size(self, body, cipher):
+        return _ghid_size(body['author']) + _int64.size + len(body['payload'])
+        
+    def _pack_body_into(self, body, cipher, buffer, offset):
+        payload = body['payload']
+        offset = _pack_ghid_into(body['author'], buffer, offset)
+        _int64.pack_into(buffer, offset, len(payload))
+        return _pack_blob_into(
+            payload,
+            len(payload),
+            buffer,
+            offset + _int64.size
+        )
+        
+    def pack_header(self, version, cipher, author, len_payload):
+        ''' Packs everything preceding the payload, for streaming.
+        '''
+        self._check_version(version)
+        _cipher_lengths(cipher)
+        header = bytearray(_header.size + _ghid_size(author) + _int64.size)
+        _header.pack_into(header, 0, self.MAGIC, version, cipher)
+        offset = _pack_ghid_into(author, header, _header.size)
+        _int64.pack_into(header, offset, len_payload)
+        return header
+        
+    def unpack_header(self, data):
+        ''' Unpacks everything preceding the payload, for streaming.
+        Returns (version, cipher, author, len_payload).
+        '''
+        data = memoryview(data)
+        _check_length(data, _header.size)
+        magic, version, cipher = _header.unpack_from(data)
+        if magic != self.MAGIC:
+            raise ParseError(
+                'Mismatched magic: received ' + repr(magic) + ', expected ' +
+                repr(self.MAGIC)
+            )
+        self._check_version(version)
+        _cipher_lengths(cipher)
+        author, offset = _unpack_ghid(data, _header.size)
+        _check_length(data, offset + _int64.size)
+        len_payload, = _int64.unpack_from(data, offset)
+        return version, cipher, author, len_payload
+        
+    def _measure_body(self, data, offset, cipher):
+        # Don't require the payload to measure it.
+        author, offset = _unpack_ghid(data, offset)
+        _check_length(data, offset + _int64.size)
+        len_payload, = _int64.unpack_from(data, offset)
+        return offset + _int64.size + len_payload
+        
+    def _unpack_body(self, data, offset, cipher):
+        body = {}
+        body['author'], offset = _unpack_ghid(data, offset)
+        _check_length(data, offset + _int64.size)
+        len_payload, = _int64.unpack_from(data, offset)
+        body['payload'], offset = \
+            _unpack_blob(data, offset + _int64.size, len_payload)
+        return body, offset
+        
+        
+class GOBSCodec(_CodecBase):
+    MAGIC = b'GOBS'
+    VERSIONS = frozenset({6})
+    PARTY = 'binder'
+    
+    def _get_body_size(self, body, cipher):
+        return _ghid_size(body['binder']) + _ghid_size(body['target'])
+        
+    def _pack_body_into(self, body, cipher, buffer, offset):
+        offset = _pack_ghid_into(body['binder'], buffer, offset)
+        return _pack_ghid_into(body['target'], buffer, offset)
+        
+    def _unpack_body(self, data, offset, cipher):
+        body = {}
+        body['binder'], offset = _unpack_ghid(data, offset)
+        body['target'], offset = _unpack_ghid(data, offset)
+        return body, offset
+        
+        
+class GOBDCodec(_CodecBase):
+    MAGIC = b'GOBD'
+    VERSIONS = frozenset({16})
+    PARTY = 'binder'
+    TAIL_GHIDS = ('ghid_dynamic', 'ghid')
+    
+    def _get_tarvec_size(self, target_vector):
+        return sum(_ghid_size(ghid) for ghid in target_vector)
+    
+    def _get_body_size(self, body, cipher):
+        return (
+            _ghid_size(body['binder']) + _int64.size + _int16.size +
+            self._get_tarvec_size(body['target_vector'])
+        )
+        
+    def _pack_body_into(self, body, cipher, buffer, offset):
+        target_vector = body['target_vector']
+        offset = _pack_ghid_into(body['binder'], buffer, offset)
+        _int64.pack_into(buffer, offset, body['counter'])
+        offset += _int64.size
+        
+        tarvec_size = self._get_tarvec_size(target_vector)
+        try:
+            _int16.pack_into(buffer, offset, tarvec_size)
+        except struct.error as exc:
+            raise ParseError('Target vector is too long.') from exc
+        offset += _int16.size
+        
+        for ghid in target_vector:
+            offset = _pack_ghid_into(ghid, buffer, offset)
+        return offset
+        
+    def _measure_body(self, data, offset, cipher):
+        # Skip the target vector instead of unpacking it.
+        binder, offset = _unpack_ghid(data, offset)
+        _check_length(data, offset + _int64.size + _int16.size)
+        tarvec_size, = _int16.unpack_from(data, offset + _int64.size)
+        return offset + _int64.size + _int16.size + tarvec_size
+        
+    def _unpack_body(self, data, offset, cipher):
+        body = {}
+        body['binder'], offset = _unpack_ghid(data, offset)
+        
+        _check_length(data, offset + _int64.size + _int16.size)
+        body['counter'], = _int64.unpack_from(data, offset)
+        offset += _int64.size
+        tarvec_size, = _int16.unpack_from(data, offset)
+        offset += _int16.size
+        
+        tarvec_end = offset + tarvec_size
+        _check_length(data, tarvec_end)
+        target_vector = []
+        while offset < tarvec_end:
+            ghid, offset = _unpack_ghid(data, offset)
+            target_vector.append(ghid)
+        if offset != tarvec_end:
+            raise ParseError('Target vector length mismatch.')
+        body['target_vector'] = tuple(target_vector)
+        
+        return body, offset
+        
+        
+class GDXXCodec(_CodecBase):
+    MAGIC = b'GDXX'
+    VERSIONS = frozenset({9})
+    PARTY = 'debinder'
+    
+    def _get_body_size(self, body, cipher):
+        return _ghid_size(body['debinder']) + _ghid_size(body['target'])
+        
+    def _pack_body_into(self, body, cipher, buffer, offset):
+        offset = _pack_ghid_into(body['debinder'], buffer, offset)
+        return _pack_ghid_into(body['target'], buffer, offset)
+        
+    def _unpack_body(self, data, offset, cipher):
+        body = {}
+        body['debinder'], offset = _unpack_ghid(data, offset)
+        body['target'], offset = _unpack_ghid(data, offset)
+        return body, offset
+        
+        
+class GARQCodec(_CodecBase):
+    MAGIC = b'GARQ'
+    VERSIONS = frozenset({12})
+    PARTY = 'recipient'
+    
+    def _get_sig_length(self, cipher):
+        # Requests are MAC'd, not signed.
+        return _cipher_lengths(cipher)['mac']
+    
+    def _get_body_size(self, body, cipher):
+        return _ghid_size(body['recipient']) + _cipher_lengths(cipher)['asym']
+        
+    def _pack_body_into(self, body, cipher, buffer, offset):
+        offset = _pack_ghid_into(body['recipient'], buffer, offset)
+        return _pack_blob_into(
+            body['payload'],
+            _cipher_lengths(cipher)['asym'],
+            buffer,
+            offset
+        )
+        
+    def _unpack_body(self, data, offset, cipher):
+        body = {}
+        body['recipient'], offset = _unpack_ghid(data, offset)
+        body['payload'], offset = _unpack_blob(
+            data,
+            offset,
+            _cipher_lengths(cipher)['asym']
+        )
+        return body, offset
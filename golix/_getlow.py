@@ -36,6 +36,7 @@ golix: A python library for Golix protocol object manipulation.
 # Global dependencies
 import abc
 import collections
+import collections.abc
 
 from smartyparse import parsers
 
@@ -50,13 +51,18 @@ from ._spec import _asym_ak
 from ._spec import _asym_nk
 from ._spec import _asym_else
 
+from . import _codec
+
 # Accommodate SP
 from .crypto_utils import cipher_length_lookup
 from .crypto_utils import hash_lookup
+from .crypto_utils import _sp_lock
 
 # Normal
 from .crypto_utils import Secret
 from .utils import Ghid
+from .utils import _hash_len_lookup
+from .utils import _StreamReader
 from .exceptions import SecurityError
 
 
@@ -76,50 +82,42 @@ __all__ = [
 # ###############################################
 
 # ----------------------------------------------------------------------
-# This makes me feel a little dirty.
-
-# We need to refactor once smartyparse is rewritten to modify the same
-# object continuously. Currently, smartyparse handles nested smartyparsers
-# as their own independent unit, so you can't register a callback on the
-# whole set of data. Which is a problem. Basically, nested SP's have no
-# awareness of their surrounding file context, so you can't do a callback
-# to pull in their context. So currently, you have to do it as a multi-pass
-# thingajobber.
-
-# This is a total hack-up job to bend the smartyparse library to my will,
-# until such time as it can be rewritten to support more powerful callback
-# syntax, and access to global pack_into data for nested smartyparsers,
-# as well as some other issues. This isn't *exactly* a monkeypatch, but
-# it's close enough that I'll go ahead and monkeypatch the definition of
-# the word monkeypatch to suit my needs. In other news, the MetaPolice are
-# coming for me, and I have no defense lawyer.
-        
-# Strategy for gratuitous duck-punching:
-# 1. Declare a mutable caching object: []
-# 2. Generate a caching callback on the fly, referencing that object
-# 3. Register that callback on the fly as postpack on ghid, with modify=False
-# 4. That callback appends the ghid's offset to the cache object
-# 5. Register a second callback on the entire _control
-# 6. That callback uses the offset to rewrite the hash with an actual hash
-# 7. Rewrite signature using the length of the hash and the cached hash offset
-
-# For other places this affects, search for "# Accommodate SP"
-        
-# This gets called postpack with modify=True on ['ghid'], referencing
-# the _control object.
-def _generate_offset_cacher(cache, ghid_parser):
-    # Relies upon late-binding closures to access the correct offset
-    def offset_cacher(*args, **kwargs):
-        start = ghid_parser.offset + 1
-        cache.append(start)
-    return offset_cacher
-
-
-def _generate_ghid_rewriter(parent_smartyparser, addresser):
-    def ghid_rewriter(ghid):
-        size = parent_smartyparser['ghid'].length
-        section = slice(len(ghid) - size, None)
-        ghid[section] = addresser.create()
+# Smartyparse parsers are module-level singletons, and parsing mutates them
+# (version/cipher dispatch callbacks, linked lengths, etc). So, all access
+# to them goes through _sp_lock, and anything we need to know about where
+# fields live within the packed object is calculated directly from the
+# unpacked values, instead of from callbacks registered on the parsers.
+
+# Magic (4 bytes), version (4 bytes), cipher (1 byte)
+_HEADER_LENGTH = 9
+
+# ----------------------------------------------------------------------
+# Wire format engines. 'struct' is the native codec in _codec; 'smartyparse'
+# uses the parsers in _spec. Both produce identical bytes.
+
+ENGINES = ('struct', 'smartyparse')
+_engine = 'struct'
+
+
+def set_engine(engine):
+    ''' Selects the engine used to pack and unpack all Golix objects.
+    '''
+    global _engine
+    if engine not in ENGINES:
+        raise ValueError('Unknown wire format engine: ' + repr(engine))
+    _engine = engine
+    
+    
+def get_engine():
+    ''' Returns the name of the engine currently in use.
+    '''
+    return _engine
+        
+        
+def _ghid_length(ghid):
+    ''' Packed length of a ghid, including the algo byte.
+    '''
+    return 1 + _hash_len_lookup[ghid.algo]
 
 
 # ###############################################
@@ -153,7 +151,7 @@ def _typecheck_ghidlist(iterable):
     # Use None as a no-op
     if iterable is None:
         return True
-    elif not isinstance(iterable, collections.Iterable):
+    elif not isinstance(iterable, collections.abc.Iterable):
         return False
     for iterant in iterable:
         if not _typecheck_ghid(iterant):
@@ -289,54 +287,111 @@ class _GolixObjectBase(metaclass=abc.ABCMeta):
         '''
         return cipher_length_lookup[self.cipher]['sig']
         
-    def pack(self, address_algo, cipher):
-        ''' Performs raw packing using the smartyparser in self.PARSER.
-        Generates a GHID as well.
+    def _pack_control(self):
+        ''' Packs self._control with whichever engine is selected.
         '''
-        # Normal
-        self.cipher = cipher
-        self._address_algo = address_algo
+        if _engine == 'smartyparse':
+            with _sp_lock:
+                return self.PARSER.pack(self._control)
+        else:
+            return self.CODEC.pack(self._control)
+            
+    @classmethod
+    def _unpack_control(cls, data):
+        ''' Unpacks data into a control with whichever engine is
+        selected.
+        '''
+        if _engine == 'smartyparse':
+            with _sp_lock:
+                return cls.PARSER.unpack(data)
+        else:
+            return cls.CODEC.unpack(data)
         
-        # Accommodate SP
-        # This is really simple and is hard-coding a reliance on the order
-        # of signature and hash in relation to the rest of the formats.
-        # It's quick and dirty but effective and less prone to bugs than fancy
-        # things, especially with smartyparse not as reliable as I'd like.
-        sig_length = self._get_sig_length()
-        sig_padding = bytes(sig_length)
-        self.signature = sig_padding
-        hash_length = self._addresser.ADDRESS_LENGTH
-        ghid_padding = bytes(hash_length)
-        self.ghid = Ghid(self.address_algo, ghid_padding)
-        
-        # Normal
-        packed = self.PARSER.pack(self._control)
+    @abc.abstractmethod
+    def _get_body_length(self):
+        ''' Packed length of the object body. Must be overwritten by
+        subclasses, since it depends upon the format.
+        '''
+        pass
         
-        # Accommodate SP
-        final_size = len(packed)
-        sig_slice = slice(
-            final_size - sig_length,
-            None
-        )
-        hash_slice = slice(
-            sig_slice.start - hash_length,
-            sig_slice.start
-        )
-        calc_slice = slice(
-            0,
-            hash_slice.start
+    def _get_address_offset(self):
+        ''' Offset of the (static) address within the packed object,
+        which is also the length of the data covered by the address.
+        '''
+        # Header, body, and then the ghid algo byte.
+        return _HEADER_LENGTH + self._get_body_length() + 1
+        
+    def _prepare_pack(self, address_algo, cipher):
+        ''' Sets the cipher and address algo, and pads the signature
+        and ghid(s) in the control so that it can be packed before they
+        are known.
+        '''
+        self.cipher = cipher
+        self._address_algo = address_algo
+        self.signature = bytes(self._get_sig_length())
+        self.ghid = Ghid(
+            self.address_algo,
+            bytes(self._addresser.ADDRESS_LENGTH)
         )
-        self._sig_slice = sig_slice
         
-        # Hash the packed data, until the appropriate point, and then sign
-        # Conversion to bytes necessary for PyCryptoDome API
-        address = self._addresser.create(bytes(packed[calc_slice]))
-        packed[hash_slice] = address
+    def _pack_control_into(self, view):
+        ''' Packs self._control into the memoryview, which must be
+        exactly the right size, with whichever engine is selected.
+        '''
+        if _engine == 'smartyparse':
+            view[:] = self._pack_control()
+        else:
+            self.CODEC.pack_into(self._control, view)
+            
+    def _pack_addresses(self, view):
+        ''' Hashes the packed view (in place) and fills in the ghid.
+        '''
+        offset = self._get_address_offset()
+        address = self._addresser.create(view[:offset])
+        view[offset:offset + len(address)] = address
         self.ghid = Ghid(self.address_algo, address)
+            
+    def packed_size(self, address_algo=None, cipher=None):
+        ''' Returns the exact packed size of the object, without packing
+        it. Address_algo and cipher default to those of the object.
+        '''
+        if address_algo is None:
+            address_algo = self.address_algo
+        if cipher is None:
+            cipher = self.cipher
+        layout = self.CODEC.layout(self.version, cipher, address_algo)
+        return _HEADER_LENGTH + self._get_body_length() + layout.tail_length
+        
+    def pack_into(self, buffer, offset, address_algo, cipher):
+        ''' Packs the object directly into a writable buffer (for
+        example, a bytearray or mmap), starting at offset, and generates
+        its GHID. Returns the offset of the end of the packed object.
+        
+        The object keeps a memoryview of the buffer, which is where
+        pack_signature puts the signature; bytearrays cannot be resized
+        while it exists.
+        '''
+        self._prepare_pack(address_algo, cipher)
+        end = offset + self.packed_size()
+        view = memoryview(buffer)[offset:end]
+        if len(view) != end - offset:
+            raise ValueError('Buffer is too small to pack object.')
         
-        # Normal-ish, courtesy of above
-        self._packed = packed
+        self._pack_control_into(view)
+        self._pack_addresses(view)
+        
+        self._sig_slice = slice(len(view) - self._get_sig_length(), None)
+        self._packed = view
         self.signature = None
+        return end
+        
+    def pack(self, address_algo, cipher):
+        ''' Performs raw packing using the selected wire format engine.
+        Generates a GHID as well.
+        '''
+        packed = bytearray(self.packed_size(address_algo, cipher))
+        self.pack_into(packed, 0, address_algo, cipher)
+        self._packed = packed
         
     def pack_signature(self, signature):
         if not self._packed:
@@ -350,22 +405,18 @@ class _GolixObjectBase(metaclass=abc.ABCMeta):
         
     @classmethod
     def unpack(cls, data):
-        ''' Performs raw unpacking with the smartyparser in self.PARSER.
+        ''' Performs raw unpacking using the selected wire format engine.
         '''
-        # Accommodate SP
-        offset_cache = []
-        offset_cacher = \
-            _generate_offset_cacher(offset_cache, cls.PARSER['ghid'])
-        cls.PARSER['ghid'].register_callback('preunpack', offset_cacher)
-        
-        # Normal
-        unpacked = cls.PARSER.unpack(data)
+        # Hold a single view of the source buffer, and unpack from it, so
+        # that bulky fields (eg payloads) are zero-copy slices of the source.
+        packed = memoryview(data)
+        unpacked = cls._unpack_control(packed)
         self = cls(_control=unpacked)
-        self._packed = memoryview(data)
+        self._packed = packed
         
-        # Accommodate SP
-        address_offset = offset_cache.pop()
-        address_data = self._packed[:address_offset].tobytes()
+        # Hashing works directly on the view; don't copy.
+        address_offset = self._get_address_offset()
+        address_data = packed[:address_offset]
         
         # Normal-ish
         self._addresser.verify(self.ghid.address, address_data)
@@ -374,29 +425,25 @@ class _GolixObjectBase(metaclass=abc.ABCMeta):
         return self
         
     def __eq__(self, other):
-        ''' Ehh, just compare controls.
+        ''' Compare based on attributes defined in each class. This is
+        independent of the wire format engine, which may leave extra
+        bookkeeping (eg length fields) in the control.
         '''
         try:
-            return self._control == other._control
+            if self._ATTR_COMPS != other._ATTR_COMPS:
+                return False
+                
+            for attr in self._ATTR_COMPS:
+                if getattr(self, attr) != getattr(other, attr):
+                    return False
+            
         except AttributeError as exc:
             raise TypeError(
                 'Incomparable types: ' + str(type(self)) + ' vs ' +
                 str(type(other))
             ) from exc
-        
-    # def __eq__(self, other):
-    #     ''' Compare based on attributes defined in each class.
-    #     '''
-    #     comp = True
-    #     try:
-    #         for attr in self._ATTR_COMPS:
-    #             comp &= (getattr(self, attr) == getattr(other, attr))
             
-    #     except AttributeError as exc:
-    #         raise TypeError(
-    #             'Incomparable types: ' + str(type(self)) + ' vs ' +
-    #             str(type(other))
-    #         ) from exc
+        return True
        
 
 class GIDC(_GolixObjectBase):
@@ -405,6 +452,7 @@ class GIDC(_GolixObjectBase):
     Low level object. In most cases, you don't want this.
     '''
     PARSER = _gidc
+    CODEC = _codec.GIDCCodec()
     _ATTR_COMPS = ['magic', 'version', 'cipher', 'ghid', 'signature_key',
                    'encryption_key', 'exchange_key']
     
@@ -466,17 +514,24 @@ class GIDC(_GolixObjectBase):
         # meaningless. Use None for temporary payloads.
         self._control['body']['exchange_key'] = value
         
-    def pack(self, *args, **kwargs):
+    def pack_into(self, *args, **kwargs):
         ''' Quick and dirty packing, which immediately sets self._signed
         to true. Will exactly mimic behavior of super, except for that.
         '''
-        result = super().pack(*args, **kwargs)
+        result = super().pack_into(*args, **kwargs)
         self._signed = True
         return result
         
     def _get_sig_length(self):
         # Accommodate SP
         return 0
+        
+    def _get_body_length(self):
+        return (
+            len(self.signature_key) +
+            len(self.encryption_key) +
+            len(self.exchange_key)
+        )
        
 
 class GEOC(_GolixObjectBase):
@@ -485,8 +540,13 @@ class GEOC(_GolixObjectBase):
     Low level object. In most cases, you don't want this. Does not
     perform state management; simply transitions between encrypted bytes
     and unencrypted bytes.
+    
+    When unpacked, the payload is a memoryview of the packed data, so
+    unpacking allocates the same amount of memory regardless of payload
+    size.
     '''
     PARSER = _geoc
+    CODEC = _codec.GEOCCodec()
     _ATTR_COMPS = ['magic', 'version', 'cipher', 'ghid', 'signature',
                    'payload', 'author']
     
@@ -536,6 +596,182 @@ class GEOC(_GolixObjectBase):
             
         self._control['body']['author'] = ghid
         
+    def _get_body_length(self):
+        # Author, payload length (Int64), payload
+        return _ghid_length(self.author) + 8 + len(self.payload)
+        
+
+class GEOCStream:
+    ''' Packs a GEOC incrementally, for payloads too large to hold in
+    memory. Iterating yields the packed container in chunks: the header,
+    each payload chunk (as passed in), and finally the ghid and
+    signature, which are only available once iteration has completed.
+    
+    Signer is called with the finished address, and must return the
+    signature.
+    '''
+    
+    def __init__(self, author, len_payload, payload, cipher, address_algo,
+                 signer, version='latest'):
+        if not isinstance(author, Ghid):
+            raise TypeError('Authors must be type Ghid or similar.')
+        if version == 'latest':
+            version = GEOC.PARSER.latest
+        if version not in GEOC.PARSER.versions:
+            raise ValueError('Object version unavailable: ' + str(version))
+            
+        self.author = author
+        self.len_payload = len_payload
+        self.version = version
+        self.cipher = cipher
+        self.address_algo = address_algo
+        self.ghid = None
+        self.signature = None
+        self._payload = payload
+        self._signer = signer
+        self._layout = GEOC.CODEC.layout(version, cipher, address_algo)
+        
+    @property
+    def packed_size(self):
+        ''' Total size of the packed container.
+        '''
+        return (
+            _HEADER_LENGTH + _ghid_length(self.author) + 8 +
+            self.len_payload + self._layout.tail_length
+        )
+        
+    def __iter__(self):
+        if self._payload is None:
+            raise RuntimeError('GEOCStream can only be iterated once.')
+        payload = self._payload
+        self._payload = None
+        
+        hasher = hash_lookup(self.address_algo).hasher()
+        header = GEOC.CODEC.pack_header(
+            self.version,
+            self.cipher,
+            self.author,
+            self.len_payload
+        )
+        hasher.update(header)
+        yield header
+        
+        remaining = self.len_payload
+        for chunk in payload:
+            remaining -= len(chunk)
+            if remaining < 0:
+                break
+            hasher.update(chunk)
+            yield chunk
+        if remaining != 0:
+            raise ValueError(
+                'Payload length does not match declared len_payload.'
+            )
+        
+        # The address covers the ghid's algo byte, too.
+        algo = bytes((self.address_algo,))
+        hasher.update(algo)
+        address = hasher.finalize()
+        self.ghid = Ghid(self.address_algo, address)
+        
+        signature = self._signer(address)
+        if len(signature) != self._layout.sig_length:
+            raise ValueError('Signature length does not match cipher.')
+        self.signature = signature
+        
+        yield algo + address + bytes(signature)
+        
+        
+class GEOCStreamReader:
+    ''' Unpacks a GEOC incrementally from a bytes-like, file-like, or
+    iterable source. The header is read immediately; the payload is
+    then read with iter_payload(), which also verifies the address.
+    
+    The address algorithm is declared after the payload, so to verify
+    while reading, we need to know it in advance. Seekable sources are
+    checked directly; otherwise, address_algo is used, defaulting to the
+    author's.
+    '''
+    
+    def __init__(self, source, address_algo=None):
+        self._reader = _StreamReader(source)
+        
+        header = self._read(_HEADER_LENGTH + 1)
+        algo = header[-1]
+        if algo not in _hash_len_lookup:
+            raise parsers.ParseError('Improper hash algorithm declaration.')
+        header = bytes(header) + bytes(self._read(_hash_len_lookup[algo] + 8))
+        
+        version, cipher, author, len_payload = \
+            GEOC.CODEC.unpack_header(header)
+        self.version = version
+        self.cipher = cipher
+        self.author = author
+        self.len_payload = len_payload
+        self.ghid = None
+        self.signature = None
+        
+        self._header = header
+        self._payload_start = self._reader.tell()
+        
+        if self.seekable:
+            self._reader.seek(self._payload_start + len_payload)
+            self._address_algo = self._read(1)[0]
+            self.rewind()
+        elif address_algo is None:
+            self._address_algo = author.algo
+        else:
+            self._address_algo = address_algo
+        
+    @property
+    def seekable(self):
+        return self._reader.seekable
+        
+    def _read(self, size):
+        data = self._reader.read(size)
+        if len(data) != size:
+            raise parsers.ParseError('Packed data is truncated.')
+        return data
+        
+    def rewind(self):
+        ''' Seek back to the start of the payload, for sources that
+        support it.
+        '''
+        self._reader.seek(self._payload_start)
+        
+    def iter_payload(self, chunk_size, verify=True):
+        ''' Yields the payload in chunks of (up to) chunk_size. Once the
+        payload is exhausted, reads the ghid and signature; if verify is
+        True, also checks the address, raising SecurityError on failure.
+        '''
+        if verify:
+            hasher = hash_lookup(self._address_algo).hasher()
+            hasher.update(self._header)
+        else:
+            hasher = None
+            
+        remaining = self.len_payload
+        while remaining > 0:
+            chunk = self._read(min(chunk_size, remaining))
+            remaining -= len(chunk)
+            if hasher is not None:
+                hasher.update(chunk)
+            yield chunk
+            
+        algo = self._read(1)[0]
+        if algo not in _hash_len_lookup:
+            raise parsers.ParseError('Improper hash algorithm declaration.')
+        address = bytes(self._read(_hash_len_lookup[algo]))
+        layout = GEOC.CODEC.layout(self.version, self.cipher, algo)
+        self.ghid = Ghid(algo, address)
+        self.signature = bytes(self._read(layout.sig_length))
+        
+        if hasher is not None:
+            if algo != self._address_algo:
+                raise SecurityError('Unexpected address algorithm.')
+            hasher.update(bytes((algo,)))
+            hash_lookup(algo).verify_hasher(address, hasher)
+        
 
 class GOBS(_GolixObjectBase):
     ''' Golix object binding, static.
@@ -544,6 +780,7 @@ class GOBS(_GolixObjectBase):
     perform state management.
     '''
     PARSER = _gobs
+    CODEC = _codec.GOBSCodec()
     _ATTR_COMPS = ['magic', 'version', 'cipher', 'ghid', 'signature',
                    'binder', 'target']
     
@@ -588,6 +825,9 @@ class GOBS(_GolixObjectBase):
             
         self._control['body']['target'] = ghid
         
+    def _get_body_length(self):
+        return _ghid_length(self.binder) + _ghid_length(self.target)
+        
 
 class GOBD(_GolixObjectBase):
     ''' Golix object binding, dynamic.
@@ -596,6 +836,7 @@ class GOBD(_GolixObjectBase):
     perform state management.
     '''
     PARSER = _gobd
+    CODEC = _codec.GOBDCodec()
     _ATTR_COMPS = ['magic', 'version', 'cipher', 'ghid', 'signature',
                    'binder', 'counter', 'ghid_dynamic', 'target_vector']
     
@@ -677,17 +918,27 @@ class GOBD(_GolixObjectBase):
 
         self._control['body']['target_vector'] = value
         
-    def pack(self, address_algo, cipher):
+    def _get_body_length(self):
+        # Binder, counter (Int64), target vector length (Int16), targets
+        return (
+            _ghid_length(self.binder) + 8 + 2 +
+            sum(_ghid_length(ghid) for ghid in self.target_vector)
+        )
+        
+    def _get_address_offset(self):
+        # The dynamic ghid comes between the body and the static ghid.
+        return super()._get_address_offset() + _ghid_length(self.ghid_dynamic)
+        
+    def _get_address_offset_dynamic(self):
+        return super()._get_address_offset()
+        
+    def _prepare_pack(self, address_algo, cipher):
         ''' Overwrite super() to support dynamic address generation.
-        Awkward, largely violates Don'tRepeatYourself, but quickest way
-        to work around SmartyParse's current limitations.
         '''
-        # Normal
         # First we need to check some things.
         has_history = len(self.target_vector) > 1
         if has_history and self.ghid_dynamic:
-            # Accommodate smartyparse
-            calculate_dynamic = False
+            self._calculate_dynamic = False
             
         elif has_history or self.ghid_dynamic:
             raise ValueError(
@@ -695,120 +946,59 @@ class GOBD(_GolixObjectBase):
                 'undefined. One cannot exist without the other.')
         # In this case, we need to prepare to generate a dynamic address
         else:
-            # Accommodate SP
-            calculate_dynamic = True
+            self._calculate_dynamic = True
             
-        # Normal
-        self.cipher = cipher
-        self._address_algo = address_algo
-        
-        # Accommodate SP
-        # This is really simple and is hard-coding a reliance on the order
-        # of signature and hash in relation to the rest of the formats.
-        # It's quick and dirty but effective and less prone to bugs than fancy
-        # things, especially with smartyparse not as reliable as I'd like.
-        sig_length = cipher_length_lookup[self.cipher]['sig']
-        sig_padding = bytes(sig_length)
-        self.signature = sig_padding
-        hash_length = self._addresser.ADDRESS_LENGTH
-        ghid_padding = bytes(hash_length)
-        self.ghid = Ghid(self.address_algo, ghid_padding)
-        
-        # Accommodate SP
-        if calculate_dynamic:
-            self.ghid_dynamic = Ghid(self.address_algo, ghid_padding)
-        
-        # Normal
-        packed = self.PARSER.pack(self._control)
-        
-        # Accommodate SP
-        final_size = len(packed)
-        sig_slice = slice(
-            final_size - sig_length,
-            None
-        )
-        hash_slice_static = slice(
-            sig_slice.start - hash_length,
-            sig_slice.start
-        )
-        calc_slice_static = slice(
-            0,
-            hash_slice_static.start
-        )
-        hash_slice_dynamic = slice(
-            # Don't forget the extra byte for the address algo denotation
-            hash_slice_static.start - 1 - hash_length,
-            hash_slice_static.start - 1
-        )
-        calc_slice_dynamic = slice(
-            0,
-            hash_slice_dynamic.start
-        )
-        self._sig_slice = sig_slice
-        
-        if calculate_dynamic:
-            address_dynamic = self._addresser.create(
-                bytes(packed[calc_slice_dynamic])
+        super()._prepare_pack(address_algo, cipher)
+        if self._calculate_dynamic:
+            self.ghid_dynamic = Ghid(
+                self.address_algo,
+                bytes(self._addresser.ADDRESS_LENGTH)
             )
-            packed[hash_slice_dynamic] = address_dynamic
-            self.ghid_dynamic = Ghid(self.address_algo, address_dynamic)
-        
-        # Hash the packed data, until the appropriate point, and then sign
-        # Conversion to bytes necessary for PyCryptoDome API
-        address = self._addresser.create(bytes(packed[calc_slice_static]))
-        packed[hash_slice_static] = address
+            
+    def _pack_addresses(self, view):
+        ''' The static address covers the dynamic one, so hash only
+        once: fork the hash at the dynamic address, and then carry on.
+        '''
+        offset_dynamic = self._get_address_offset_dynamic()
+        offset_static = self._get_address_offset()
+        hasher = self._addresser.hasher()
+        hasher.update(view[:offset_dynamic])
+        
+        if self._calculate_dynamic:
+            address = hasher.copy().finalize()
+            view[offset_dynamic:offset_dynamic + len(address)] = address
+            self.ghid_dynamic = Ghid(self.address_algo, address)
+            
+        hasher.update(view[offset_dynamic:offset_static])
+        address = hasher.finalize()
+        view[offset_static:offset_static + len(address)] = address
         self.ghid = Ghid(self.address_algo, address)
         
-        # Normal-ish, courtesy of above
-        self._packed = packed
-        self.signature = None
-        
     @classmethod
     def unpack(cls, data):
-        ''' Performs raw unpacking with the smartyparser in self.PARSER.
+        ''' Performs raw unpacking using the selected wire format engine.
         '''
-        # Accommodate SP
-        offset_cache_static = []
-        offset_cacher_static = _generate_offset_cacher(
-            offset_cache_static,
-            cls.PARSER['ghid']
-        )
-        cls.PARSER['ghid'].register_callback(
-            'preunpack',
-            offset_cacher_static
-        )
-        
-        offset_cache_dynamic = []
-        offset_cacher_dynamic = _generate_offset_cacher(
-            offset_cache_dynamic,
-            cls.PARSER['ghid_dynamic']
-        )
-        cls.PARSER['ghid_dynamic'].register_callback(
-            'preunpack',
-            offset_cacher_dynamic
-        )
-        
-        # Normal
-        unpacked = cls.PARSER.unpack(data)
+        # See _GolixObjectBase.unpack
+        packed = memoryview(data)
+        unpacked = cls._unpack_control(packed)
         self = cls(_control=unpacked)
-        self._packed = memoryview(data)
-        
-        # Accommodate SP
-        address_offset_static = offset_cache_static.pop()
-        address_data_static = self._packed[:address_offset_static].tobytes()
+        self._packed = packed
         
-        address_offset_dynamic = offset_cache_dynamic.pop()
-        address_data_dynamic = self._packed[:address_offset_dynamic].tobytes()
+        # As with packing, hash once for both addresses.
+        offset_dynamic = self._get_address_offset_dynamic()
+        offset_static = self._get_address_offset()
+        hasher = self._addresser.hasher()
+        hasher.update(packed[:offset_dynamic])
         
         # Verify the initial hash if history is undefined
         if len(self.target_vector) == 1:
-            self._addresser.verify(
+            self._addresser.verify_hasher(
                 self.ghid_dynamic.address,
-                address_data_dynamic
+                hasher.copy()
             )
         
-        # Normal-ish
-        self._addresser.verify(self.ghid.address, address_data_static)
+        hasher.update(packed[offset_dynamic:offset_static])
+        self._addresser.verify_hasher(self.ghid.address, hasher)
         
         # Don't forget this part.
         return self
@@ -821,6 +1011,7 @@ class GDXX(_GolixObjectBase):
     perform state management.
     '''
     PARSER = _gdxx
+    CODEC = _codec.GDXXCodec()
     _ATTR_COMPS = ['magic', 'version', 'cipher', 'ghid', 'signature',
                    'debinder', 'target']
     
@@ -865,6 +1056,9 @@ class GDXX(_GolixObjectBase):
 
         self._control['body']['target'] = ghid
         
+    def _get_body_length(self):
+        return _ghid_length(self.debinder) + _ghid_length(self.target)
+        
 
 class GARQ(_GolixObjectBase):
     ''' Golix encrypted asymmetric request.
@@ -873,6 +1067,7 @@ class GARQ(_GolixObjectBase):
     perform state management.
     '''
     PARSER = _garq
+    CODEC = _codec.GARQCodec()
     _ATTR_COMPS = ['magic', 'version', 'cipher', 'ghid', 'signature',
                    'recipient', 'payload']
     
@@ -971,6 +1166,9 @@ class GARQ(_GolixObjectBase):
         # Accommodate SP
         return cipher_length_lookup[self.cipher]['mac']
         
+    def _get_body_length(self):
+        return _ghid_length(self.recipient) + len(self.payload)
+        
 
 class _AsymBase():
     ''' AsymBase class should handle all of the parsing/building
@@ -1021,14 +1219,16 @@ class _AsymBase():
     def pack(self):
         ''' Performs raw packing using the smartyparser in self.PARSER.
         '''
-        self._packed = self.PARSER.pack(self._control)
+        with _sp_lock:
+            self._packed = self.PARSER.pack(self._control)
         return self._packed
         
     @classmethod
     def unpack(cls, data):
         ''' Performs raw unpacking with the smartyparser in self.PARSER.
         '''
-        unpacked = cls.PARSER.unpack(data)
+        with _sp_lock:
+            unpacked = cls.PARSER.unpack(data)
         self = cls(_control=unpacked)
         self._packed = memoryview(data)
         
@@ -1178,3 +1378,177 @@ class GARQElse(_AsymBase):
     @payload.setter
     def payload(self, value):
         self._control['payload'] = value
+
+
+# ###############################################
+# Format dispatch
+# ###############################################
+
+
+# Every Golix object starts with a 4-byte magic number, so we can dispatch
+# directly to the correct format instead of trial parsing.
+MAGIC_LOOKUP = {
+    GIDC.PARSER['magic'].parser.value: GIDC,
+    GEOC.PARSER['magic'].parser.value: GEOC,
+    GOBS.PARSER['magic'].parser.value: GOBS,
+    GOBD.PARSER['magic'].parser.value: GOBD,
+    GDXX.PARSER['magic'].parser.value: GDXX,
+    GARQ.PARSER['magic'].parser.value: GARQ,
+}
+
+
+def dispatch_format(packed):
+    ''' Returns the low-level object class for packed, based solely
+    upon its magic number. Raises ParseError for unknown magic.
+    '''
+    magic = bytes(packed[0:4])
+    try:
+        return MAGIC_LOOKUP[magic]
+    except KeyError:
+        raise parsers.ParseError(
+            'Packed data does not appear to be a Golix object: bad magic ' +
+            repr(magic)
+        ) from None
+
+
+# Likewise, decrypted GARQ payloads carry a 2-byte magic right after the
+# author ghid.
+ASYM_MAGIC_LOOKUP = {
+    GARQHandshake.PARSER['magic'].parser.value: GARQHandshake,
+    GARQAck.PARSER['magic'].parser.value: GARQAck,
+    GARQNak.PARSER['magic'].parser.value: GARQNak,
+}
+
+
+def dispatch_request(plaintext):
+    ''' Returns the GARQ payload class for decrypted plaintext, based
+    solely upon its magic. Raises ParseError for unknown magic.
+    '''
+    try:
+        offset = 1 + _hash_len_lookup[plaintext[0]]
+    except (IndexError, KeyError):
+        raise parsers.ParseError('Request has an invalid author.') from None
+        
+    magic = bytes(plaintext[offset:offset + 2])
+    try:
+        return ASYM_MAGIC_LOOKUP[magic]
+    except KeyError:
+        raise parsers.ParseError(
+            'Unknown request magic: ' + repr(magic)
+        ) from None
+
+
+# Maximum packed size, by magic, accepted by peek and iter_packed. None
+# means unlimited. These are deliberately generous for everything but
+# containers, whose limit depends upon the deployment: pass limits (or
+# update this dict) to allow larger ones.
+SIZE_LIMITS = {
+    b'GIDC': 1 << 12,
+    b'GEOC': 1 << 26,
+    b'GOBS': 1 << 12,
+    # Target vectors can be up to 64 KiB on their own
+    b'GOBD': 1 << 17,
+    b'GDXX': 1 << 12,
+    b'GARQ': 1 << 12,
+}
+
+
+# The result of peek. Fields not used by the format are None.
+PeekedHeader = collections.namedtuple(
+    'PeekedHeader',
+    ['magic', 'version', 'cipher', 'length', 'ghid', 'ghid_dynamic',
+     'author', 'binder', 'debinder', 'recipient']
+)
+
+
+def peek(packed, limits=None):
+    ''' Reads the header of a packed object without unpacking it, for
+    routing. Returns a PeekedHeader. Only the fixed-offset fields and the
+    ghids are read, and the address is NOT verified, so don't trust the
+    result beyond routing.
+    
+    Limits maps magic to maximum packed size, defaulting to SIZE_LIMITS.
+    Raises ParseError for unknown, truncated, or oversized objects.
+    '''
+    if limits is None:
+        limits = SIZE_LIMITS
+    
+    cls = dispatch_format(packed)
+    peeked = dict.fromkeys(PeekedHeader._fields)
+    peeked.update(cls.CODEC.peek(packed, limits.get(cls.CODEC.MAGIC)))
+    return PeekedHeader(**peeked)
+    
+    
+def iter_packed(source, limits=None):
+    ''' Splits concatenated packed objects from a bytes-like, file-like,
+    or iterable source, yielding each one's packed bytes in turn (without
+    unpacking them). Objects in bytes-like sources are yielded as
+    memoryview slices of the source; others are read into a new
+    bytearray per object.
+    
+    Limits maps magic to maximum packed size, defaulting to SIZE_LIMITS.
+    Lengths are checked against it before reading the rest of an object.
+    Raises ParseError if an object is malformed, truncated, or oversized.
+    '''
+    if limits is None:
+        limits = SIZE_LIMITS
+        
+    try:
+        view = memoryview(source).cast('B')
+    except TypeError:
+        view = None
+    
+    if view is not None:
+        offset = 0
+        while offset < len(view):
+            remaining = view[offset:]
+            codec = dispatch_format(remaining).CODEC
+            length = codec.measure(remaining)
+            _check_size(codec.MAGIC, length, limits)
+            if length > len(remaining):
+                raise parsers.ParseError('Packed data is truncated.')
+            yield remaining[:length]
+            offset += length
+        return
+    
+    reader = _StreamReader(source)
+    while True:
+        packed = bytearray(reader.read(_HEADER_LENGTH))
+        if not packed:
+            return
+        elif len(packed) < _HEADER_LENGTH:
+            raise parsers.ParseError('Packed data is truncated.')
+        
+        codec = dispatch_format(packed).CODEC
+        while True:
+            try:
+                length = codec.measure(packed)
+                break
+            except _codec.TruncatedError as exc:
+                needed = exc.needed
+            # Outside the except block, so that the traceback (and with it,
+            # any views into packed) has been released before resizing.
+            _check_size(codec.MAGIC, needed, limits)
+            _read_into(reader, packed, needed)
+        _check_size(codec.MAGIC, length, limits)
+        _read_into(reader, packed, length)
+        yield packed
+        
+        
+def _check_size(magic, length, limits):
+    ''' Raises ParseError if length exceeds the limit for magic.
+    '''
+    limit = limits.get(magic)
+    if limit is not None and length > limit:
+        raise parsers.ParseError('Object exceeds size limit.')
+        
+        
+def _read_into(reader, packed, length):
+    ''' Extends packed with data from reader, up to length total.
+    '''
+    needed = length - len(packed)
+    if needed > 0:
+        data = reader.read(needed)
+        if len(data) != needed:
+            raise parsers.ParseError('Packed data is truncated.')
+        packed += data
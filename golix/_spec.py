@@ -64,7 +64,7 @@ _signature_parsers[0] = ParseHelper(
 _signature_parsers[1] = ParseHelper(
     parsers.Blob(length=512))
 _signature_parsers[2] = ParseHelper(
-    parsers.Blob(length=512))
+    parsers.Blob(length=64))
 
 _mac_parsers = {}
 _mac_parsers[0] = ParseHelper(
@@ -88,7 +88,7 @@ _pubkey_parsers_sig[0] = ParseHelper(
 _pubkey_parsers_sig[1] = ParseHelper(
     parsers.Blob(length=512))
 _pubkey_parsers_sig[2] = ParseHelper(
-    parsers.Blob(length=512))
+    parsers.Blob(length=32))
 
 _pubkey_parsers_encrypt = {}
 _pubkey_parsers_encrypt[0] = ParseHelper(
@@ -96,7 +96,7 @@ _pubkey_parsers_encrypt[0] = ParseHelper(
 _pubkey_parsers_encrypt[1] = ParseHelper(
     parsers.Blob(length=512))
 _pubkey_parsers_encrypt[2] = ParseHelper(
-    parsers.Blob(length=512))
+    parsers.Blob(length=32))
 
 _pubkey_parsers_exchange = {}
 _pubkey_parsers_exchange[0] = ParseHelper(
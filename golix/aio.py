@@ -0,0 +1,159 @@
+'''
+Asyncio facade for identities. Everything CPU-bound (signing,
+verification, encryption, decryption, and hashing large objects) is run
+in an executor, so that the event loop keeps serving I/O.
+
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+
+# Global dependencies
+import asyncio
+import functools
+
+# Interpackage dependencies
+from .core import FirstParty
+
+
+# Control * imports
+__all__ = [
+    'AsyncFirstParty',
+    'AsyncThirdParty'
+]
+
+
+# ###############################################
+# Utilities
+# ###############################################
+
+
+def _offload(name):
+    ''' Creates a coroutine method that calls the wrapped identity's
+    method of the same name in the executor.
+    '''
+    async def method(self, *args, **kwargs):
+        return await self._run(
+            getattr(self._party, name),
+            *args,
+            **kwargs
+        )
+        
+    method.__name__ = name
+    method.__qualname__ = name
+    method.__doc__ = 'Coroutine version of ' + name + '; see cipher.'
+    return method
+
+
+class _AsyncBase:
+    ''' Wraps an identity, running its methods in executor (defaulting
+    to the loop's), with at most max_concurrency running at once.
+    Anything not overridden (eg ghid) is passed through as-is.
+    '''
+    
+    def __init__(self, party, executor=None, max_concurrency=None):
+        self._party = party
+        self._executor = executor
+        self._max_concurrency = max_concurrency
+        # Created on first use, so it binds to the running loop.
+        self._semaphore = None
+        
+    def __getattr__(self, name):
+        # Only called when normal lookup fails.
+        if name == '_party':
+            raise AttributeError(name)
+        return getattr(self._party, name)
+        
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+        call = functools.partial(func, *args, **kwargs)
+        
+        if self._max_concurrency is None:
+            return await loop.run_in_executor(self._executor, call)
+        
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        async with self._semaphore:
+            return await loop.run_in_executor(self._executor, call)
+            
+    unpack_identity = _offload('unpack_identity')
+    unpack_container = _offload('unpack_container')
+    unpack_bind_static = _offload('unpack_bind_static')
+    unpack_bind_dynamic = _offload('unpack_bind_dynamic')
+    unpack_debind = _offload('unpack_debind')
+    unpack_request = _offload('unpack_request')
+    unpack_any = _offload('unpack_any')
+        
+        
+# ###############################################
+# Facades
+# ###############################################
+        
+        
+class AsyncFirstParty(_AsyncBase):
+    ''' Asyncio facade for a FirstParty.
+    '''
+    
+    @classmethod
+    async def create(cls, first_party_cls=FirstParty, executor=None,
+                     max_concurrency=None, **kwargs):
+        ''' Creates a new identity (generating its keys in the executor)
+        and wraps it. Kwargs are passed to first_party_cls.
+        '''
+        loop = asyncio.get_event_loop()
+        party = await loop.run_in_executor(
+            executor,
+            functools.partial(first_party_cls, **kwargs)
+        )
+        return cls(party, executor, max_concurrency)
+    
+    make_container = _offload('make_container')
+    make_containers = _offload('make_containers')
+    make_bind_static = _offload('make_bind_static')
+    make_bind_static_many = _offload('make_bind_static_many')
+    make_bind_dynamic = _offload('make_bind_dynamic')
+    make_bind_dynamic_many = _offload('make_bind_dynamic_many')
+    make_debind = _offload('make_debind')
+    make_debind_many = _offload('make_debind_many')
+    make_request = _offload('make_request')
+    
+    receive_container = _offload('receive_container')
+    receive_bind_static = _offload('receive_bind_static')
+    receive_bind_dynamic = _offload('receive_bind_dynamic')
+    receive_debind = _offload('receive_debind')
+    receive_request = _offload('receive_request')
+    
+    
+class AsyncThirdParty(_AsyncBase):
+    ''' Asyncio facade for a ThirdParty.
+    '''
+    
+    unpack_object = _offload('unpack_object')
+    verify_object = _offload('verify_object')
+    verify_many = _offload('verify_many')
@@ -0,0 +1,246 @@
+'''
+Dynamic binding chains: incremental verification of every frame of a
+dynamic binding, not just the latest one.
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+import collections
+import threading
+
+# Interpackage dependencies
+from .exceptions import SecurityError
+from ._getlow import GOBD
+from .core import thirdparty_factory
+
+
+# Control * imports
+__all__ = [
+    'DynamicChain'
+]
+
+
+# ###############################################
+# Chains
+# ###############################################
+
+
+# What we keep of each verified frame: enough to check its successor.
+_Frame = collections.namedtuple(
+    '_Frame',
+    ['ghid', 'counter', 'target_vector']
+)
+
+
+class DynamicChain:
+    ''' Verifies the frames (GOBD) of a single dynamic binding, which
+    may be added in any order. Each frame must:
+    
+    + be signed by binder,
+    + share the chain's ghid_dynamic,
+    + list its predecessor first in its history, and then (a prefix of)
+      its predecessor's history,
+    + have a larger counter than its predecessor.
+    
+    The chain starts from its first frame, whose ghid_dynamic GOBD.unpack
+    has already checked, or from anchor: a frame verified previously
+    (for example, before its predecessors were collected), whose
+    history is therefore trusted.
+    
+    Frames whose predecessor hasn't been verified yet are held until it
+    is. Verified frames are cached, so each frame is verified exactly
+    once, and adding a new frame costs one signature check, regardless
+    of how long the chain is. A verified frame whose predecessor already
+    has a successor is a fork, and is rejected.
+    '''
+    
+    def __init__(self, binder, anchor=None, verifier=None):
+        ''' Binder is the SecondParty that signs the frames. Verifier is
+        a ThirdParty (or anything else with a verify_object method),
+        defaulting to a new one for binder's ciphersuite.
+        '''
+        if verifier is None:
+            verifier = thirdparty_factory(binder.ciphersuite)
+        self.binder = binder
+        self._verifier = verifier
+        self._lock = threading.RLock()
+        
+        self._ghid_dynamic = None
+        self._head = None
+        # Frame ghid -> _Frame, for every verified frame
+        self._frames = {}
+        # Frame ghid -> ghid of its (verified) successor
+        self._successors = {}
+        # Predecessor ghid -> {frame ghid: GOBD} waiting on it
+        self._pending = {}
+        # Frame ghid -> SecurityError, for held frames that failed later
+        self._rejected = {}
+        
+        if anchor is not None:
+            self._check_frame(anchor)
+            self._ghid_dynamic = anchor.ghid_dynamic
+            self._accept(anchor)
+            
+    @property
+    def ghid_dynamic(self):
+        return self._ghid_dynamic
+        
+    @property
+    def head(self):
+        ''' The ghid of the latest verified frame, or None.
+        '''
+        if self._head is None:
+            return None
+        return self._head.ghid
+        
+    @property
+    def counter(self):
+        if self._head is None:
+            return None
+        return self._head.counter
+        
+    @property
+    def target(self):
+        ''' What the latest verified frame binds, or None.
+        '''
+        if self._head is None:
+            return None
+        return self._head.target_vector[0]
+        
+    @property
+    def pending(self):
+        ''' The number of frames waiting on their predecessor.
+        '''
+        return sum(len(frames) for frames in self._pending.values())
+        
+    @property
+    def rejected(self):
+        ''' Maps the ghids of held frames that failed verification once
+        their predecessor arrived to the SecurityError explaining why.
+        '''
+        return dict(self._rejected)
+        
+    def __len__(self):
+        ''' The number of verified frames.
+        '''
+        return len(self._frames)
+        
+    def __contains__(self, ghid):
+        return ghid in self._frames
+        
+    def add(self, frame):
+        ''' Adds an unpacked GOBD (for example, as returned from
+        unpack_bind_dynamic) to the chain.
+        
+        raises TypeError if frame isn't a GOBD.
+        raises SecurityError if frame isn't a valid part of the chain.
+        returns True if frame (and any frames held waiting on it) was
+            verified, or False if it was already verified or is being
+            held until its predecessor arrives.
+        '''
+        if not isinstance(frame, GOBD):
+            raise TypeError(
+                'Frame must be an unpacked GOBD, for example, as returned '
+                'from unpack_bind_dynamic.'
+            )
+            
+        with self._lock:
+            if frame.ghid in self._frames:
+                return False
+            self._check_frame(frame)
+            
+            if len(frame.target_vector) == 1:
+                if self._frames:
+                    raise SecurityError(
+                        'Chain already has a first frame.'
+                    )
+                self._ghid_dynamic = frame.ghid_dynamic
+                
+            else:
+                predecessor = frame.target_vector[1]
+                if predecessor not in self._frames:
+                    self._pending.setdefault(predecessor, {})[frame.ghid] = \
+                        frame
+                    return False
+                self._check_link(frame)
+                
+            self._accept(frame)
+            self._release(frame.ghid)
+            return True
+            
+    def _check_frame(self, frame):
+        ''' Checks the binder and signature of frame.
+        '''
+        if frame.binder != self.binder.ghid:
+            raise SecurityError('Frame has a different binder than chain.')
+        self._verifier.verify_object(self.binder, frame)
+        
+    def _check_link(self, frame):
+        ''' Checks frame against its (verified) predecessor.
+        '''
+        previous = self._frames[frame.target_vector[1]]
+        if frame.ghid_dynamic != self._ghid_dynamic:
+            raise SecurityError('Frame belongs to a different chain.')
+        if previous.ghid in self._successors:
+            raise SecurityError('Frame forks the chain.')
+        if frame.counter <= previous.counter:
+            raise SecurityError('Frame counter did not increase.')
+        history = tuple(frame.target_vector[2:])
+        if history != previous.target_vector[1:len(history) + 1]:
+            raise SecurityError('Frame history is inconsistent.')
+            
+    def _accept(self, frame):
+        verified = _Frame(
+            frame.ghid,
+            frame.counter,
+            tuple(frame.target_vector)
+        )
+        self._frames[frame.ghid] = verified
+        if len(frame.target_vector) > 1:
+            self._successors[frame.target_vector[1]] = frame.ghid
+        if self._head is None or verified.counter > self._head.counter:
+            self._head = verified
+            
+    def _release(self, ghid):
+        ''' Verifies any frames that were waiting on ghid, and then any
+        that were waiting on them, etc.
+        '''
+        ready = [ghid]
+        while ready:
+            waiting = self._pending.pop(ready.pop(), {})
+            for frame in waiting.values():
+                # Signatures were checked when the frames were added.
+                try:
+                    self._check_link(frame)
+                except SecurityError as exc:
+                    self._rejected[frame.ghid] = exc
+                else:
+                    self._accept(frame)
+                    ready.append(frame.ghid)
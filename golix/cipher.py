@@ -75,6 +75,11 @@ Some initial temporary thoughts:
 # Global dependencies
 import abc
 import os
+import time
+import threading
+import collections
+import collections.abc
+import concurrent.futures
 
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives import hmac
@@ -82,8 +87,12 @@ from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives import ciphers
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from cryptography.hazmat.primitives.asymmetric import x25519
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf import hkdf
 from cryptography.exceptions import InvalidSignature
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.backends import default_backend
 
 from donna25519 import PrivateKey as ECDHPrivate
@@ -96,8 +105,13 @@ from .exceptions import SecurityError
 
 from .utils import Ghid
 from .utils import _dummy_ghid
+from .utils import _source_length
+from .utils import _StreamReader
+from .utils import _LRUCache
+from .utils import _hybridmethod
 
 from .crypto_utils import ADDRESS_ALGOS
+from .crypto_utils import cipher_length_lookup
 from .crypto_utils import Secret
 from .crypto_utils import AsymHandshake
 from .crypto_utils import AsymAck
@@ -119,18 +133,30 @@ from ._getlow import GARQ
 from ._getlow import GARQHandshake
 from ._getlow import GARQAck
 from ._getlow import GARQNak
+from ._getlow import dispatch_format
+from ._getlow import dispatch_request
+from ._getlow import peek
+from ._getlow import iter_packed
+from ._getlow import GEOCStream
+from ._getlow import GEOCStreamReader
 
 # Some globals
 CRYPTO_BACKEND = default_backend()
 DEFAULT_ADDRESSER = 1
 DEFAULT_CIPHER = 1
+# Default read size when streaming containers
+STREAM_CHUNK_SIZE = 1 << 20
 
 
 # Control * imports
 __all__ = [
     'FirstParty1',
     'SecondParty1',
-    'ThirdParty1'
+    'ThirdParty1',
+    'FirstParty2',
+    'SecondParty2',
+    'ThirdParty2',
+    'KeyPool'
 ]
 
 
@@ -153,21 +179,103 @@ class _NoopSHA512(hashes.SHA512):
     def finalize(self):
         # Yay we get to do something!
         return self.__data
+        
+        
+def _submit_bounded(executor, func, items, prefetch):
+    ''' Calls func(*args) in executor for each (key, args) in items,
+    with at most prefetch calls in flight at once. Yields (key, result)
+    pairs as the calls complete.
+    '''
+    pending = {}
+    for key, args in items:
+        pending[executor.submit(func, *args)] = key
+        if len(pending) >= prefetch:
+            done, __ = concurrent.futures.wait(
+                pending,
+                return_when = concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                yield pending.pop(future), future.result()
+                
+    for future in concurrent.futures.as_completed(pending):
+        yield pending[future], future.result()
+        
+        
+def _zeroize(ghid, key):
+    ''' Eviction callback for cached shared secrets.
+    '''
+    key[:] = bytes(len(key))
+        
+        
+class _NoopCipherContext:
+    ''' Passthrough stand-in for a cryptography CipherContext.
+    '''
+    def update(self, data):
+        return data
+        
+    def finalize(self):
+        return b''
     
     
+class _LazyKeys(collections.abc.Mapping):
+    ''' Read-only keys mapping that converts each packed key into its
+    crypto object (with unpacker(name, packed_key)) only when it's first
+    accessed. Verifying signatures, for example, never needs the
+    encryption or exchange keys.
+    '''
+    
+    def __init__(self, packed_keys, unpacker):
+        self._packed = packed_keys
+        self._unpacker = unpacker
+        self._unpacked = {}
+        
+    def __getitem__(self, name):
+        try:
+            return self._unpacked[name]
+        except KeyError:
+            pass
+        # Worst case, two threads both unpack the same key; that's harmless
+        key = self._unpacker(name, self._packed[name])
+        self._unpacked[name] = key
+        return key
+        
+    def __contains__(self, name):
+        # Mapping's default would unpack the key to check for it.
+        return name in self._packed
+        
+    def __iter__(self):
+        return iter(self._packed)
+        
+    def __len__(self):
+        return len(self._packed)
+        
+        
 class _IdentityBase(metaclass=abc.ABCMeta):
+    _KEY_NAMES = ('signature', 'encryption', 'exchange')
+    
     def __init__(self, keys, ghid):
         self._ghid = ghid
         
-        try:
-            self._signature_key = keys['signature']
-            self._encryption_key = keys['encryption']
-            self._exchange_key = keys['exchange']
-        except (KeyError, TypeError) as e:
-            raise RuntimeError(
-                'Generating ID from existing keys requires dict-like obj '
-                'with "signature", "encryption", and "exchange" keys.'
-            ) from e
+        # Don't access the keys, which might be lazy; just check for them.
+        if not isinstance(keys, collections.abc.Mapping) or \
+            any(name not in keys for name in self._KEY_NAMES):
+                raise RuntimeError(
+                    'Generating ID from existing keys requires dict-like obj '
+                    'with "signature", "encryption", and "exchange" keys.'
+                )
+        self._keys = keys
+        
+    @property
+    def _signature_key(self):
+        return self._keys['signature']
+        
+    @property
+    def _encryption_key(self):
+        return self._keys['encryption']
+        
+    @property
+    def _exchange_key(self):
+        return self._keys['exchange']
     
     @property
     def ghid(self):
@@ -200,6 +308,16 @@ class _IdentityBase(metaclass=abc.ABCMeta):
 class _ObjectHandlerBase(metaclass=abc.ABCMeta):
     ''' Base class for anything that needs to unpack Golix objects.
     '''
+    # Maps low-level formats to the method that unpacks them, for unpack_any
+    _UNPACKER_LOOKUP = {
+        GIDC: 'unpack_identity',
+        GEOC: 'unpack_container',
+        GOBS: 'unpack_bind_static',
+        GOBD: 'unpack_bind_dynamic',
+        GDXX: 'unpack_debind',
+        GARQ: 'unpack_request',
+    }
+    
     @staticmethod
     def unpack_identity(packed):
         gidc = GIDC.unpack(packed)
@@ -234,27 +352,36 @@ class _ObjectHandlerBase(metaclass=abc.ABCMeta):
         pass
         
     def unpack_any(self, packed):
-        ''' Try to unpack using any available parser.
-        Raises TypeError if no parser is found.
-        '''
-        for parser in (self.unpack_identity,
-                        self.unpack_container,
-                        self.unpack_bind_static,
-                        self.unpack_bind_dynamic,
-                        self.unpack_debind,
-                        self.unpack_request):
-            try:
-                obj = parser(packed)
-            # Hm, don't really like this.
-            except (ParseError, TypeError):
-                pass
-            else:
-                break
-        else:
-            raise ParseError(
-                'Packed data does not appear to be a Golix object.'
-            )
-        return obj
+        ''' Unpack using the parser matching the object's magic number.
+        Raises ParseError if the magic is unknown (or parsing fails).
+        '''
+        unpacker = getattr(
+            self,
+            self._UNPACKER_LOOKUP[dispatch_format(packed)]
+        )
+        return unpacker(packed)
+        
+    def unpack_many(self, source, executor=None, prefetch=16, limits=None):
+        ''' Lazily unpacks objects packed back-to-back in a bytes-like,
+        file-like, or iterable source, yielding them in order. Objects
+        larger than limits (see iter_packed) are rejected.
+        
+        If executor (eg a concurrent.futures.ThreadPoolExecutor) is
+        passed, unpacking (including address verification) happens
+        there, with up to prefetch objects in flight at once.
+        '''
+        if executor is None:
+            for packed in iter_packed(source, limits):
+                yield self.unpack_any(packed)
+            return
+        
+        pending = collections.deque()
+        for packed in iter_packed(source, limits):
+            pending.append(executor.submit(self.unpack_any, packed))
+            if len(pending) >= prefetch:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
     
     
 class _SecondPartyBase(metaclass=abc.ABCMeta):
@@ -290,11 +417,17 @@ class _SecondPartyBase(metaclass=abc.ABCMeta):
         ciphersuite.
         '''
         ghid = gidc.ghid
-        keys = cls._unpack_keys({
-            'signature': gidc.signature_key,
-            'encryption': gidc.encryption_key,
-            'exchange': gidc.exchange_key
-        })
+        # Keys are only converted into crypto objects when first used.
+        # Copy them, since gidc may be a view of a buffer the caller will
+        # reuse.
+        keys = _LazyKeys(
+            {
+                'signature': bytes(gidc.signature_key),
+                'encryption': bytes(gidc.encryption_key),
+                'exchange': bytes(gidc.exchange_key)
+            },
+            cls._unpack_key
+        )
         self = cls(keys=keys, ghid=ghid)
         return self
         
@@ -303,6 +436,7 @@ class _SecondPartyBase(metaclass=abc.ABCMeta):
         ''' Loads a packed gidc into a SecondParty. Also does not select
         the correct SecondParty for the packed gidc's ciphersuite.
         '''
+        packed = bytes(packed)
         gidc = _ObjectHandlerBase.unpack_identity(packed)
         self = cls.from_identity(gidc)
         self.packed = packed
@@ -317,16 +451,27 @@ class _SecondPartyBase(metaclass=abc.ABCMeta):
         pass
         
     @classmethod
-    @abc.abstractmethod
     def _unpack_keys(cls, keys):
         ''' Convert keys dic into objects used for crypto operations
         from bytes-like objects used in GIDC.
         '''
+        return {name: cls._unpack_key(name, key) for name, key in keys.items()}
+        
+    @classmethod
+    @abc.abstractmethod
+    def _unpack_key(cls, name, key):
+        ''' Convert a single named key into the object used for crypto
+        operations from the bytes-like object used in GIDC.
+        '''
         pass
         
         
 class _FirstPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
     DEFAULT_ADDRESS_ALGO = DEFAULT_ADDRESSER
+    # Maximum number of partners to cache shared secrets for
+    SHARED_CACHE_SIZE = 256
+    # Bytes that symmetric encryption adds to the plaintext (eg AEAD tags)
+    _CIPHERTEXT_OVERHEAD = 0
     
     def __init__(self, keys=None, ghid=None, address_algo='default', *args,
                  **kwargs):
@@ -355,6 +500,15 @@ class _FirstPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
             )
             ghid = self._second_party.ghid
             
+        # Shared secrets (for GARQ MACs) by partner ghid. These are zeroed
+        # out when evicted or invalidated, so callers only ever get copies,
+        # taken under _shared_lock (which evictions also happen under).
+        self._shared_cache = _LRUCache(
+            self.SHARED_CACHE_SIZE,
+            on_evict = _zeroize
+        )
+        self._shared_lock = threading.Lock()
+            
         # Now dispatch super() with the adjusted keys, ghid
         super().__init__(keys=keys, ghid=ghid, *args, **kwargs)
         
@@ -375,7 +529,29 @@ class _FirstPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
         # we're not currently passing in the packed identity.
         return self._second_party
          
-    def make_container(self, secret, plaintext):
+    def _sign_object(self, obj):
+        ''' Signs a packed object, returning it.
+        '''
+        obj.pack_signature(self._sign(obj.ghid.address))
+        return obj
+        
+    def _sign_many(self, objs, executor=None):
+        ''' Signs packed objects from the iterable objs, returning them
+        as a list in the same order. If objs is lazy, packing the next
+        object overlaps with signing the previous ones in the executor.
+        '''
+        if executor is None:
+            return [self._sign_object(obj) for obj in objs]
+        
+        pending = [
+            (obj, executor.submit(self._sign, obj.ghid.address))
+            for obj in objs
+        ]
+        for obj, future in pending:
+            obj.pack_signature(future.result())
+        return [obj for obj, future in pending]
+        
+    def _pack_container(self, secret, plaintext):
         if not self._typecheck_secret(secret):
             raise TypeError(
                 'Secret must be a properly-formatted Secret compatible with '
@@ -385,21 +561,86 @@ class _FirstPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
         geoc = GEOC(author=self.ghid)
         geoc.payload = self._encrypt(secret, plaintext)
         geoc.pack(cipher=self.ciphersuite, address_algo=self.address_algo)
-        signature = self._sign(geoc.ghid.address)
-        geoc.pack_signature(signature)
         return geoc
         
-    def make_bind_static(self, target):
+    def make_container(self, secret, plaintext):
+        return self._sign_object(self._pack_container(secret, plaintext))
+        
+    def make_containers(self, items, executor=None):
+        ''' Batch version of make_container. Items is an iterable of
+        (secret, plaintext) pairs. If executor (eg a ThreadPoolExecutor)
+        is passed, signing is spread across it, while packing continues
+        on the calling thread. Returns a list of containers, in the same
+        order as items.
+        '''
+        return self._sign_many(
+            (self._pack_container(secret, plaintext)
+             for secret, plaintext in items),
+            executor
+        )
+        
+    def make_container_stream(self, secret, source, length=None,
+                              chunk_size=STREAM_CHUNK_SIZE):
+        ''' Streaming version of make_container, for payloads too
+        large to hold in memory. Source may be bytes-like, file-like, or
+        an iterable of bytes-like chunks. Length is the plaintext length,
+        and is required for iterables.
+        
+        Returns a GEOCStream; iterate over it to get the packed container
+        in chunks. Its ghid is available once iteration has completed.
+        '''
+        if not self._typecheck_secret(secret):
+            raise TypeError(
+                'Secret must be a properly-formatted Secret compatible with '
+                'the current identity\'s declared ciphersuite.'
+            )
+            
+        if length is None:
+            length = _source_length(source)
+            if length is None:
+                raise ValueError('Length is required for iterable sources.')
+        
+        reader = _StreamReader(source)
+        
+        def ciphertext():
+            worker = self._encryptor(secret)
+            chunk = reader.read(chunk_size)
+            while chunk:
+                yield worker.update(chunk)
+                chunk = reader.read(chunk_size)
+            tail = worker.finalize()
+            if tail:
+                yield tail
+        
+        return GEOCStream(
+            author = self.ghid,
+            len_payload = length + self._CIPHERTEXT_OVERHEAD,
+            payload = ciphertext(),
+            cipher = self.ciphersuite,
+            address_algo = self.address_algo,
+            signer = self._sign
+        )
+        
+    def _pack_bind_static(self, target):
         gobs = GOBS(
             binder = self.ghid,
             target = target
         )
         gobs.pack(cipher=self.ciphersuite, address_algo=self.address_algo)
-        signature = self._sign(gobs.ghid.address)
-        gobs.pack_signature(signature)
         return gobs
         
-    def make_bind_dynamic(self, counter, target_vector, ghid_dynamic=None):
+    def make_bind_static(self, target):
+        return self._sign_object(self._pack_bind_static(target))
+        
+    def make_bind_static_many(self, targets, executor=None):
+        ''' Batch version of make_bind_static; see make_containers.
+        '''
+        return self._sign_many(
+            (self._pack_bind_static(target) for target in targets),
+            executor
+        )
+        
+    def _pack_bind_dynamic(self, counter, target_vector, ghid_dynamic=None):
         gobd = GOBD(
             binder = self.ghid,
             counter = counter,
@@ -407,20 +648,42 @@ class _FirstPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
             ghid_dynamic = ghid_dynamic
         )
         gobd.pack(cipher=self.ciphersuite, address_algo=self.address_algo)
-        signature = self._sign(gobd.ghid.address)
-        gobd.pack_signature(signature)
         return gobd
         
-    def make_debind(self, target):
+    def make_bind_dynamic(self, counter, target_vector, ghid_dynamic=None):
+        return self._sign_object(
+            self._pack_bind_dynamic(counter, target_vector, ghid_dynamic)
+        )
+        
+    def make_bind_dynamic_many(self, items, executor=None):
+        ''' Batch version of make_bind_dynamic. Items is an iterable of
+        (counter, target_vector) or (counter, target_vector, ghid_dynamic)
+        tuples; see make_containers.
+        '''
+        return self._sign_many(
+            (self._pack_bind_dynamic(*item) for item in items),
+            executor
+        )
+        
+    def _pack_debind(self, target):
         gdxx = GDXX(
             debinder = self.ghid,
             target = target
         )
         gdxx.pack(cipher=self.ciphersuite, address_algo=self.address_algo)
-        signature = self._sign(gdxx.ghid.address)
-        gdxx.pack_signature(signature)
         return gdxx
         
+    def make_debind(self, target):
+        return self._sign_object(self._pack_debind(target))
+        
+    def make_debind_many(self, targets, executor=None):
+        ''' Batch version of make_debind; see make_containers.
+        '''
+        return self._sign_many(
+            (self._pack_debind(target) for target in targets),
+            executor
+        )
+        
     def make_handshake(self, secret, target):
         return AsymHandshake(
             author = self.ghid,
@@ -485,7 +748,7 @@ class _FirstPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
         garq.pack(cipher=self.ciphersuite, address_algo=self.address_algo)
         garq.pack_signature(
             self._mac(
-                key = self._derive_shared(recipient),
+                key = self._get_shared(recipient),
                 data = garq.ghid.address
             )
         )
@@ -506,6 +769,85 @@ class _FirstPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
         plaintext = cls._decrypt(secret, container.payload)
         # This will need to be converted into a namedtuple or something
         return plaintext
+        
+    @classmethod
+    def _receive_or_error(cls, author, secret, container):
+        ''' Like receive_container, but returns SecurityErrors instead
+        of raising them.
+        '''
+        try:
+            return cls.receive_container(author, secret, container)
+        except SecurityError as exc:
+            return exc
+        
+    @classmethod
+    def receive_container_many(cls, triples, executor=None, prefetch=16):
+        ''' Batch version of receive_container. Triples is an iterable
+        of (author, secret, container). Yields (container, plaintext)
+        pairs; if verification fails, plaintext is the SecurityError
+        instead.
+        
+        If executor (eg a ThreadPoolExecutor) is passed, containers are
+        verified and decrypted there, with up to prefetch in flight at
+        once, and yielded as they complete; otherwise, they're yielded
+        in order.
+        '''
+        if executor is None:
+            for author, secret, container in triples:
+                yield container, cls._receive_or_error(
+                    author,
+                    secret,
+                    container
+                )
+            return
+            
+        yield from _submit_bounded(
+            executor,
+            cls._receive_or_error,
+            (
+                (container, (author, secret, container))
+                for author, secret, container in triples
+            ),
+            prefetch
+        )
+        
+    @classmethod
+    def receive_container_stream(cls, author, secret, source,
+                                 chunk_size=STREAM_CHUNK_SIZE):
+        ''' Streaming version of receive_container. Source may be
+        bytes-like, file-like, or an iterable of bytes-like chunks. The
+        header is parsed immediately; returns a generator of plaintext
+        chunks.
+        
+        Seekable sources are fully verified before any plaintext is
+        yielded. Other sources are verified as they are read, so the
+        generator raises SecurityError only after yielding the last
+        chunk; discard the plaintext if that happens.
+        '''
+        cls._typecheck_2ndparty(author)
+        reader = GEOCStreamReader(source)
+        
+        def plaintext():
+            if reader.seekable:
+                for chunk in reader.iter_payload(chunk_size):
+                    pass
+                cls._verify(author, reader.signature, reader.ghid.address)
+                reader.rewind()
+                chunks = reader.iter_payload(chunk_size, verify=False)
+            else:
+                chunks = reader.iter_payload(chunk_size)
+                
+            worker = cls._decryptor(secret)
+            for chunk in chunks:
+                yield worker.update(chunk)
+            tail = worker.finalize()
+            
+            if not reader.seekable:
+                cls._verify(author, reader.signature, reader.ghid.address)
+            if tail:
+                yield tail
+                
+        return plaintext()
     
     @classmethod
     def receive_bind_static(cls, binder, binding):
@@ -553,39 +895,103 @@ class _FirstPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
         garq = GARQ.unpack(packed)
         plaintext = self._decrypt_asym(garq.payload)
         
-        # Could do this with a loop, but it gets awkward when trying to
-        # assign stuff to the resulting object.
+        # Dispatch on the payload magic instead of trial parsing.
         try:
-            unpacked = GARQHandshake.unpack(plaintext)
+            unpacked = dispatch_request(plaintext).unpack(plaintext)
+        except ParseError as exc:
+            raise SecurityError('Could not securely unpack request.') from exc
+            
+        if isinstance(unpacked, GARQHandshake):
             request = AsymHandshake(
                 author = unpacked.author,
                 target = unpacked.target,
                 secret = unpacked.secret
             )
-        except ParseError:
-            try:
-                unpacked = GARQAck.unpack(plaintext)
-                request = AsymAck(
-                    author = unpacked.author,
-                    target = unpacked.target,
-                    status = unpacked.status
-                )
-            except ParseError:
-                try:
-                    unpacked = GARQNak.unpack(plaintext)
-                    request = AsymNak(
-                        author = unpacked.author,
-                        target = unpacked.target,
-                        status = unpacked.status
-                    )
-                except ParseError:
-                    raise SecurityError('Could not securely unpack request.')
+        elif isinstance(unpacked, GARQNak):
+            request = AsymNak(
+                author = unpacked.author,
+                target = unpacked.target,
+                status = unpacked.status
+            )
+        else:
+            request = AsymAck(
+                author = unpacked.author,
+                target = unpacked.target,
+                status = unpacked.status
+            )
             
         garq._plaintext = request
         garq._author = request.author
         
         return garq
         
+    def _unpack_request_or_error(self, packed):
+        ''' Like unpack_request, but returns SecurityErrors and
+        ParseErrors instead of raising them.
+        '''
+        try:
+            return self.unpack_request(packed)
+        except (SecurityError, ParseError) as exc:
+            return exc
+            
+    def unpack_request_many(self, requests, executor=None, prefetch=16):
+        ''' Batch version of unpack_request, for draining an inbox.
+        Requests is an iterable of packed GARQs. Yields (packed, garq)
+        pairs; if the request cannot be unpacked, garq is the
+        SecurityError or ParseError instead.
+        
+        Requests addressed to anyone else are skipped, based upon their
+        recipient, without any decryption. Anything that isn't a GARQ is
+        yielded as a ParseError.
+        
+        If executor (eg a ThreadPoolExecutor) is passed, requests are
+        decrypted there, with up to prefetch in flight at once, and
+        yielded as they complete; otherwise, they're yielded in order.
+        Requests still need to go through receive_request to verify
+        their MACs.
+        '''
+        def ours():
+            for packed in requests:
+                try:
+                    header = peek(packed)
+                    if header.magic != GARQ.CODEC.MAGIC:
+                        raise ParseError(
+                            'Not a request: ' + repr(header.magic)
+                        )
+                except ParseError as exc:
+                    yield packed, exc
+                    continue
+                    
+                if header.recipient == self.ghid:
+                    yield packed, None
+        
+        if executor is None:
+            for packed, error in ours():
+                if error is None:
+                    yield packed, self._unpack_request_or_error(packed)
+                else:
+                    yield packed, error
+            return
+            
+        pending = {}
+        for packed, error in ours():
+            if error is not None:
+                yield packed, error
+                continue
+                
+            future = executor.submit(self._unpack_request_or_error, packed)
+            pending[future] = packed
+            if len(pending) >= prefetch:
+                done, __ = concurrent.futures.wait(
+                    pending,
+                    return_when = concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield pending.pop(future), future.result()
+                    
+        for future in concurrent.futures.as_completed(pending):
+            yield pending[future], future.result()
+        
     def receive_request(self, requestor, request):
         ''' Verifies the request and exposes its contents.
         '''
@@ -606,7 +1012,7 @@ class _FirstPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
             ) from e
             
         self._verify_mac(
-            key = self._derive_shared(requestor),
+            key = self._get_shared(requestor),
             data = request.ghid.address,
             mac = request.signature
         )
@@ -687,6 +1093,51 @@ class _FirstPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
         '''
         pass
         
+    @classmethod
+    @abc.abstractmethod
+    def _encryptor(cls, secret):
+        ''' Placeholder incremental symmetric encryptor. Returns an
+        object with update(data) and finalize() methods.
+        '''
+        pass
+        
+    @classmethod
+    @abc.abstractmethod
+    def _decryptor(cls, secret):
+        ''' Placeholder incremental symmetric decryptor. Returns an
+        object with update(data) and finalize() methods.
+        '''
+        pass
+        
+    def _get_shared(self, partner):
+        ''' Returns (a copy of) the cached shared secret with partner.
+        '''
+        with self._shared_lock:
+            key = self._shared_cache.get(partner.ghid)
+            if key is not None:
+                return bytes(key)
+                
+        # Derive outside the lock; if another thread beat us to it, keep
+        # theirs, since it may already be in use.
+        derived = bytearray(self._derive_shared(partner))
+        with self._shared_lock:
+            key = self._shared_cache.setdefault(partner.ghid, derived)
+            shared = bytes(key)
+        if key is not derived:
+            _zeroize(partner.ghid, derived)
+        return shared
+        
+    def invalidate_shared(self, partner=None):
+        ''' Forgets (and zeroes out) the cached shared secret with
+        partner, which may be a SecondParty or a Ghid, or with everyone
+        if partner is None.
+        '''
+        with self._shared_lock:
+            if partner is None:
+                self._shared_cache.clear()
+            else:
+                self._shared_cache.discard(getattr(partner, 'ghid', partner))
+        
     @abc.abstractmethod
     def _derive_shared(self, partner):
         ''' Derive a shared secret (not necessarily a Secret!) with the
@@ -736,7 +1187,22 @@ class _ThirdPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
     ''' Subclass this (on a per-ciphersuite basis) for servers, and
     other parties that have no access to privileged information.
     They can only verify.
+    
+    If verification_cache_size is passed, successful verifications are
+    remembered (keyed by object ghid, signer ghid, and signature), so
+    re-verifying the same object is just a lookup. This is safe because
+    objects are content-addressed. The verification methods can also be
+    called on the class itself, without a cache.
     '''
+    # Overridden by instances with a cache.
+    _verified = None
+    
+    def __init__(self, verification_cache_size=None):
+        if verification_cache_size:
+            self._verified = _LRUCache(verification_cache_size)
+        else:
+            self._verified = None
+    
     @property
     def ciphersuite(self):
         return self._ciphersuite
@@ -753,21 +1219,10 @@ class _ThirdPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
         
     @staticmethod
     def unpack_object(packed):
-        ''' Unpacks any Golix object.
+        ''' Unpacks any Golix object, dispatching on its magic number.
+        Raises ParseError if the magic is unknown (or parsing fails).
         '''
-        success = False
-        for golix_format in (GIDC, GEOC, GOBS, GOBD, GDXX, GARQ):
-            try:
-                obj = golix_format.unpack(packed)
-                success = True
-            # Hm, don't really like this.
-            except (ParseError, TypeError):
-                pass
-        if not success:
-            raise ParseError(
-                'Packed data does not appear to be a Golix object.'
-            )
-        return obj
+        return dispatch_format(packed).unpack(packed)
         
     @classmethod
     def unpack_request(cls, packed):
@@ -778,8 +1233,8 @@ class _ThirdPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
         garq = GARQ.unpack(packed)
         return garq
         
-    @classmethod
-    def verify_object(cls, second_party, obj):
+    @_hybridmethod
+    def verify_object(self, second_party, obj):
         ''' Verifies the signature of any symmetric object (aka
         everything except GARQ) against data.
         
@@ -792,11 +1247,22 @@ class _ThirdPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
             isinstance(obj, GOBS) or \
             isinstance(obj, GOBD) or \
             isinstance(obj, GDXX):
-                return cls._verify(
-                    public = second_party,
-                    signature = obj.signature,
-                    data = obj.ghid.address
-                )
+                if self._verified is None:
+                    return self._verify(
+                        public = second_party,
+                        signature = obj.signature,
+                        data = obj.ghid.address
+                    )
+                
+                key = (obj.ghid, second_party.ghid, bytes(obj.signature))
+                if self._verified.get(key) is None:
+                    self._verify(
+                        public = second_party,
+                        signature = obj.signature,
+                        data = obj.ghid.address
+                    )
+                    self._verified.put(key, True)
+                return True
         elif isinstance(obj, GARQ):
             raise ValueError(
                 'Asymmetric objects cannot be verified by third parties. '
@@ -809,6 +1275,59 @@ class _ThirdPartyBase(_ObjectHandlerBase, metaclass=abc.ABCMeta):
         else:
             raise TypeError('Obj must be a Golix object: GIDC, GEOC, etc.')
             
+    @_hybridmethod
+    def _verify_or_error(self, second_party, obj):
+        ''' Like verify_object, but returns SecurityErrors instead of
+        raising them.
+        '''
+        try:
+            return self.verify_object(second_party, obj)
+        except SecurityError as exc:
+            return exc
+            
+    @_hybridmethod
+    def verify_many(self, pairs, executor=None, prefetch=16):
+        ''' Verifies many objects at once. Pairs is an iterable of
+        (second_party, obj) tuples; see verify_object.
+        
+        If executor (eg a concurrent.futures.ThreadPoolExecutor) is
+        passed, the verifications are spread across it, with up to
+        prefetch in flight at once. OpenSSL releases the GIL while
+        verifying, so this scales with threads.
+        
+        returns a list, in the same order as pairs, containing True for
+            each successful verification, and the SecurityError for each
+            failure.
+        raises TypeError or ValueError (as verify_object) for unsupported
+            objects.
+        '''
+        if executor is None:
+            return [
+                self._verify_or_error(second_party, obj)
+                for second_party, obj in pairs
+            ]
+            
+        results = []
+        futures = collections.deque()
+        for second_party, obj in pairs:
+            futures.append(
+                executor.submit(self._verify_or_error, second_party, obj)
+            )
+            if len(futures) >= prefetch:
+                results.append(futures.popleft().result())
+                
+        results.extend(future.result() for future in futures)
+        return results
+        
+    @_hybridmethod
+    def verification_cache_info(self):
+        ''' Returns a utils.CacheInfo for the verification cache, or None
+        if it's disabled.
+        '''
+        if self._verified is None:
+            return None
+        return self._verified.cache_info()
+            
     @classmethod
     @abc.abstractmethod
     def _verify(cls, public, signature, data):
@@ -828,8 +1347,8 @@ class SecondParty0(_SecondPartyBase, _IdentityBase):
         return keys
         
     @classmethod
-    def _unpack_keys(cls, keys):
-        return keys
+    def _unpack_key(cls, name, key):
+        return key
         
         
 class FirstParty0(_FirstPartyBase, _IdentityBase):
@@ -956,6 +1475,18 @@ class FirstParty0(_FirstPartyBase, _IdentityBase):
         Data should be bytes-like. Key should be bytes-like.
         '''
         return data
+        
+    @classmethod
+    def _encryptor(cls, secret):
+        ''' Placeholder incremental symmetric encryptor.
+        '''
+        return _NoopCipherContext()
+        
+    @classmethod
+    def _decryptor(cls, secret):
+        ''' Placeholder incremental symmetric decryptor.
+        '''
+        return _NoopCipherContext()
     
     def _derive_shared(self, partner):
         ''' Derive a shared secret with the partner.
@@ -1000,19 +1531,16 @@ class SecondParty1(_SecondPartyBase, _IdentityBase):
         return packkeys
         
     @classmethod
-    def _unpack_keys(cls, keys):
-        n_sig = int.from_bytes(keys['signature'], byteorder='big')
-        n_enc = int.from_bytes(keys['encryption'], byteorder='big')
-        
-        nums_sig = rsa.RSAPublicNumbers(n=n_sig, e=65537)
-        nums_enc = rsa.RSAPublicNumbers(n=n_enc, e=65537)
-        
-        unpackkeys = {
-            'signature': nums_sig.public_key(CRYPTO_BACKEND),
-            'encryption': nums_enc.public_key(CRYPTO_BACKEND),
-            'exchange': ECDHPublic(bytes(keys['exchange'])),
-        }
-        return unpackkeys
+    def _unpack_key(cls, name, key):
+        if name == 'exchange':
+            return ECDHPublic(bytes(key))
+        elif name in ('signature', 'encryption'):
+            n = int.from_bytes(key, byteorder='big')
+            return rsa.RSAPublicNumbers(n=n, e=65537).public_key(
+                CRYPTO_BACKEND
+            )
+        else:
+            raise KeyError('Unknown key: ' + str(name))
 
 
 # RSA-PSS Signature salt length.
@@ -1024,6 +1552,9 @@ class FirstParty1(_FirstPartyBase, _IdentityBase):
     '''
     _ciphersuite = 1
     _2PID = SecondParty1
+    # Set this to a KeyPool to generate new identities from pre-generated
+    # keys, when available.
+    KEY_POOL = None
         
     # Well it's not exactly repeating yourself, though it does mean there
     # are sorta two ways to perform decryption. Best practice = always decrypt
@@ -1041,6 +1572,14 @@ class FirstParty1(_FirstPartyBase, _IdentityBase):
         
     @classmethod
     def _generate_keys(cls):
+        if cls.KEY_POOL is not None:
+            serialized = cls.KEY_POOL.take()
+            if serialized is not None:
+                return cls._deserialize_keys(serialized)
+        return cls._new_keys()
+        
+    @classmethod
+    def _new_keys(cls):
         keys = {}
         keys['signature'] = rsa.generate_private_key(
             public_exponent = 65537,
@@ -1055,39 +1594,53 @@ class FirstParty1(_FirstPartyBase, _IdentityBase):
         keys['exchange'] = ECDHPrivate()
         return keys
         
-    def _serialize(self):
+    @staticmethod
+    def _serialize_keys(keys):
+        ''' Converts private keys into bytes, eg to pass them between
+        processes.
+        '''
         return {
-            'ghid': bytes(self.ghid),
-            'signature': self._signature_key.private_bytes(
+            'signature': keys['signature'].private_bytes(
                 encoding = serialization.Encoding.DER,
                 format = serialization.PrivateFormat.PKCS8,
                 encryption_algorithm = serialization.NoEncryption()
             ),
-            'encryption': self._encryption_key.private_bytes(
+            'encryption': keys['encryption'].private_bytes(
                 encoding = serialization.Encoding.DER,
                 format = serialization.PrivateFormat.PKCS8,
                 encryption_algorithm = serialization.NoEncryption()
             ),
-            'exchange': bytes(self._exchange_key.private)
+            'exchange': bytes(keys['exchange'].private)
         }
         
+    @staticmethod
+    def _deserialize_keys(serialized):
+        ''' Inverse of _serialize_keys.
+        '''
+        return {
+            'signature': serialization.load_der_private_key(
+                data = serialized['signature'],
+                password = None,
+                backend = CRYPTO_BACKEND
+            ),
+            'encryption': serialization.load_der_private_key(
+                data = serialized['encryption'],
+                password = None,
+                backend = CRYPTO_BACKEND
+            ),
+            'exchange': ECDHPrivate.load(serialized['exchange'])
+        }
+        
+    def _serialize(self):
+        serialized = self._serialize_keys(self._keys)
+        serialized['ghid'] = bytes(self.ghid)
+        return serialized
+        
     @classmethod
     def _from_serialized(cls, condensed):
         try:
             ghid = Ghid.from_bytes(condensed['ghid'])
-            keys = {
-                'signature': serialization.load_der_private_key(
-                    data = condensed['signature'],
-                    password = None,
-                    backend = CRYPTO_BACKEND
-                ),
-                'encryption': serialization.load_der_private_key(
-                    data = condensed['encryption'],
-                    password = None,
-                    backend = CRYPTO_BACKEND
-                ),
-                'exchange': ECDHPrivate.load(condensed['exchange'])
-            }
+            keys = cls._deserialize_keys(condensed)
         except (TypeError, KeyError) as e:
             raise TypeError(
                 'serialization must be compatible with _serialize.'
@@ -1107,35 +1660,39 @@ class FirstParty1(_FirstPartyBase, _IdentityBase):
     def _encrypt(cls, secret, data):
         ''' Symmetric encryptor.
         '''
-        # Could we do eg memoryview instead?
-        if not isinstance(data, bytes):
-            data = bytes(data)
-            
+        worker = cls._encryptor(secret)
+        return worker.update(data) + worker.finalize()
+        
+    @classmethod
+    def _encryptor(cls, secret):
+        ''' Incremental symmetric encryptor.
+        '''
         instance = ciphers.Cipher(
             ciphers.algorithms.AES(secret.key),
             ciphers.modes.CTR(secret.seed),
             backend = CRYPTO_BACKEND
         )
-        worker = instance.encryptor()
-        return worker.update(data) + worker.finalize()
+        return instance.encryptor()
         
     @classmethod
-    def _decrypt(cls, secret, data):
-        ''' Symmetric decryptor.
-        
-        Handle multiple ciphersuites by having a SecondParty for
-        whichever author created it, and calling their decrypt instead.
+    def _decryptor(cls, secret):
+        ''' Incremental symmetric decryptor.
         '''
-        # Could we do eg memoryview instead?
-        if not isinstance(data, bytes):
-            data = bytes(data)
-            
         instance = ciphers.Cipher(
             ciphers.algorithms.AES(secret.key),
             ciphers.modes.CTR(secret.seed),
             backend = CRYPTO_BACKEND
         )
-        worker = instance.decryptor()
+        return instance.decryptor()
+        
+    @classmethod
+    def _decrypt(cls, secret, data):
+        ''' Symmetric decryptor.
+        
+        Handle multiple ciphersuites by having a SecondParty for
+        whichever author created it, and calling their decrypt instead.
+        '''
+        worker = cls._decryptor(secret)
         return worker.update(data) + worker.finalize()
         
     def _sign(self, data):
@@ -1223,14 +1780,17 @@ class FirstParty1(_FirstPartyBase, _IdentityBase):
     def _decrypt_asym(self, data):
         ''' Placeholder asymmetric decryptor.
         '''
-        plaintext = self._encryption_key.decrypt(
-            bytes(data),
-            padding.OAEP(
-                mgf = padding.MGF1(algorithm=hashes.SHA512()),
-                algorithm = hashes.SHA512(),
-                label = b''
+        try:
+            plaintext = self._encryption_key.decrypt(
+                bytes(data),
+                padding.OAEP(
+                    mgf = padding.MGF1(algorithm=hashes.SHA512()),
+                    algorithm = hashes.SHA512(),
+                    label = b''
+                )
             )
-        )
+        except ValueError as exc:
+            raise SecurityError('Failed to decrypt request.') from exc
         return plaintext
     
     def _derive_shared(self, partner):
@@ -1242,7 +1802,9 @@ class FirstParty1(_FirstPartyBase, _IdentityBase):
         # Get both of our addresses and then the bitwise XOR of them both
         my_hash = self.ghid.address
         their_hash = partner.ghid.address
-        salt = bytes([a ^ b for a, b in zip(my_hash, their_hash)])
+        salt = (
+            int.from_bytes(my_hash, 'big') ^ int.from_bytes(their_hash, 'big')
+        ).to_bytes(len(my_hash), 'big')
         
         instance = hkdf.HKDF(
             algorithm = hashes.SHA512(),
@@ -1297,3 +1859,459 @@ class ThirdParty1(_ThirdPartyBase):
     # Note that, since this classmethod is from a different class, the
     # cls passed internally will be FirstParty0, NOT ThirdParty0.
     _verify = FirstParty1._verify
+    
+    
+# ###############################################
+# Ciphersuite 2: Ed25519, X25519, AES-256-GCM
+# ###############################################
+
+
+# GCM authentication tag length
+_GCM_TAG_LENGTH = 16
+# X25519 public key length, also used for sealed box ephemeral keys
+_X25519_LENGTH = 32
+
+
+class _GCMEncryptor:
+    ''' Incremental AES-GCM encryptor that appends the tag on
+    finalize, so the ciphertext is self-contained.
+    '''
+    def __init__(self, ctx):
+        self._ctx = ctx
+        
+    def update(self, data):
+        return self._ctx.update(data)
+        
+    def finalize(self):
+        return self._ctx.finalize() + self._ctx.tag
+        
+        
+class _GCMDecryptor:
+    ''' Incremental AES-GCM decryptor for ciphertexts from
+    _GCMEncryptor. Holds back the last bytes it's been given, since they
+    might be the tag, until finalize.
+    '''
+    def __init__(self, ctx):
+        self._ctx = ctx
+        self._tail = b''
+        
+    def update(self, data):
+        if len(data) >= _GCM_TAG_LENGTH:
+            split = len(data) - _GCM_TAG_LENGTH
+            plaintext = self._ctx.update(self._tail)
+            plaintext += self._ctx.update(data[:split])
+            self._tail = bytes(data[split:])
+        else:
+            buffered = self._tail + bytes(data)
+            split = max(len(buffered) - _GCM_TAG_LENGTH, 0)
+            plaintext = self._ctx.update(buffered[:split])
+            self._tail = buffered[split:]
+        return plaintext
+        
+    def finalize(self):
+        if len(self._tail) != _GCM_TAG_LENGTH:
+            raise SecurityError('Ciphertext is too short.')
+        try:
+            return self._ctx.finalize_with_tag(self._tail)
+        except InvalidTag as exc:
+            raise SecurityError('Failed to authenticate ciphertext.') from exc
+    
+
+class SecondParty2(_SecondPartyBase, _IdentityBase):
+    _ciphersuite = 2
+    
+    @classmethod
+    def _pack_keys(cls, keys):
+        return {
+            name: keys[name].public_bytes(
+                encoding = serialization.Encoding.Raw,
+                format = serialization.PublicFormat.Raw
+            )
+            for name in cls._KEY_NAMES
+        }
+        
+    @classmethod
+    def _unpack_key(cls, name, key):
+        if name == 'signature':
+            return ed25519.Ed25519PublicKey.from_public_bytes(bytes(key))
+        elif name in ('encryption', 'exchange'):
+            return x25519.X25519PublicKey.from_public_bytes(bytes(key))
+        else:
+            raise KeyError('Unknown key: ' + str(name))
+            
+            
+class FirstParty2(_FirstPartyBase, _IdentityBase):
+    ''' Ed25519 signatures, X25519 sealed boxes for requests, X25519
+    for request MACs, and AES-256-GCM for containers.
+    '''
+    _ciphersuite = 2
+    _2PID = SecondParty2
+    _CIPHERTEXT_OVERHEAD = _GCM_TAG_LENGTH
+    
+    @classmethod
+    def _generate_second_party(cls, keys, address_algo):
+        pubkeys = {
+            name: keys[name].public_key() for name in cls._KEY_NAMES
+        }
+        del keys
+        return cls._2PID.from_keys(keys=pubkeys, address_algo=address_algo)
+        
+    @classmethod
+    def _generate_keys(cls):
+        return {
+            'signature': ed25519.Ed25519PrivateKey.generate(),
+            'encryption': x25519.X25519PrivateKey.generate(),
+            'exchange': x25519.X25519PrivateKey.generate()
+        }
+        
+    def _serialize(self):
+        serialized = {
+            name: self._keys[name].private_bytes(
+                encoding = serialization.Encoding.Raw,
+                format = serialization.PrivateFormat.Raw,
+                encryption_algorithm = serialization.NoEncryption()
+            )
+            for name in self._KEY_NAMES
+        }
+        serialized['ghid'] = bytes(self.ghid)
+        return serialized
+        
+    @classmethod
+    def _from_serialized(cls, condensed):
+        try:
+            ghid = Ghid.from_bytes(condensed['ghid'])
+            keys = {
+                'signature': ed25519.Ed25519PrivateKey.from_private_bytes(
+                    condensed['signature']
+                ),
+                'encryption': x25519.X25519PrivateKey.from_private_bytes(
+                    condensed['encryption']
+                ),
+                'exchange': x25519.X25519PrivateKey.from_private_bytes(
+                    condensed['exchange']
+                )
+            }
+        except (TypeError, KeyError) as e:
+            raise TypeError(
+                'serialization must be compatible with _serialize.'
+            ) from e
+            
+        return cls(keys=keys, ghid=ghid)
+        
+    @classmethod
+    def new_secret(cls):
+        ''' Returns a new secure Secret(). Never reuse one for more
+        than one container.
+        '''
+        key = os.urandom(32)
+        nonce = os.urandom(12)
+        return super().new_secret(key=key, seed=nonce)
+        
+    @classmethod
+    def _encrypt(cls, secret, data):
+        ''' Symmetric encryptor. Output includes the GCM tag.
+        '''
+        worker = cls._encryptor(secret)
+        return worker.update(data) + worker.finalize()
+        
+    @classmethod
+    def _decrypt(cls, secret, data):
+        ''' Symmetric decryptor. Raises SecurityError if the ciphertext
+        fails authentication.
+        '''
+        worker = cls._decryptor(secret)
+        return worker.update(data) + worker.finalize()
+        
+    @classmethod
+    def _encryptor(cls, secret):
+        ''' Incremental symmetric encryptor.
+        '''
+        instance = ciphers.Cipher(
+            ciphers.algorithms.AES(secret.key),
+            ciphers.modes.GCM(secret.seed),
+            backend = CRYPTO_BACKEND
+        )
+        return _GCMEncryptor(instance.encryptor())
+        
+    @classmethod
+    def _decryptor(cls, secret):
+        ''' Incremental symmetric decryptor.
+        '''
+        instance = ciphers.Cipher(
+            ciphers.algorithms.AES(secret.key),
+            ciphers.modes.GCM(secret.seed),
+            backend = CRYPTO_BACKEND
+        )
+        return _GCMDecryptor(instance.decryptor())
+        
+    def _sign(self, data):
+        ''' Signing method.
+        '''
+        return self._signature_key.sign(bytes(data))
+        
+    @classmethod
+    def _verify(cls, public, signature, data):
+        ''' Verifies an author's signature against bites. Errors out if
+        unsuccessful. Returns True if successful.
+        '''
+        cls._typecheck_2ndparty(public)
+        
+        try:
+            public._signature_key.verify(bytes(signature), bytes(data))
+        except InvalidSignature as exc:
+            raise SecurityError('Failed to verify signature.') from exc
+            
+        return True
+        
+    @staticmethod
+    def _sealed_box_key(shared, ephemeral, recipient):
+        ''' Derives the sealed box key, binding it to both public keys.
+        '''
+        instance = hkdf.HKDF(
+            algorithm = hashes.SHA512(),
+            length = 32,
+            salt = None,
+            info = ephemeral + recipient,
+            backend = CRYPTO_BACKEND
+        )
+        return instance.derive(shared)
+        
+    def _encrypt_asym(self, public, data):
+        ''' Sealed box asymmetric encryptor: an ephemeral X25519 public
+        key, followed by AES-GCM ciphertext of the length-prefixed data,
+        padded so that the whole thing is the ciphersuite's asym length.
+        '''
+        self._typecheck_2ndparty(public)
+        
+        capacity = (
+            cipher_length_lookup[self._ciphersuite]['asym'] -
+            _X25519_LENGTH - _GCM_TAG_LENGTH
+        )
+        if len(data) + 2 > capacity:
+            raise ValueError('Data too long for asymmetric encryption.')
+        boxed = bytearray(capacity)
+        boxed[0:2] = len(data).to_bytes(2, 'big')
+        boxed[2:2 + len(data)] = data
+        
+        ephemeral_key = x25519.X25519PrivateKey.generate()
+        ephemeral = ephemeral_key.public_key().public_bytes(
+            encoding = serialization.Encoding.Raw,
+            format = serialization.PublicFormat.Raw
+        )
+        recipient = public._encryption_key.public_bytes(
+            encoding = serialization.Encoding.Raw,
+            format = serialization.PublicFormat.Raw
+        )
+        key = self._sealed_box_key(
+            ephemeral_key.exchange(public._encryption_key),
+            ephemeral,
+            recipient
+        )
+        # The key is single-use, so a fixed nonce is safe.
+        ciphertext = AESGCM(key).encrypt(bytes(12), bytes(boxed), None)
+        return ephemeral + ciphertext
+        
+    def _decrypt_asym(self, data):
+        ''' Sealed box asymmetric decryptor.
+        '''
+        data = bytes(data)
+        ephemeral = data[:_X25519_LENGTH]
+        recipient = self._encryption_key.public_key().public_bytes(
+            encoding = serialization.Encoding.Raw,
+            format = serialization.PublicFormat.Raw
+        )
+        
+        try:
+            shared = self._encryption_key.exchange(
+                x25519.X25519PublicKey.from_public_bytes(ephemeral)
+            )
+            key = self._sealed_box_key(shared, ephemeral, recipient)
+            boxed = AESGCM(key).decrypt(
+                bytes(12),
+                data[_X25519_LENGTH:],
+                None
+            )
+        except (InvalidTag, ValueError) as exc:
+            raise SecurityError('Failed to decrypt request.') from exc
+            
+        length = int.from_bytes(boxed[0:2], 'big')
+        return boxed[2:2 + length]
+        
+    def _derive_shared(self, partner):
+        ''' Derive a shared secret with the partner.
+        '''
+        ecdh = self._exchange_key.exchange(partner._exchange_key)
+        
+        # Get both of our addresses and then the bitwise XOR of them both
+        my_hash = self.ghid.address
+        their_hash = partner.ghid.address
+        salt = (
+            int.from_bytes(my_hash, 'big') ^ int.from_bytes(their_hash, 'big')
+        ).to_bytes(len(my_hash), 'big')
+        
+        instance = hkdf.HKDF(
+            algorithm = hashes.SHA512(),
+            length = hashes.SHA512.digest_size,
+            salt = salt,
+            info = b'',
+            backend = CRYPTO_BACKEND
+        )
+        return instance.derive(ecdh)
+        
+    # HMAC-SHA512, same as suite 1
+    _mac = FirstParty1._mac
+    _verify_mac = FirstParty1._verify_mac
+        
+        
+class ThirdParty2(_ThirdPartyBase):
+    _ciphersuite = 2
+    _verify = FirstParty2._verify
+    
+    
+# ###############################################
+# Key pools
+# ###############################################
+
+
+def _generate_serialized_keys1():
+    ''' Generates serialized keys for FirstParty1. Module-level, so that
+    it can be sent to worker processes.
+    '''
+    return FirstParty1._serialize_keys(FirstParty1._new_keys())
+    
+    
+KeyPoolMetrics = collections.namedtuple(
+    'KeyPoolMetrics',
+    ['depth', 'ready', 'pending', 'hits', 'misses', 'failures',
+     'last_refill_latency', 'mean_refill_latency']
+)
+
+
+class KeyPool:
+    ''' Pre-generates identity keys in the background, keeping up to
+    depth key sets ready. Install it as FirstParty1.KEY_POOL, and new
+    identities will take keys from it whenever one is ready, falling
+    back to generating inline otherwise.
+    
+    By default, keys are generated in a ProcessPoolExecutor owned by the
+    pool (shut down by close()); generate must be picklable, and return
+    picklable (serialized) keys.
+    '''
+    
+    def __init__(self, depth=4, executor=None,
+                 generate=_generate_serialized_keys1):
+        if depth < 1:
+            raise ValueError('depth must be at least 1.')
+            
+        if executor is None:
+            executor = concurrent.futures.ProcessPoolExecutor()
+            self._owns_executor = True
+        else:
+            self._owns_executor = False
+            
+        self.depth = depth
+        self._executor = executor
+        self._generate = generate
+        self._lock = threading.Lock()
+        self._ready = collections.deque()
+        self._pending = set()
+        self._hits = 0
+        self._misses = 0
+        self._failures = 0
+        self._refills = 0
+        self._last_latency = None
+        self._total_latency = 0
+        self._closed = False
+        
+        self._refill()
+        
+    def _refill(self):
+        ''' Starts generating enough keys to bring the pool to depth.
+        '''
+        submitted = []
+        with self._lock:
+            if self._closed:
+                return
+            while len(self._ready) + len(self._pending) < self.depth:
+                future = self._executor.submit(self._generate)
+                future.submitted = time.monotonic()
+                self._pending.add(future)
+                submitted.append(future)
+        
+        # Outside the lock, because already-finished futures call back
+        # immediately.
+        for future in submitted:
+            future.add_done_callback(self._handle_done)
+                
+    def _handle_done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+            if future.cancelled():
+                return
+            elif future.exception() is not None:
+                self._failures += 1
+                return
+                
+            latency = time.monotonic() - future.submitted
+            self._refills += 1
+            self._last_latency = latency
+            self._total_latency += latency
+            self._ready.append(future.result())
+        
+    def take(self):
+        ''' Returns a ready set of (serialized) keys, or None if none
+        are ready. Either way, starts refilling the pool.
+        '''
+        with self._lock:
+            try:
+                keys = self._ready.popleft()
+            except IndexError:
+                keys = None
+                self._misses += 1
+            else:
+                self._hits += 1
+        
+        self._refill()
+        return keys
+        
+    def wait(self, timeout=None):
+        ''' Waits for all pending key generation to finish, eg to warm
+        up the pool at startup.
+        '''
+        with self._lock:
+            pending = list(self._pending)
+        concurrent.futures.wait(pending, timeout=timeout)
+        
+    def metrics(self):
+        ''' Returns KeyPoolMetrics. Refill latency is the time (in
+        seconds) from requesting a key set to it becoming ready.
+        '''
+        with self._lock:
+            if self._refills:
+                mean_latency = self._total_latency / self._refills
+            else:
+                mean_latency = None
+                
+            return KeyPoolMetrics(
+                depth = self.depth,
+                ready = len(self._ready),
+                pending = len(self._pending),
+                hits = self._hits,
+                misses = self._misses,
+                failures = self._failures,
+                last_refill_latency = self._last_latency,
+                mean_refill_latency = mean_latency
+            )
+        
+    def close(self):
+        ''' Stops refilling, discards any ready keys, and shuts down the
+        executor if the pool created it.
+        '''
+        with self._lock:
+            self._closed = True
+            pending = list(self._pending)
+            self._ready.clear()
+        for future in pending:
+            future.cancel()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
@@ -32,13 +32,22 @@ golix: A python library for Golix protocol object manipulation.
 '''
 
 # External dependencies
+from smartyparse import ParseError
 
 # Internal deps
 from .cipher import FirstParty1 as FirstParty
 from .cipher import SecondParty1 as SecondParty
 from .cipher import ThirdParty1 as ThirdParty
+from .cipher import FirstParty2
+from .cipher import SecondParty2
+from .cipher import ThirdParty2
 from .cipher import DEFAULT_CIPHER
 
+from ._getlow import GIDC
+from ._getlow import peek
+from ._getlow import iter_packed
+from .utils import _LRUCache
+
 
 # Control * imports. Therefore controls what is available to toplevel
 # package through __init__.py
@@ -53,13 +62,16 @@ __all__ = []
 # Note that these will need to change their mapping value if the "import as"
 # ever changes due to additional ciphersuites.
 FIRST_PARTY_LOOKUP = {
-    1: FirstParty
+    1: FirstParty,
+    2: FirstParty2
 }
 SECOND_PARTY_LOOKUP = {
-    1: SecondParty
+    1: SecondParty,
+    2: SecondParty2
 }
 THIRD_PARTY_LOOKUP = {
-    1: ThirdParty
+    1: ThirdParty,
+    2: ThirdParty2
 }
 
 
@@ -93,3 +105,78 @@ def thirdparty_factory(cipher='default', *args, **kwargs):
         raise ValueError('Improper cipher declaration.') from e
         
     return cls(*args, **kwargs)
+    
+    
+class SecondPartyRegistry:
+    ''' Ghid-keyed cache of SecondParties, holding at most maxsize of
+    them and evicting the least-recently-used. Loading an identity that's
+    already registered skips unpacking (and hashing) it entirely, and
+    keys are only built when first used.
+    
+    Lookup maps ciphersuites to SecondParty classes, defaulting to
+    SECOND_PARTY_LOOKUP.
+    '''
+    
+    def __init__(self, maxsize=4096, lookup=None):
+        if lookup is None:
+            lookup = SECOND_PARTY_LOOKUP
+        self._lookup = lookup
+        self._cache = _LRUCache(maxsize)
+        
+    def __len__(self):
+        return len(self._cache)
+        
+    def __contains__(self, ghid):
+        return ghid in self._cache
+        
+    def get(self, ghid):
+        ''' Returns the registered SecondParty for ghid, or None.
+        '''
+        return self._cache.get(ghid)
+        
+    def register(self, second_party):
+        ''' Adds an existing SecondParty to the registry.
+        '''
+        self._cache.put(second_party.ghid, second_party)
+        
+    def discard(self, ghid):
+        self._cache.discard(ghid)
+        
+    def load(self, packed):
+        ''' Returns the SecondParty for the packed GIDC, registering it
+        if it isn't already.
+        '''
+        peeked = peek(packed)
+        if peeked.magic != GIDC.PARSER['magic'].parser.value:
+            raise ParseError('Packed data is not a GIDC.')
+            
+        second_party = self._cache.get(peeked.ghid)
+        if second_party is None:
+            # The cache outlives packed, which may be a reused buffer.
+            packed = bytes(packed)
+            gidc = GIDC.unpack(packed)
+            try:
+                cls = self._lookup[gidc.cipher]
+            except KeyError as e:
+                raise ValueError('Improper cipher declaration.') from e
+            second_party = cls.from_identity(gidc)
+            second_party.packed = packed
+            self.register(second_party)
+            
+        return second_party
+        
+    def preload(self, source):
+        ''' Loads every GIDC from source, which may be packed GIDCs
+        back-to-back in a bytes-like or file-like object, or an iterable
+        of them. Returns the number loaded.
+        '''
+        count = 0
+        for packed in iter_packed(source):
+            self.load(packed)
+            count += 1
+        return count
+        
+    def cache_info(self):
+        ''' Returns a utils.CacheInfo with hit and miss counts.
+        '''
+        return self._cache.cache_info()
@@ -37,6 +37,7 @@ import abc
 import base64
 # This is just used for ghids.
 import random
+import threading
 
 from collections import namedtuple
 
@@ -57,12 +58,27 @@ from .exceptions import SecurityError
 
 
 class _AddressAlgoBase(metaclass=abc.ABCMeta):
+    @classmethod
+    def hasher(cls):
+        ''' Returns a fresh hash context for incrementally creating an
+        address: call update() with each segment, then finalize().
+        '''
+        return hashes.Hash(cls._HASH_ALGO(), backend=default_backend())
+        
     @classmethod
     def create(cls, data):
         ''' Creates an address (note: not the whole ghid) from data.
         '''
-        h = hashes.Hash(cls._HASH_ALGO(), backend=default_backend())
-        h.update(data)
+        return cls.create_from((data,))
+        
+    @classmethod
+    def create_from(cls, segments):
+        ''' Creates an address from an iterable of bytes-like segments
+        (eg memoryviews into a packed object), without joining them.
+        '''
+        h = cls.hasher()
+        for segment in segments:
+            h.update(segment)
         digest = h.finalize()
         # So this isn't really making much of a difference, necessarily, but
         # it's good insurance against (accidental or malicious) length
@@ -74,8 +90,23 @@ class _AddressAlgoBase(metaclass=abc.ABCMeta):
     def verify(cls, address, data):
         ''' Verifies an address (note: not the whole ghid) from data.
         '''
-        test = cls.create(data)
-        if test != address:
+        return cls.verify_from(address, (data,))
+        
+    @classmethod
+    def verify_from(cls, address, segments):
+        ''' Verifies an address from an iterable of bytes-like segments.
+        '''
+        h = cls.hasher()
+        for segment in segments:
+            h.update(segment)
+        return cls.verify_hasher(address, h)
+        
+    @classmethod
+    def verify_hasher(cls, address, hasher):
+        ''' Finalizes a hash context from hasher() that has been fed
+        the object, and verifies the address against it.
+        '''
+        if hasher.finalize() != address:
             raise SecurityError('Failed to verify address integrity.')
         else:
             return True
@@ -90,13 +121,43 @@ class AddressAlgo0(_AddressAlgoBase):
     _HASH_ALGO = None
     ADDRESS_LENGTH = 64
     
+    @classmethod
+    def hasher(cls):
+        return _DummyHasher()
+    
     @classmethod
     def create(cls, data):
         return _dummy_address
         
+    @classmethod
+    def create_from(cls, segments):
+        return _dummy_address
+        
     @classmethod
     def verify(cls, address, data):
         return True
+        
+    @classmethod
+    def verify_from(cls, address, segments):
+        return True
+        
+    @classmethod
+    def verify_hasher(cls, address, hasher):
+        return True
+    
+    
+class _DummyHasher:
+    ''' Hash context for AddressAlgo0. Ignores everything.
+    '''
+    
+    def update(self, data):
+        pass
+        
+    def copy(self):
+        return self
+        
+    def finalize(self):
+        return _dummy_address
     
     
 class AddressAlgo1(_AddressAlgoBase):
@@ -104,13 +165,28 @@ class AddressAlgo1(_AddressAlgoBase):
     '''
     _HASH_ALGO = hashes.SHA512
     ADDRESS_LENGTH = _HASH_ALGO.digest_size
+    
+    
+class AddressAlgo2(_AddressAlgoBase):
+    ''' BLAKE2b-512
+    '''
+    ADDRESS_LENGTH = 64
+    
+    @classmethod
+    def hasher(cls):
+        # BLAKE2b needs its digest size up front, so no bare _HASH_ALGO
+        return hashes.Hash(
+            hashes.BLAKE2b(cls.ADDRESS_LENGTH),
+            backend = default_backend()
+        )
 
 
 # Zero should be rendered inop, IE ignore all input data and generate
 # symbolic representations
 ADDRESS_ALGOS = {
     0: AddressAlgo0,
-    1: AddressAlgo1
+    1: AddressAlgo1,
+    2: AddressAlgo2
 }
 
 
@@ -142,13 +218,25 @@ _dummy_pubkey_exchange = \
     b'[ ' + (b'-') * 6 + b' MOCK PUBLIC KEY ' + (b'-') * 5 + b' ]'
 
 
+# ----------------------------------------------------------------------
+# Smartyparse locking block
+
+
+# Parsers are shared module-level state, and smartyparse mutates them while
+# packing and unpacking (dispatch callbacks, linked lengths, and nested
+# parsers shared between formats), so only one thread may use them at a time.
+# Reentrant, in case a callback ever needs to parse something itself.
+_sp_lock = threading.RLock()
+
+
 # ----------------------------------------------------------------------
 # Hash algo identifier / length block
 
 
 _hash_algo_lookup = {
     0: ParseHelper(parsers.Blob(length=len(_dummy_address))),
-    1: ParseHelper(parsers.Blob(length=64))
+    1: ParseHelper(parsers.Blob(length=64)),
+    2: ParseHelper(parsers.Blob(length=64))
 }
 
 
@@ -194,21 +282,30 @@ cipher_length_lookup = {
         'sig': 512,
         'mac': 64,
         'asym': 512,
-        'seed': 0
+        'seed': 0,
+        'pubkey_sig': 512,
+        'pubkey_encrypt': 512,
+        'pubkey_exchange': 32
     },
     1: {
         'key': 32,
         'sig': 512,
         'mac': 64,
         'asym': 512,
-        'seed': 16
+        'seed': 16,
+        'pubkey_sig': 512,
+        'pubkey_encrypt': 512,
+        'pubkey_exchange': 32
     },
     2: {
-        'key': 64,
-        'sig': 512,
+        'key': 32,
+        'sig': 64,
         'mac': 64,
         'asym': 512,
-        'seed': 0
+        'seed': 12,
+        'pubkey_sig': 32,
+        'pubkey_encrypt': 32,
+        'pubkey_exchange': 32
     }
 }
 
@@ -336,12 +433,14 @@ class Secret:
         return self._seed
     
     def __bytes__(self):
-        return bytes(self._parser.pack(self._control))
+        with _sp_lock:
+            return bytes(self._parser.pack(self._control))
         
     @classmethod
     def from_bytes(cls, data):
         # Okay, this is hard-coding in version 2 as the unpacker. Oh well.
-        obj = _secret_parser.unpack(data)
+        with _sp_lock:
+            obj = _secret_parser.unpack(data)
         return cls(
             cipher = obj['cipher'],
             key = bytes(obj['key']),
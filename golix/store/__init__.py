@@ -0,0 +1,51 @@
+'''
+Local persistence for packed Golix objects: an append-only segment log,
+a persistent ghid-keyed index into it, and binding-aware bookkeeping
+(the binding graph and garbage collection) on top.
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+from ._segments import SegmentLog
+from ._index import GhidIndex
+from ._index import Location
+from ._store import ObjectStore
+from ._graph import BindingGraph
+from ._gc import GarbageCollector
+
+
+# Control * imports
+__all__ = [
+    'SegmentLog',
+    'GhidIndex',
+    'Location',
+    'ObjectStore',
+    'BindingGraph',
+    'GarbageCollector'
+]
@@ -0,0 +1,254 @@
+'''
+Incremental garbage collection: reference counting over the binding
+graph, driven by ingest events and processed in bounded slices.
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+        
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+    
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+    
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+import collections
+import itertools
+import threading
+
+# Interpackage dependencies
+from .._getlow import GEOC
+from .._getlow import peek
+
+from ._graph import BindingGraph
+from ._graph import _edge
+from ._graph import _unpack_unverified
+from ._graph import _read_edges
+from ._graph import _EDGE_MAGICS
+from ._graph import _DEBIND
+from ._store import _NO_LIMITS
+
+
+# Control * imports
+__all__ = [
+    'GarbageCollector'
+]
+
+
+# ###############################################
+# Garbage collection
+# ###############################################
+
+
+# Event kind for containers; bindings and debindings use their _Edge.
+_CONTAINER = 'container'
+
+DEFAULT_BUDGET = 1024
+
+
+class GarbageCollector:
+    ''' Tracks which stored objects may be dropped:
+    
+    + containers (GEOC) once nothing binds them,
+    + static bindings (GOBS) once debound,
+    + dynamic binding frames (GOBD) once superseded by a newer frame
+      from the binding's owner, or once the dynamic binding is debound.
+      
+    Identities and debindings are never collected, and neither are the
+    initial frames of dynamic bindings (which prove who owns them) until
+    they're debound. Frames that don't belong to their binding's owner,
+    like those squatting on someone else's binding, are left alone.
+    
+    Objects are ingested into a queue, and step() processes at most
+    budget of them, each in constant time, so collection never needs to
+    stop the world. Ingest containers with (or before) their bindings,
+    and collect() only after processing both: until something binds it,
+    a container is collectable.
+    '''
+    
+    def __init__(self, graph=None):
+        if graph is None:
+            graph = BindingGraph()
+        self.graph = graph
+        self._lock = threading.RLock()
+        self._events = collections.deque()
+        # Target -> number of live bindings pointing at it
+        self._refcounts = {}
+        # Containers we've seen, which die when unreferenced
+        self._containers = set()
+        # Bindings that currently hold a reference to their target
+        self._live = set()
+        self._collectable = set()
+        
+    @classmethod
+    def from_store(cls, store, executor=None, chunk_size=4096):
+        ''' Queues everything in an ObjectStore. Bindings are read as in
+        BindingGraph.from_store; call step() (or run()) to process them.
+        '''
+        self = cls()
+        bindings = []
+        for ghid, location in store.items():
+            if location.magic == b'GEOC':
+                self._events.append((_CONTAINER, ghid))
+            elif location.magic in _EDGE_MAGICS:
+                bindings.append(location)
+                
+        chunks = [
+            bindings[ii:ii + chunk_size]
+            for ii in range(0, len(bindings), chunk_size)
+        ]
+        if executor is None:
+            results = (_read_edges(store.directory, chunk) for chunk in chunks)
+        else:
+            results = executor.map(
+                _read_edges,
+                itertools.repeat(store.directory),
+                chunks
+            )
+        for edges in results:
+            self._events.extend(edges)
+        return self
+        
+    def ingest(self, obj):
+        ''' Queues an unpacked (and verified) object. Anything other than
+        containers, bindings, and debindings is ignored.
+        '''
+        if isinstance(obj, GEOC):
+            self._events.append((_CONTAINER, obj.ghid))
+        else:
+            edge = _edge(obj)
+            if edge is not None:
+                self._events.append(edge)
+                
+    def ingest_packed(self, packed):
+        ''' Queues an already-verified packed object, without re-hashing
+        it.
+        '''
+        magic = bytes(packed[0:4])
+        if magic == b'GEOC':
+            self._events.append((_CONTAINER, peek(packed, _NO_LIMITS).ghid))
+        elif magic in _EDGE_MAGICS:
+            self._events.append(_edge(_unpack_unverified(packed)))
+            
+    @property
+    def pending(self):
+        ''' The number of queued events.
+        '''
+        return len(self._events)
+        
+    def step(self, budget=DEFAULT_BUDGET):
+        ''' Processes up to budget queued events. Returns the number
+        processed.
+        '''
+        processed = 0
+        with self._lock:
+            while processed < budget and self._events:
+                event = self._events.popleft()
+                if event[0] == _CONTAINER:
+                    self._add_container(event[1])
+                elif event.kind == _DEBIND:
+                    self._add_debinding(event)
+                else:
+                    self._add_binding(event)
+                processed += 1
+        return processed
+        
+    def run(self):
+        ''' Processes every queued event.
+        '''
+        while self.step():
+            pass
+            
+    def collect(self):
+        ''' Returns the set of ghids that may now be dropped, and stops
+        tracking them.
+        '''
+        with self._lock:
+            collectable = self._collectable
+            self._collectable = set()
+            self._containers.difference_update(collectable)
+        return collectable
+        
+    @property
+    def collectable(self):
+        ''' The ghids that collect() would currently return.
+        '''
+        return frozenset(self._collectable)
+        
+    def _add_container(self, ghid):
+        if ghid in self._containers:
+            return
+        self._containers.add(ghid)
+        if ghid not in self._refcounts:
+            self._collectable.add(ghid)
+            
+    def _add_binding(self, edge):
+        update = self.graph._add_edge(edge)
+        self._collectable.update(update.superseded)
+        before, after = update.before, update.after
+        if after is None or after is before:
+            # Duplicate, stale, or not (yet) the owner's
+            return
+            
+        if before is not None:
+            # Newer frame; move the reference to the new target.
+            if edge.ghid in self._live:
+                self._decref(before.target)
+                self._incref(after.target)
+            else:
+                self._collectable.add(after.frame)
+        elif self.graph.is_debound(edge.ghid):
+            self._collectable.update(self._frames(edge.ghid))
+        else:
+            self._live.add(edge.ghid)
+            self._incref(after.target)
+            
+    def _add_debinding(self, edge):
+        self.graph._add_edge(edge)
+        binding = edge.target
+        if binding in self._live and self.graph.is_debound(binding):
+            self._live.remove(binding)
+            self._decref(self.graph.target_of(binding))
+            self._collectable.update(self._frames(binding))
+            
+    def _frames(self, binding):
+        ''' The objects making up a binding: the binding itself if static,
+        or its current and initial frames if dynamic.
+        '''
+        frame = self.graph.frame_of(binding)
+        if frame is None:
+            return {binding}
+        return {frame, self.graph.initial_frame_of(binding)}
+        
+    def _incref(self, target):
+        self._refcounts[target] = self._refcounts.get(target, 0) + 1
+        self._collectable.discard(target)
+        
+    def _decref(self, target):
+        count = self._refcounts[target] - 1
+        if count:
+            self._refcounts[target] = count
+        else:
+            del self._refcounts[target]
+            if target in self._containers:
+                self._collectable.add(target)
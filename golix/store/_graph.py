@@ -0,0 +1,390 @@
+'''
+Binding graph: which bindings refer to which objects, and which
+debindings cancel which bindings, maintained incrementally as objects
+arrive.
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+        
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+    
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+    
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+import collections
+import itertools
+import threading
+
+# Interpackage dependencies
+from .._getlow import GOBS
+from .._getlow import GOBD
+from .._getlow import GDXX
+from .._getlow import dispatch_format
+
+from ._segments import SegmentLog
+
+
+# Control * imports
+__all__ = [
+    'BindingGraph'
+]
+
+
+# ###############################################
+# Edges
+# ###############################################
+
+
+_STATIC = 'static'
+_DYNAMIC = 'dynamic'
+_DEBIND = 'debind'
+
+# The graph-relevant part of a binding or debinding. Ghid is the ghid that
+# other objects use to refer to it, so for dynamic bindings it's
+# ghid_dynamic, and frame is the ghid of the frame itself. Owner is the
+# binder or debinder. Initial is whether a dynamic frame is the first of
+# its binding (no history), which is the only kind whose ghid_dynamic is
+# verified when unpacking.
+_Edge = collections.namedtuple(
+    '_Edge',
+    ['kind', 'ghid', 'owner', 'target', 'counter', 'frame', 'initial']
+)
+
+# What adding a binding changed. Before and after are the binding's edges
+# (for dynamic bindings, its current frame) before and after; superseded
+# are the ghids of (non-initial) frames newly superseded by a newer frame
+# from the binding's owner.
+_Update = collections.namedtuple(
+    '_Update',
+    ['before', 'after', 'superseded']
+)
+
+# Only these formats affect the graph.
+_EDGE_MAGICS = {b'GOBS', b'GOBD', b'GDXX'}
+
+
+def _edge(obj):
+    ''' Extracts the _Edge from an unpacked object, or returns None if
+    it isn't a binding or debinding.
+    '''
+    if isinstance(obj, GOBS):
+        return _Edge(
+            _STATIC,
+            obj.ghid,
+            obj.binder,
+            obj.target,
+            None,
+            None,
+            None
+        )
+    elif isinstance(obj, GOBD):
+        return _Edge(
+            _DYNAMIC,
+            obj.ghid_dynamic,
+            obj.binder,
+            obj.target,
+            obj.counter,
+            obj.ghid,
+            len(obj.target_vector) == 1
+        )
+    elif isinstance(obj, GDXX):
+        return _Edge(
+            _DEBIND,
+            obj.ghid,
+            obj.debinder,
+            obj.target,
+            None,
+            None,
+            None
+        )
+    else:
+        return None
+
+
+def _unpack_unverified(packed):
+    ''' Unpacks without checking the address, for objects that were
+    verified when they were stored.
+    '''
+    cls = dispatch_format(packed)
+    return cls(_control=cls._unpack_control(packed))
+
+
+def _read_edges(directory, locations):
+    ''' Reads the _Edges of the objects at locations in the store at
+    directory. Module-level and self-contained, so that it can run in a
+    process pool.
+    '''
+    log = SegmentLog(directory, readonly=True)
+    try:
+        return [
+            _edge(_unpack_unverified(
+                log.read(location.segment, location.offset, location.length)
+            ))
+            for location in locations
+        ]
+    finally:
+        log.close()
+
+
+# ###############################################
+# Graph
+# ###############################################
+
+
+class BindingGraph:
+    ''' Incrementally-maintained index of bindings (GOBS and GOBD) by
+    target, and of debindings (GDXX) by the binding they cancel. Adding
+    an object is constant-time, and objects may be added in any order:
+    stale dynamic frames are ignored, and debindings that arrive before
+    their binding take effect once it does.
+    
+    A dynamic binding belongs to the binder of its initial frame, since
+    that's the only frame whose ghid_dynamic is hash-verified; anyone can
+    sign a later frame claiming any ghid_dynamic. So a dynamic binding
+    only takes effect once its initial frame arrives, and then follows
+    the latest frame from that binder, ignoring everyone else's.
+    
+    A debinding only cancels a binding when its debinder is the binder.
+    Nothing here verifies signatures; only add objects that have been
+    verified (or came from somewhere that did so).
+    '''
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        # Binding ghid -> _Edge. For dynamic bindings, the latest frame
+        # from the owner.
+        self._bindings = {}
+        # Ghid_dynamic -> _Edge of its initial frame
+        self._initial = {}
+        # (ghid_dynamic, binder) -> _Edge of that binder's latest frame
+        self._latest = {}
+        # (ghid_dynamic, binder) -> superseded frame ghids not yet reported,
+        # because binder doesn't (yet) own ghid_dynamic
+        self._stale = {}
+        # Target -> set of binding ghids
+        self._targets = {}
+        # Debinding ghid -> _Edge
+        self._debindings = {}
+        # Binding ghid -> {debinding ghid: debinder}
+        self._cancellations = {}
+        
+    @classmethod
+    def from_store(cls, store, executor=None, chunk_size=4096):
+        ''' Builds a graph from everything in an ObjectStore. If executor
+        is passed (including a ProcessPoolExecutor), objects are read and
+        unpacked there, in chunks of chunk_size.
+        '''
+        locations = [
+            location for ghid, location in store.items()
+            if location.magic in _EDGE_MAGICS
+        ]
+        chunks = [
+            locations[ii:ii + chunk_size]
+            for ii in range(0, len(locations), chunk_size)
+        ]
+        
+        if executor is None:
+            results = (_read_edges(store.directory, chunk) for chunk in chunks)
+        else:
+            results = executor.map(
+                _read_edges,
+                itertools.repeat(store.directory),
+                chunks
+            )
+            
+        self = cls()
+        for edges in results:
+            for edge in edges:
+                self._add_edge(edge)
+        return self
+        
+    def add(self, obj):
+        ''' Adds an unpacked object to the graph. Returns False if it
+        isn't a binding or debinding (and therefore was ignored).
+        '''
+        edge = _edge(obj)
+        if edge is None:
+            return False
+        self._add_edge(edge)
+        return True
+        
+    def add_packed(self, packed):
+        ''' Adds an already-verified packed object, without re-hashing it.
+        '''
+        if bytes(packed[0:4]) not in _EDGE_MAGICS:
+            return False
+        self._add_edge(_edge(_unpack_unverified(packed)))
+        return True
+        
+    def _add_edge(self, edge):
+        ''' Adds edge. For bindings, returns an _Update; for debindings,
+        None.
+        '''
+        with self._lock:
+            if edge.kind == _DEBIND:
+                if edge.ghid not in self._debindings:
+                    self._debindings[edge.ghid] = edge
+                    cancellations = self._cancellations.setdefault(
+                        edge.target,
+                        {}
+                    )
+                    cancellations[edge.ghid] = edge.owner
+                return None
+                
+            elif edge.kind == _DYNAMIC:
+                return self._add_frame(edge)
+                
+            existing = self._bindings.get(edge.ghid)
+            if existing is None:
+                self._link(edge)
+            return _Update(existing, self._bindings[edge.ghid], ())
+            
+    def _add_frame(self, edge):
+        before = self._bindings.get(edge.ghid)
+        if edge.initial:
+            self._initial.setdefault(edge.ghid, edge)
+            
+        key = (edge.ghid, edge.owner)
+        latest = self._latest.get(key)
+        if latest is None or edge.counter > latest.counter:
+            self._latest[key] = edge
+            stale = latest
+        elif edge.frame != latest.frame:
+            stale = edge
+        else:
+            stale = None
+        # The initial frame proves ownership, so it's never superseded.
+        if stale is not None and not stale.initial:
+            self._stale.setdefault(key, []).append(stale.frame)
+            
+        initial = self._initial.get(edge.ghid)
+        if initial is None or initial.owner != edge.owner:
+            return _Update(before, before, ())
+            
+        after = self._latest[key]
+        if before is not after:
+            if before is not None:
+                self._unlink(before)
+            self._link(after)
+        return _Update(before, after, tuple(self._stale.pop(key, ())))
+        
+    def _link(self, edge):
+        self._bindings[edge.ghid] = edge
+        self._targets.setdefault(edge.target, set()).add(edge.ghid)
+        
+    def _unlink(self, edge):
+        bindings = self._targets[edge.target]
+        bindings.discard(edge.ghid)
+        if not bindings:
+            del self._targets[edge.target]
+            
+    def owner(self, ghid):
+        ''' Returns the binder of a binding, or the debinder of a
+        debinding, or None if it's unknown.
+        '''
+        edge = self._bindings.get(ghid) or self._debindings.get(ghid)
+        if edge is None:
+            return None
+        return edge.owner
+        
+    def target_of(self, ghid):
+        ''' Returns what a binding (for dynamic bindings, its latest
+        frame) or debinding currently points to, or None if unknown.
+        '''
+        edge = self._bindings.get(ghid) or self._debindings.get(ghid)
+        if edge is None:
+            return None
+        return edge.target
+        
+    def frame_of(self, ghid_dynamic):
+        ''' Returns the ghid of the latest known frame of a dynamic
+        binding, or None if unknown.
+        '''
+        edge = self._bindings.get(ghid_dynamic)
+        if edge is None:
+            return None
+        return edge.frame
+        
+    def initial_frame_of(self, ghid_dynamic):
+        ''' Returns the ghid of the initial frame of a dynamic binding,
+        or None if it hasn't been added.
+        '''
+        edge = self._initial.get(ghid_dynamic)
+        if edge is None:
+            return None
+        return edge.frame
+        
+    def debindings_of(self, ghid):
+        ''' Returns the set of debindings that cancel ghid.
+        '''
+        owner = self.owner(ghid)
+        if owner is None:
+            return set()
+        return {
+            debinding
+            for debinding, debinder
+            in self._cancellations.get(ghid, {}).items()
+            if debinder == owner
+        }
+        
+    def is_debound(self, ghid):
+        ''' Is ghid (a binding or debinding) cancelled by a debinding
+        from its owner?
+        '''
+        owner = self.owner(ghid)
+        return (
+            owner is not None and
+            owner in self._cancellations.get(ghid, {}).values()
+        )
+        
+    def bindings_of(self, target):
+        ''' Returns the set of bindings (static ghids, or dynamic ghids
+        whose latest frame points at target) that currently bind target,
+        excluding debound ones.
+        '''
+        with self._lock:
+            bindings = set(self._targets.get(target, ()))
+        return {
+            binding for binding in bindings if not self.is_debound(binding)
+        }
+        
+    def binders_of(self, target):
+        ''' Returns the set of identities that currently bind target.
+        '''
+        return {
+            self._bindings[binding].owner
+            for binding in self.bindings_of(target)
+        }
+        
+    def is_bound(self, target):
+        return bool(self.bindings_of(target))
+        
+    def __len__(self):
+        ''' The number of bindings.
+        '''
+        return len(self._bindings)
+        
+    def __contains__(self, ghid):
+        return ghid in self._bindings or ghid in self._debindings
@@ -0,0 +1,371 @@
+'''
+Persistent ghid index: open addressing (linear probing) over a flat,
+mmapped array of fixed-width records.
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+        
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+    
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+    
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+import os
+import mmap
+import struct
+import threading
+import collections
+
+# Interpackage dependencies
+from ..utils import Ghid
+
+
+# Control * imports
+__all__ = [
+    'Location',
+    'GhidIndex'
+]
+
+
+# Where a packed object lives in the segment log
+Location = collections.namedtuple(
+    'Location',
+    ['segment', 'offset', 'length', 'magic']
+)
+
+
+# ###############################################
+# Index file format
+# ###############################################
+
+
+# magic, version, header size, capacity, count, log high-water mark
+# (segment, offset)
+_header = struct.Struct('>4sIIQQIQ')
+_INDEX_MAGIC = b'GXIX'
+_INDEX_VERSION = 1
+# Fixed, so that index files are portable between platforms. It's still
+# recorded in the header, and readers use the recorded one.
+_HEADER_SIZE = 4096
+
+# state, ghid (algo + 64-byte address), segment, offset, length, type.
+# Everything but state is written first; setting state then publishes the
+# record to readers.
+_record = struct.Struct('>B65sIQQB')
+_EMPTY = 0
+_FULL = 1
+_GHID_SIZE = 65
+_GHID_SLICE = slice(1, 1 + _GHID_SIZE)
+
+# Object types, as stored in the record's type byte
+_TYPE_CODES = {
+    b'GIDC': 1,
+    b'GEOC': 2,
+    b'GOBS': 3,
+    b'GOBD': 4,
+    b'GDXX': 5,
+    b'GARQ': 6,
+}
+_TYPE_MAGICS = {code: magic for magic, code in _TYPE_CODES.items()}
+
+# Grow when this full
+_MAX_LOAD = 0.7
+DEFAULT_CAPACITY = 1 << 16
+
+
+def _slot_hash(key):
+    ''' Addresses are already uniformly distributed, so use the leading
+    bytes directly.
+    '''
+    return int.from_bytes(key[1:9], 'little') ^ key[0]
+
+
+def _index_size(capacity, header_size=_HEADER_SIZE):
+    return header_size + capacity * _record.size
+
+
+# An open index file. Growing the index replaces it wholesale, so that
+# lookups can grab it once and use it throughout, without locking.
+_Mapping = collections.namedtuple(
+    '_Mapping',
+    ['map', 'capacity', 'header_size']
+)
+
+
+def _find(mapping, key):
+    ''' Returns the byte position of key's record in mapping, or of the
+    empty slot where it belongs.
+    '''
+    data = mapping.map
+    mask = mapping.capacity - 1
+    slot = _slot_hash(key) & mask
+    while True:
+        position = mapping.header_size + slot * _record.size
+        if data[position] == _EMPTY:
+            return position
+        if data[position + 1:position + 1 + _GHID_SIZE] == key:
+            return position
+        slot = (slot + 1) & mask
+
+
+# ###############################################
+# Index
+# ###############################################
+
+
+class GhidIndex:
+    ''' Maps ghids to Locations, using a file at path that's mmapped
+    instead of loaded, so opening it is constant-time. Ghids are stored
+    as their 65 packed bytes, not as Ghid objects, at 87 bytes a record.
+    
+    There may be one writer, and any number of readonly instances (eg in
+    other processes). Records become visible to readers once they're
+    fully written; when the writer grows the index, it replaces the file,
+    and readers pick up the new one when they refresh(). Lookups never
+    block, even while the index grows: they finish on the mapping they
+    started with, which stays open until they're done with it.
+    
+    Capacity is rounded up to a power of two. Entries cannot be removed.
+    '''
+    
+    def __init__(self, path, capacity=DEFAULT_CAPACITY, readonly=False):
+        self.path = path
+        self.readonly = readonly
+        self._lock = threading.RLock()
+        
+        if not readonly and not os.path.exists(path):
+            self._create(path, max(1 << (capacity - 1).bit_length(), 8))
+            
+        self._open()
+        
+    @staticmethod
+    def _create(path, capacity):
+        with open(path, 'wb') as f:
+            f.write(_header.pack(
+                _INDEX_MAGIC,
+                _INDEX_VERSION,
+                _HEADER_SIZE,
+                capacity,
+                0,
+                0,
+                0
+            ))
+            f.truncate(_index_size(capacity))
+            
+    def _open(self):
+        if self.readonly:
+            mode, access = 'rb', mmap.ACCESS_READ
+        else:
+            mode, access = 'r+b', mmap.ACCESS_WRITE
+            
+        with open(self.path, mode) as f:
+            inode = os.fstat(f.fileno()).st_ino
+            data = mmap.mmap(f.fileno(), 0, access=access)
+            
+        if len(data) < _header.size:
+            raise ValueError('Not a ghid index: ' + self.path)
+        magic, version, header_size, capacity, count, segment, offset = \
+            _header.unpack_from(data)
+        if magic != _INDEX_MAGIC or version != _INDEX_VERSION:
+            raise ValueError('Not a ghid index: ' + self.path)
+        if len(data) < _index_size(capacity, header_size):
+            raise ValueError('Ghid index is truncated: ' + self.path)
+            
+        self._inode = inode
+        # Replaced as a whole, so lookups see a consistent snapshot.
+        # The old mmap closes once nothing is using it anymore.
+        self._mapping = _Mapping(data, capacity, header_size)
+        
+    def refresh(self):
+        ''' Picks up a replacement index file from the writer. Returns
+        True if there was one.
+        '''
+        with self._lock:
+            if os.stat(self.path).st_ino == self._inode:
+                return False
+            self._open()
+            return True
+            
+    @property
+    def capacity(self):
+        return self._mapping.capacity
+        
+    def __len__(self):
+        return _header.unpack_from(self._mapping.map)[4]
+        
+    @property
+    def high_water(self):
+        ''' The (segment, offset) in the log up to which everything has
+        been indexed, as recorded with set_high_water.
+        '''
+        return _header.unpack_from(self._mapping.map)[5:]
+        
+    def set_high_water(self, segment, offset):
+        with self._lock:
+            self._write_header(len(self), segment, offset)
+            
+    def _write_header(self, count, segment, offset):
+        mapping = self._mapping
+        _header.pack_into(
+            mapping.map,
+            0,
+            _INDEX_MAGIC,
+            _INDEX_VERSION,
+            mapping.header_size,
+            mapping.capacity,
+            count,
+            segment,
+            offset
+        )
+        
+    def get(self, ghid, default=None):
+        key = bytes(ghid)
+        mapping = self._mapping
+        position = _find(mapping, key)
+        if mapping.map[position] == _EMPTY:
+            return default
+            
+        state, key, segment, offset, length, code = \
+            _record.unpack_from(mapping.map, position)
+        return Location(segment, offset, length, _TYPE_MAGICS.get(code))
+        
+    def __getitem__(self, ghid):
+        location = self.get(ghid)
+        if location is None:
+            raise KeyError(ghid)
+        return location
+        
+    def __contains__(self, ghid):
+        mapping = self._mapping
+        return mapping.map[_find(mapping, bytes(ghid))] != _EMPTY
+        
+    def __setitem__(self, ghid, location):
+        if self.readonly:
+            raise TypeError('Index is readonly.')
+            
+        key = bytes(ghid)
+        with self._lock:
+            position = _find(self._mapping, key)
+            added = self._mapping.map[position] == _EMPTY
+            if added and len(self) + 1 > self.capacity * _MAX_LOAD:
+                self._grow()
+                position = _find(self._mapping, key)
+                
+            record = _record.pack(
+                _FULL,
+                key,
+                location.segment,
+                location.offset,
+                location.length,
+                _TYPE_CODES.get(location.magic, 0)
+            )
+            data = self._mapping.map
+            data[position + 1:position + _record.size] = record[1:]
+            data[position] = _FULL
+            if added:
+                count, segment, offset = _header.unpack_from(data)[4:]
+                self._write_header(count + 1, segment, offset)
+                
+    def _grow(self):
+        ''' Doubles capacity by rehashing into a new file, which then
+        atomically replaces the old one.
+        '''
+        temp_path = self.path + '.tmp'
+        old = self._mapping
+        capacity = old.capacity * 2
+        self._create(temp_path, capacity)
+        
+        with open(temp_path, 'r+b') as f:
+            new = mmap.mmap(f.fileno(), 0)
+        mask = capacity - 1
+        for slot in range(old.capacity):
+            position = old.header_size + slot * _record.size
+            if old.map[position] == _EMPTY:
+                continue
+                
+            record = old.map[position:position + _record.size]
+            new_slot = _slot_hash(record[_GHID_SLICE]) & mask
+            while True:
+                new_position = _HEADER_SIZE + new_slot * _record.size
+                if new[new_position] == _EMPTY:
+                    break
+                new_slot = (new_slot + 1) & mask
+            new[new_position:new_position + _record.size] = record
+            
+        _header.pack_into(
+            new,
+            0,
+            _INDEX_MAGIC,
+            _INDEX_VERSION,
+            _HEADER_SIZE,
+            capacity,
+            *_header.unpack_from(old.map)[4:]
+        )
+        new.flush()
+        new.close()
+        
+        os.replace(temp_path, self.path)
+        # Don't close the old map; concurrent lookups may still be using it.
+        self._open()
+        
+    def __iter__(self):
+        ''' Yields every ghid in the index, in no particular order.
+        '''
+        for ghid, location in self.items():
+            yield ghid
+            
+    def items(self):
+        ''' Yields every (ghid, Location) in the index, in no particular
+        order, as of when iteration started.
+        '''
+        mapping = self._mapping
+        for slot in range(mapping.capacity):
+            position = mapping.header_size + slot * _record.size
+            if mapping.map[position] == _EMPTY:
+                continue
+            state, key, segment, offset, length, code = \
+                _record.unpack_from(mapping.map, position)
+            yield Ghid.from_bytes(key), Location(
+                segment,
+                offset,
+                length,
+                _TYPE_MAGICS.get(code)
+            )
+            
+    def sync(self):
+        ''' Flushes the index to disk.
+        '''
+        if not self.readonly:
+            self._mapping.map.flush()
+            
+    def close(self):
+        with self._lock:
+            self._mapping.map.close()
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,273 @@
+'''
+Append-only segment log. Packed objects are self-delimiting, so segments
+are simply packed objects written back-to-back, with no extra framing.
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+import os
+import mmap
+import threading
+
+# Interpackage dependencies
+from .._getlow import dispatch_format
+from .._codec import TruncatedError
+
+
+# Control * imports
+__all__ = [
+    'SegmentLog'
+]
+
+
+# ###############################################
+# Segment log
+# ###############################################
+
+
+SEGMENT_SUFFIX = '.seg'
+_MAGIC_LENGTH = 4
+# Start a new segment once the active one would exceed this size
+DEFAULT_SEGMENT_SIZE = 1 << 30
+
+
+def _segment_name(segment):
+    return '{:08x}'.format(segment) + SEGMENT_SUFFIX
+
+
+class SegmentLog:
+    ''' Append-only log of packed objects, split across numbered segment
+    files in directory. Reads are served from mmaps of the segments, and
+    return zero-copy memoryviews.
+    
+    Only one SegmentLog may write to a directory at a time, though any
+    number of readonly ones may read it. A torn write at the end of the
+    last segment (eg from a crash) is truncated away when a writable log
+    is opened; any other corruption raises ParseError instead, so that
+    nothing after it is lost.
+    '''
+    
+    def __init__(self, directory, segment_size=DEFAULT_SEGMENT_SIZE,
+                 readonly=False):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.readonly = readonly
+        if not readonly:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.RLock()
+        # Segment number -> mmap. The active segment is remapped as it
+        # grows; superseded mappings live on for as long as views of them.
+        self._maps = {}
+        
+        self._segments = self._list_segments()
+        if not self._segments:
+            self._segments.append(0)
+            
+        self._active = self._segments[-1]
+        if readonly:
+            self._file = None
+        else:
+            self._file = open(self._path(self._active), 'ab')
+            try:
+                self._repair()
+            except BaseException:
+                self.close()
+                raise
+        
+    def _list_segments(self):
+        return sorted(
+            int(name[:-len(SEGMENT_SUFFIX)], 16)
+            for name in os.listdir(self.directory)
+            if name.endswith(SEGMENT_SUFFIX)
+        )
+        
+    def _path(self, segment):
+        return os.path.join(self.directory, _segment_name(segment))
+        
+    @property
+    def segments(self):
+        ''' Segment numbers, oldest first.
+        '''
+        # The writer may have added some since we opened.
+        if self.readonly:
+            return self._list_segments()
+        return list(self._segments)
+        
+    @property
+    def end(self):
+        ''' The (segment, offset) that the next append will (usually) be
+        written at.
+        '''
+        if self.readonly:
+            # The writer may have appended (or rolled) since we opened.
+            segment = self.segments[-1] if self.segments else 0
+            try:
+                return segment, os.path.getsize(self._path(segment))
+            except FileNotFoundError:
+                return segment, 0
+                
+        with self._lock:
+            return self._active, self._file.tell()
+        
+    def _repair(self):
+        ''' Truncates a partial object from the end of the active segment.
+        Raises ParseError if the segment is otherwise corrupt.
+        '''
+        end = 0
+        for offset, packed in self._scan_segment(self._active, torn=True):
+            end = offset + len(packed)
+            
+        if end != self._file.tell():
+            self._drop_map(self._active)
+            self._file.truncate(end)
+            self._file.seek(end)
+            
+    def append(self, packed):
+        ''' Appends a packed object, returning its (segment, offset).
+        '''
+        if self.readonly:
+            raise TypeError('Log is readonly.')
+            
+        with self._lock:
+            offset = self._file.tell()
+            if offset and offset + len(packed) > self.segment_size:
+                self._roll()
+                offset = 0
+                
+            self._file.write(packed)
+            # Make the write visible to mmaps (but not necessarily durable)
+            self._file.flush()
+            return self._active, offset
+            
+    def _roll(self):
+        self._file.close()
+        self._drop_map(self._active)
+        self._active += 1
+        self._segments.append(self._active)
+        self._file = open(self._path(self._active), 'ab')
+        
+    def sync(self):
+        ''' Makes everything appended so far durable.
+        '''
+        if self.readonly:
+            return
+            
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            
+    def _drop_map(self, segment):
+        # Don't close it; there may still be views into it.
+        self._maps.pop(segment, None)
+        
+    def _map(self, segment, end):
+        ''' Returns an mmap of segment covering at least its first end
+        bytes.
+        '''
+        mapping = self._maps.get(segment)
+        if mapping is not None and len(mapping) >= end:
+            return mapping
+            
+        with self._lock:
+            mapping = self._maps.get(segment)
+            if mapping is None or len(mapping) < end:
+                with open(self._path(segment), 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    if size < end:
+                        raise ValueError(
+                            'Read past the end of segment ' + str(segment)
+                        )
+                    mapping = mmap.mmap(
+                        f.fileno(),
+                        size,
+                        access = mmap.ACCESS_READ
+                    )
+                self._maps[segment] = mapping
+        return mapping
+        
+    def read(self, segment, offset, length):
+        ''' Returns a read-only memoryview of length bytes at offset in
+        segment, without copying.
+        '''
+        end = offset + length
+        return memoryview(self._map(segment, end))[offset:end]
+        
+    def _scan_segment(self, segment, offset=0, torn=False):
+        ''' Yields (offset, packed) for every object in segment. If torn,
+        stops quietly at an incomplete final object instead of raising.
+        '''
+        size = os.path.getsize(self._path(segment))
+        if offset >= size:
+            return
+            
+        view = memoryview(self._map(segment, size))[:size]
+        while offset < size:
+            remaining = view[offset:]
+            try:
+                # Too short to even dispatch on the magic
+                if len(remaining) < _MAGIC_LENGTH:
+                    raise TruncatedError(_MAGIC_LENGTH)
+                length = dispatch_format(remaining).CODEC.measure(remaining)
+                if length > len(remaining):
+                    raise TruncatedError(length)
+            except TruncatedError:
+                if not torn:
+                    raise
+                return
+                
+            yield offset, remaining[:length]
+            offset += length
+            
+    def scan(self, start=(0, 0)):
+        ''' Yields (segment, offset, packed) for every object in the log
+        from start (a (segment, offset) pair) onwards, in order, where
+        packed is a memoryview into the segment. Raises ParseError if a
+        segment is corrupt.
+        '''
+        first, first_offset = start
+        for segment in self.segments:
+            if segment < first:
+                continue
+            offset = first_offset if segment == first else 0
+            for position, packed in self._scan_segment(segment, offset):
+                yield segment, position, packed
+                
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._maps.clear()
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
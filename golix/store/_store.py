@@ -0,0 +1,229 @@
+'''
+Content-addressed object store, built on the segment log.
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+import os
+import threading
+
+# Interpackage dependencies
+from .._getlow import dispatch_format
+from .._getlow import iter_packed
+from .._getlow import peek
+
+from ._segments import SegmentLog
+from ._segments import DEFAULT_SEGMENT_SIZE
+from ._index import GhidIndex
+from ._index import Location
+
+
+# Control * imports
+__all__ = [
+    'ObjectStore'
+]
+
+
+# ###############################################
+# Object store
+# ###############################################
+
+
+INDEX_NAME = 'index.gxi'
+# Objects in the log were verified when they were put, so don't size-limit
+# them when reindexing.
+_NO_LIMITS = {}
+
+
+class ObjectStore:
+    ''' Stores packed Golix objects by ghid. Addresses are verified
+    once, when objects are put; reads return zero-copy memoryviews, which
+    can be passed directly to unpack.
+    
+    Storing an object twice is a no-op. The index is persistent, so
+    opening the store only indexes whatever was appended to the log after
+    the index was last updated (eg because of a crash).
+    
+    One process may write to a store at a time; others may open it
+    readonly, and will see the writer's puts.
+    '''
+    
+    def __init__(self, directory, segment_size=DEFAULT_SEGMENT_SIZE,
+                 readonly=False):
+        self.directory = directory
+        self.readonly = readonly
+        self._log = SegmentLog(directory, segment_size, readonly)
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(directory, INDEX_NAME)
+        try:
+            self._index = GhidIndex(self._index_path, readonly=readonly)
+        except BaseException:
+            self._log.close()
+            raise
+            
+        if not readonly:
+            try:
+                self._catch_up()
+            except BaseException:
+                self.close()
+                raise
+            
+    def _catch_up(self):
+        ''' Indexes anything in the log past the index's high-water mark.
+        '''
+        segment, offset = self._index.high_water
+        if (
+            segment > self._log.end[0] or
+            (segment == self._log.end[0] and offset > self._log.end[1])
+        ):
+            # The index is ahead of the log (eg the log lost unsynced writes
+            # in a power failure), so it can't be trusted.
+            self.reindex()
+            return
+            
+        for segment, offset, packed in self._log.scan((segment, offset)):
+            header = peek(packed, _NO_LIMITS)
+            self._index[header.ghid] = Location(
+                segment,
+                offset,
+                len(packed),
+                header.magic
+            )
+        self._index.set_high_water(*self._log.end)
+        
+    def reindex(self):
+        ''' Rebuilds the index from scratch, from the log.
+        '''
+        with self._lock:
+            self._index.close()
+            os.remove(self._index_path)
+            self._index = GhidIndex(self._index_path)
+            self._catch_up()
+        
+    def put(self, packed):
+        ''' Verifies and stores the packed object, returning its ghid.
+        Raises ParseError or SecurityError if it fails verification.
+        '''
+        # Unpacking checks the address.
+        return self.put_object(dispatch_format(packed).unpack(packed))
+        
+    def put_object(self, obj):
+        ''' Stores an unpacked (and therefore verified) or freshly packed
+        object, returning its ghid.
+        '''
+        if self.readonly:
+            raise TypeError('Store is readonly.')
+            
+        ghid = obj.ghid
+        # Unpacked objects keep whatever followed them in their buffer.
+        packed = memoryview(obj.packed)
+        packed = packed[:obj.CODEC.measure(packed)]
+        with self._lock:
+            if ghid not in self._index:
+                segment, offset = self._log.append(packed)
+                self._index[ghid] = Location(
+                    segment,
+                    offset,
+                    len(packed),
+                    obj.CODEC.MAGIC
+                )
+                self._index.set_high_water(segment, offset + len(packed))
+        return ghid
+        
+    def put_many(self, source, limits=None):
+        ''' Verifies and stores every object packed back-to-back in a
+        bytes-like, file-like, or iterable source. Returns their ghids.
+        Objects larger than limits (see iter_packed) are rejected.
+        '''
+        return [self.put(packed) for packed in iter_packed(source, limits)]
+        
+    def locate(self, ghid):
+        ''' Returns the Location of ghid. Raises KeyError if missing.
+        '''
+        location = self._index.get(ghid)
+        # The writer may have grown (and therefore replaced) the index.
+        if location is None and self.readonly and self._index.refresh():
+            location = self._index.get(ghid)
+        if location is None:
+            raise KeyError(ghid)
+        return location
+        
+    def get(self, ghid):
+        ''' Returns a read-only memoryview of the packed object at ghid.
+        Raises KeyError if missing.
+        '''
+        location = self.locate(ghid)
+        return self._log.read(
+            location.segment,
+            location.offset,
+            location.length
+        )
+        
+    def get_object(self, ghid):
+        ''' Unpacks the object at ghid, which re-verifies it.
+        '''
+        packed = self.get(ghid)
+        return dispatch_format(packed).unpack(packed)
+        
+    def sync(self):
+        ''' Makes everything stored so far durable.
+        '''
+        # Log first, so that the index is never ahead of it on disk.
+        self._log.sync()
+        self._index.sync()
+        
+    def close(self):
+        self._index.close()
+        self._log.close()
+        
+    def __contains__(self, ghid):
+        try:
+            self.locate(ghid)
+        except KeyError:
+            return False
+        return True
+        
+    def __len__(self):
+        return len(self._index)
+        
+    def __iter__(self):
+        # Copy, so that puts don't break iteration
+        return iter(list(self._index))
+        
+    def items(self):
+        ''' Returns a list of (ghid, Location) for everything stored.
+        '''
+        return list(self._index.items())
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
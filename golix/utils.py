@@ -34,6 +34,12 @@ golix: A python library for Golix protocol object manipulation.
 
 '''
 import base64
+import collections
+import io
+import os
+import threading
+import types
+import functools
 # This is just used for ghids.
 import random
 
@@ -47,7 +53,8 @@ from .exceptions import InvalidGhidAddress
 
 _hash_len_lookup = {
     0: 64,
-    1: 64
+    1: 64,
+    2: 64
 }
 
 
@@ -188,3 +195,254 @@ class Ghid:
         
         
 _dummy_ghid = Ghid.placeholder()
+
+
+# ----------------------------------------------------------------------
+# Streaming sources
+
+
+def _source_length(source):
+    ''' Returns the number of bytes remaining in a bytes-like or
+    file-like source, or None if that can't be determined (for example,
+    for iterables of chunks, or pipes).
+    '''
+    if hasattr(source, 'read'):
+        try:
+            size = os.fstat(source.fileno()).st_size
+            return size - source.tell()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            pass
+            
+        try:
+            position = source.tell()
+            end = source.seek(0, io.SEEK_END)
+            source.seek(position)
+            return end - position
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+            
+    try:
+        return memoryview(source).nbytes
+    except TypeError:
+        return None
+
+
+class _StreamReader:
+    ''' Reads exact-length blocks from a bytes-like object, a file-like
+    object, or an iterable of bytes-like chunks, so that they can all be
+    treated like a file. Bytes-like sources are read without copying.
+    '''
+    
+    def __init__(self, source):
+        self._file = None
+        self._view = None
+        self._chunks = None
+        self._position = 0
+        self._pending = memoryview(b'')
+        
+        if hasattr(source, 'read'):
+            self._file = source
+        else:
+            try:
+                self._view = memoryview(source).cast('B')
+            except TypeError:
+                self._chunks = iter(source)
+                
+    @property
+    def seekable(self):
+        if self._file is not None:
+            try:
+                return self._file.seekable()
+            except AttributeError:
+                return False
+        return self._view is not None
+        
+    def tell(self):
+        if self._file is not None:
+            return self._file.tell()
+        return self._position
+        
+    def seek(self, position):
+        if not self.seekable:
+            raise io.UnsupportedOperation('Source is not seekable.')
+        elif self._file is not None:
+            self._file.seek(position)
+        else:
+            self._position = position
+            
+    def read(self, size):
+        ''' Reads up to size bytes. Only returns fewer at the end of the
+        source.
+        '''
+        if self._view is not None:
+            start = self._position
+            self._position = min(start + size, len(self._view))
+            return self._view[start:self._position]
+            
+        parts = []
+        remaining = size
+        while remaining > 0:
+            if self._file is not None:
+                part = self._file.read(remaining)
+                if not part:
+                    break
+            
+            else:
+                if not self._pending:
+                    try:
+                        self._pending = memoryview(next(self._chunks)).cast('B')
+                    except StopIteration:
+                        break
+                part = self._pending[:remaining]
+                self._pending = self._pending[len(part):]
+                
+            parts.append(part)
+            remaining -= len(part)
+            self._position += len(part)
+            
+        if len(parts) == 1:
+            return parts[0]
+        else:
+            return b''.join(parts)
+
+
+# ----------------------------------------------------------------------
+# Methods
+
+
+class _hybridmethod:
+    ''' Like classmethod, except that it binds to the instance when
+    called on one.
+    '''
+    
+    def __init__(self, func):
+        self.__func__ = func
+        functools.update_wrapper(self, func)
+        
+    def __get__(self, instance, owner):
+        if instance is None:
+            return types.MethodType(self.__func__, owner)
+        return types.MethodType(self.__func__, instance)
+
+
+# ----------------------------------------------------------------------
+# Caching
+
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo',
+    ['hits', 'misses', 'evictions', 'maxsize', 'currsize']
+)
+
+
+class _LRUCache:
+    ''' Thread-safe mapping holding at most maxsize entries, evicting
+    the least-recently-used. If on_evict is passed, it's called with
+    (key, value) for every entry that is evicted or discarded, for
+    example to zero out key material.
+    '''
+    
+    def __init__(self, maxsize, on_evict=None):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1.')
+            
+        self.maxsize = maxsize
+        self._on_evict = on_evict
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        
+    def __len__(self):
+        return len(self._entries)
+        
+    def __contains__(self, key):
+        # Doesn't count as a hit or miss, and doesn't refresh the entry.
+        return key in self._entries
+        
+    def get(self, key, default=None):
+        ''' Returns the value for key, marking it as most recently used,
+        or default if missing.
+        '''
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+        
+    def put(self, key, value):
+        ''' Adds or replaces key, evicting the least-recently-used
+        entries if full.
+        '''
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                old = self._entries.pop(key)
+                if old is not value:
+                    evicted.append((key, old))
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                evicted.append(self._entries.popitem(last=False))
+                self._evictions += 1
+        self._evict(evicted)
+        
+    def setdefault(self, key, value):
+        ''' Returns the value for key, marking it as most recently used.
+        If key is missing, adds value first (evicting as put), and returns
+        that. Unlike put, never replaces an existing entry.
+        '''
+        evicted = []
+        with self._lock:
+            try:
+                existing = self._entries[key]
+            except KeyError:
+                pass
+            else:
+                self._entries.move_to_end(key)
+                return existing
+                
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                evicted.append(self._entries.popitem(last=False))
+                self._evictions += 1
+        self._evict(evicted)
+        return value
+        
+    def discard(self, key):
+        ''' Removes key, if present.
+        '''
+        with self._lock:
+            try:
+                evicted = [(key, self._entries.pop(key))]
+            except KeyError:
+                evicted = []
+        self._evict(evicted)
+        
+    def clear(self):
+        with self._lock:
+            evicted = list(self._entries.items())
+            self._entries.clear()
+        self._evict(evicted)
+        
+    def _evict(self, evicted):
+        # Outside the lock, so that callbacks can't deadlock us.
+        if self._on_evict is not None:
+            for key, value in evicted:
+                self._on_evict(key, value)
+        
+    def cache_info(self):
+        ''' Returns a CacheInfo, like functools.lru_cache.
+        '''
+        with self._lock:
+            return CacheInfo(
+                hits = self._hits,
+                misses = self._misses,
+                evictions = self._evictions,
+                maxsize = self.maxsize,
+                currsize = len(self._entries)
+            )
@@ -105,7 +105,7 @@ setup(
     # $ pip install -e .[dev,test]
     extras_require={
         'full': ['donna25519>=0.1.1',
-                 'cryptography>=1.6',
+                 'cryptography>=2.6',
                  'smartyparse>=0.1.3']
     },
 
@@ -0,0 +1,117 @@
+'''
+Scratchpad for test-based development. Unit tests for aio.py.
+
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+
+import unittest
+import asyncio
+import concurrent.futures
+
+# These are normal inclusions
+from golix import SecurityError
+from golix.aio import AsyncFirstParty
+from golix.aio import AsyncThirdParty
+
+# These are abnormal (don't use in production) inclusions.
+from golix.cipher import FirstParty1
+from golix.cipher import ThirdParty1
+
+
+# ###############################################
+# Testing
+# ###############################################
+
+
+def _run(coro):
+    ''' asyncio.run, which needs python 3.7.
+    '''
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class AioTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.firstparty_a = FirstParty1()
+        cls.firstparty_b = FirstParty1()
+        
+    def test_roundtrip(self):
+        async def roundtrip(executor):
+            author = AsyncFirstParty(
+                self.firstparty_a,
+                executor = executor,
+                max_concurrency = 2
+            )
+            reader = AsyncFirstParty(self.firstparty_b, executor=executor)
+            server = AsyncThirdParty(ThirdParty1(), executor=executor)
+            # Passthrough
+            self.assertEqual(author.ghid, self.firstparty_a.ghid)
+            
+            secret = author.new_secret()
+            plaintexts = [b'hello' * ii for ii in range(1, 9)]
+            geocs = await asyncio.gather(*(
+                author.make_container(secret, plaintext)
+                for plaintext in plaintexts
+            ))
+            
+            unpacked = await asyncio.gather(*(
+                reader.unpack_container(geoc.packed) for geoc in geocs
+            ))
+            results = await asyncio.gather(*(
+                server.verify_object(author.second_party, geoc)
+                for geoc in unpacked
+            ))
+            self.assertTrue(all(results))
+            
+            received = await asyncio.gather(*(
+                reader.receive_container(author.second_party, secret, geoc)
+                for geoc in unpacked
+            ))
+            self.assertEqual(received, plaintexts)
+            
+            with self.assertRaises(SecurityError):
+                await server.verify_object(
+                    self.firstparty_b.second_party,
+                    unpacked[0]
+                )
+                
+        _run(roundtrip(None))
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            _run(roundtrip(executor))
+        
+        
+if __name__ == '__main__':
+    unittest.main()
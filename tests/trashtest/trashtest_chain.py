@@ -0,0 +1,199 @@
+'''
+Scratchpad for test-based development. Unit tests for dynamic binding chains.
+
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+        
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+    
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+    
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+import unittest
+import random
+
+# These are normal inclusions
+from golix import Ghid
+from golix import SecurityError
+from golix import DynamicChain
+
+# These are abnormal (don't use in production) inclusions.
+from golix.cipher import FirstParty2
+from golix.cipher import ThirdParty2
+
+
+# ###############################################
+# Testing
+# ###############################################
+
+
+class _CountingVerifier(ThirdParty2):
+    ''' Counts signature verifications.
+    '''
+    
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        
+    def verify_object(self, second_party, obj):
+        self.count += 1
+        return super().verify_object(second_party, obj)
+
+
+class DynamicChainTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.alice = FirstParty2()
+        cls.bob = FirstParty2()
+        cls.frames = cls._make_frames(cls.alice, 6)
+        
+    @staticmethod
+    def _make_frames(binder, count, history=3):
+        frames = [binder.make_bind_dynamic(
+            counter = 0,
+            target_vector = (Ghid.pseudorandom(1),)
+        )]
+        for counter in range(1, count):
+            previous = frames[-1]
+            frames.append(binder.make_bind_dynamic(
+                counter = counter,
+                target_vector = (
+                    (Ghid.pseudorandom(1), previous.ghid) +
+                    tuple(previous.target_vector[1:history])
+                ),
+                ghid_dynamic = frames[0].ghid_dynamic
+            ))
+        return frames
+        
+    def _chain(self, verifier=None):
+        return DynamicChain(self.alice.second_party, verifier=verifier)
+        
+    def test_any_order(self):
+        frames = self.frames
+        shuffled = list(frames)
+        random.shuffle(shuffled)
+        for ordering in (frames, frames[::-1], shuffled):
+            chain = self._chain()
+            for frame in ordering:
+                chain.add(frame)
+            self.assertEqual(len(chain), len(frames))
+            self.assertEqual(chain.pending, 0)
+            self.assertEqual(chain.head, frames[-1].ghid)
+            self.assertEqual(chain.target, frames[-1].target)
+            self.assertEqual(chain.counter, frames[-1].counter)
+            self.assertEqual(chain.ghid_dynamic, frames[0].ghid_dynamic)
+            
+        # Nothing is verified until the chain reaches its first frame
+        chain = self._chain()
+        for frame in frames[1:]:
+            self.assertFalse(chain.add(frame))
+        self.assertEqual(len(chain), 0)
+        self.assertIsNone(chain.head)
+        self.assertTrue(chain.add(frames[0]))
+        self.assertEqual(chain.head, frames[-1].ghid)
+        
+        with self.assertRaises(TypeError):
+            chain.add(self.alice.make_bind_static(target=Ghid.pseudorandom(1)))
+            
+    def test_verified_once(self):
+        verifier = _CountingVerifier()
+        chain = self._chain(verifier)
+        for frame in self.frames:
+            chain.add(frame)
+        self.assertEqual(verifier.count, len(self.frames))
+        
+        # Re-adding is free, and appending costs one verification.
+        for frame in self.frames:
+            self.assertFalse(chain.add(frame))
+        self.assertEqual(verifier.count, len(self.frames))
+        frame = self.alice.make_bind_dynamic(
+            counter = 100,
+            target_vector = (
+                (Ghid.pseudorandom(1), self.frames[-1].ghid) +
+                tuple(self.frames[-1].target_vector[1:3])
+            ),
+            ghid_dynamic = self.frames[0].ghid_dynamic
+        )
+        self.assertTrue(chain.add(frame))
+        self.assertEqual(verifier.count, len(self.frames) + 1)
+        self.assertEqual(chain.head, frame.ghid)
+        
+    def test_anchor(self):
+        chain = DynamicChain(self.alice.second_party, anchor=self.frames[3])
+        for frame in self.frames[4:]:
+            chain.add(frame)
+        self.assertEqual(len(chain), 3)
+        self.assertEqual(chain.head, self.frames[-1].ghid)
+        
+    def test_rejects(self):
+        frames = self.frames
+        dynamic = frames[0].ghid_dynamic
+        
+        def successor(counter, history, binder=self.alice):
+            return binder.make_bind_dynamic(
+                counter = counter,
+                target_vector = (Ghid.pseudorandom(1),) + tuple(history),
+                ghid_dynamic = dynamic
+            )
+            
+        chain = self._chain()
+        for frame in frames[:3]:
+            chain.add(frame)
+            
+        # Wrong binder
+        with self.assertRaises(SecurityError):
+            chain.add(successor(3, (frames[2].ghid,), binder=self.bob))
+        # Counter must increase
+        with self.assertRaises(SecurityError):
+            chain.add(successor(2, (frames[2].ghid, frames[1].ghid)))
+        # History must continue the predecessor's
+        with self.assertRaises(SecurityError):
+            chain.add(successor(3, (frames[2].ghid, frames[0].ghid)))
+        # Forks
+        with self.assertRaises(SecurityError):
+            chain.add(successor(3, (frames[1].ghid, frames[0].ghid)))
+        # Second first frame
+        with self.assertRaises(SecurityError):
+            chain.add(self._make_frames(self.alice, 1)[0])
+        # Wrong chain
+        other = self._make_frames(self.alice, 2)[1]
+        other_chain = DynamicChain(self.alice.second_party, anchor=other)
+        with self.assertRaises(SecurityError):
+            other_chain.add(successor(2, (other.ghid,)))
+        self.assertEqual(len(chain), 3)
+        
+        # Held frames are rejected once their predecessor arrives
+        chain = self._chain()
+        bad = successor(1, (frames[1].ghid, frames[2].ghid))
+        for frame in (bad, frames[1], frames[0]):
+            chain.add(frame)
+        self.assertEqual(chain.head, frames[1].ghid)
+        self.assertIn(bad.ghid, chain.rejected)
+        self.assertEqual(chain.pending, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
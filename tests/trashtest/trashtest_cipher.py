@@ -36,9 +36,13 @@ golix: A python library for Golix protocol object manipulation.
 import unittest
 import sys
 import collections
+import io
+import concurrent.futures
 
 # These are normal imports
 from golix import Ghid
+from golix import ParseError
+from golix import SecurityError
 
 # These are semi-normal imports
 from golix.cipher import FirstParty0
@@ -47,12 +51,17 @@ from golix.cipher import ThirdParty0
 from golix.cipher import FirstParty1
 from golix.cipher import SecondParty1
 from golix.cipher import ThirdParty1
+from golix.cipher import FirstParty2
+from golix.cipher import SecondParty2
+from golix.cipher import ThirdParty2
+from golix.cipher import KeyPool
 
 # These are abnormal (don't use in production) imports.
 from golix._spec import _dummy_signature
 from golix._spec import _dummy_mac
 from golix._spec import _dummy_asym
 from golix._spec import _dummy_address
+from golix._getlow import GARQ
 
 
 # ###############################################
@@ -62,6 +71,18 @@ from golix._spec import _dummy_address
 
 _dummy_payload = b'[[ Hello, world? ]]'
 _dummy_payload_2 = b'[[ Hiyaback! ]]'
+
+
+def _tamper_request(sender, garq):
+    ''' Flips a bit of garq's encrypted payload, and then repacks it with
+    a valid address, so that only decryption can catch it.
+    '''
+    payload = bytearray(garq.payload)
+    payload[len(payload) // 2] ^= 1
+    forged = GARQ(recipient=garq.recipient, payload=bytes(payload))
+    forged.pack(cipher=sender.ciphersuite, address_algo=sender.address_algo)
+    forged.pack_signature(garq.signature)
+    return bytes(forged.packed)
     
 
 class CipherTest(unittest.TestCase):
@@ -81,8 +102,19 @@ class CipherTest(unittest.TestCase):
         cls.firstparty_1b = FirstParty1(address_algo=1)
         cls.secondparty_1b = cls.firstparty_1b.second_party
         
+        cls.firstparty_2a = FirstParty2(address_algo=1)
+        cls.secondparty_2a = SecondParty2.from_packed(
+            cls.firstparty_2a.second_party.packed
+        )
+        
+        cls.firstparty_2b = FirstParty2(address_algo=1)
+        cls.secondparty_2b = SecondParty2.from_packed(
+            cls.firstparty_2b.second_party.packed
+        )
+        
         cls.thirdparty_0 = ThirdParty0()
         cls.thirdparty_1 = ThirdParty1()
+        cls.thirdparty_2 = ThirdParty2()
     
     def test_identity_serialization_cipher0(self):
         ''' Make sure identities can serialize themselves.
@@ -397,6 +429,12 @@ class CipherTest(unittest.TestCase):
             request = aack2_up
         )
         
+        # OAEP failures are SecurityErrors
+        with self.assertRaises(SecurityError):
+            self.firstparty_1b.unpack_request(
+                _tamper_request(self.firstparty_1a, areq2b)
+            )
+        
     def test_garq_nak_cipher0(self):
         # --------------------------------------------------------------
         # Asymmetric nak
@@ -424,6 +462,555 @@ class CipherTest(unittest.TestCase):
             request = anak2_up
         )
         
+    def test_unpack_dispatch_cipher0(self):
+        # Make sure magic-based dispatch finds the right format for all of
+        # the object types.
+        objs = [
+            self.secondparty_0.packed,
+            self.firstparty_0.make_container(
+                secret = self.firstparty_0.new_secret(),
+                plaintext = _dummy_payload
+            ).packed,
+            self.firstparty_0.make_bind_static(
+                target = Ghid.pseudorandom(algo=1)
+            ).packed,
+            self.firstparty_0.make_bind_dynamic(
+                counter = 0,
+                target_vector = (Ghid.pseudorandom(algo=1),)
+            ).packed,
+            self.firstparty_0.make_debind(
+                target = Ghid.pseudorandom(algo=1)
+            ).packed,
+        ]
+        
+        for packed in objs:
+            obj = self.firstparty_0.unpack_any(packed)
+            self.assertEqual(obj.magic, bytes(packed[0:4]))
+            obj = self.thirdparty_0.unpack_object(packed)
+            self.assertEqual(obj.magic, bytes(packed[0:4]))
+            obj = self.thirdparty_0.unpack_any(packed)
+            self.assertEqual(obj.magic, bytes(packed[0:4]))
+            
+        garq = self.firstparty_0.make_request(
+            recipient = self.secondparty_0,
+            request = self.firstparty_0.make_ack(
+                target = Ghid.pseudorandom(algo=1)
+            )
+        )
+        obj = self.thirdparty_0.unpack_object(garq.packed)
+        self.assertEqual(obj.magic, b'GARQ')
+        
+        with self.assertRaises(ParseError):
+            self.firstparty_0.unpack_any(b'GXXX' + bytes(objs[1][4:]))
+        with self.assertRaises(ParseError):
+            self.thirdparty_0.unpack_object(b'GXXX' + bytes(objs[1][4:]))
+        with self.assertRaises(ParseError):
+            self.thirdparty_0.unpack_object(b'GE')
+        
+    def test_geoc_stream_cipher1(self):
+        secret = self.firstparty_1a.new_secret()
+        plaintext = bytes(range(256)) * 300
+        
+        reference = self.firstparty_1a.make_container(secret, plaintext)
+        
+        sources = [
+            lambda: plaintext,
+            lambda: io.BytesIO(plaintext),
+            lambda: (plaintext[ii:ii + 1000]
+                     for ii in range(0, len(plaintext), 1000)),
+        ]
+        for make_source in sources:
+            stream = self.firstparty_1a.make_container_stream(
+                secret = secret,
+                source = make_source(),
+                length = len(plaintext),
+                chunk_size = 4096
+            )
+            packed = b''.join(stream)
+            self.assertEqual(len(packed), stream.packed_size)
+            self.assertEqual(stream.ghid, reference.ghid)
+            self.assertEqual(
+                packed[:-len(stream.signature)],
+                bytes(reference.packed)[:-len(reference.signature)]
+            )
+            
+            geoc = self.firstparty_1b.unpack_container(packed)
+            self.thirdparty_1.verify_object(self.secondparty_1a, geoc)
+            
+            chunked = [packed[ii:ii + 777]
+                       for ii in range(0, len(packed), 777)]
+            for received in (packed, io.BytesIO(packed), iter(chunked)):
+                recovered = self.firstparty_1b.receive_container_stream(
+                    author = self.secondparty_1a,
+                    secret = secret,
+                    source = received,
+                    chunk_size = 5000
+                )
+                self.assertEqual(b''.join(recovered), plaintext)
+                
+        # Tampering should be caught for seekable and unseekable sources
+        tampered = bytearray(reference.packed)
+        tampered[100] ^= 1
+        for received in (tampered, iter([tampered])):
+            recovered = self.firstparty_1b.receive_container_stream(
+                author = self.secondparty_1a,
+                secret = secret,
+                source = received
+            )
+            with self.assertRaises(SecurityError):
+                b''.join(recovered)
+                
+        # Iterables need an explicit length
+        with self.assertRaises(ValueError):
+            self.firstparty_1a.make_container_stream(secret, iter([b'']))
+        
+    def test_unpack_many_cipher0(self):
+        objs = [
+            self.firstparty_0.make_container(
+                secret = self.firstparty_0.new_secret(),
+                plaintext = _dummy_payload * ii
+            )
+            for ii in range(1, 5)
+        ]
+        objs.append(self.firstparty_0.make_bind_dynamic(
+            counter = 0,
+            target_vector = (objs[0].ghid,)
+        ))
+        objs.append(self.firstparty_0.make_bind_static(target=objs[2].ghid))
+        objs.append(self.firstparty_0.make_debind(target=objs[-1].ghid))
+        objs.append(self.firstparty_0.make_request(
+            recipient = self.secondparty_0,
+            request = self.firstparty_0.make_ack(target=objs[3].ghid)
+        ))
+        stream = b''.join(bytes(obj.packed) for obj in objs)
+        stream = bytes(self.secondparty_0.packed) + stream
+        
+        chunked = [stream[ii:ii + 100] for ii in range(0, len(stream), 100)]
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            for source, kwargs in ((stream, {}),
+                                   (io.BytesIO(stream), {}),
+                                   (iter(chunked), {}),
+                                   (stream, {'executor': executor})):
+                unpacked = list(self.thirdparty_0.unpack_many(source, **kwargs))
+                self.assertEqual(len(unpacked), len(objs) + 1)
+                self.assertEqual(unpacked[0].ghid, self.secondparty_0.ghid)
+                for obj, reobj in zip(objs, unpacked[1:]):
+                    self.assertEqual(obj.ghid, reobj.ghid)
+                    self.assertEqual(obj.magic, reobj.magic)
+                    
+        for source in (stream[:-1], io.BytesIO(stream[:-1]), stream + b'G'):
+            with self.assertRaises(ParseError):
+                list(self.thirdparty_0.unpack_many(source))
+        
+    def test_verify_many_cipher1(self):
+        objs = [
+            self.firstparty_1a.make_bind_static(target=Ghid.pseudorandom(1))
+            for ii in range(6)
+        ]
+        pairs = [(self.secondparty_1a, obj) for obj in objs]
+        # Wrong author for one of them
+        pairs[2] = (self.secondparty_1b, objs[2])
+        
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            for kwargs in ({}, {'executor': executor},
+                           {'executor': executor, 'prefetch': 1}):
+                results = self.thirdparty_1.verify_many(pairs, **kwargs)
+                self.assertEqual(len(results), len(pairs))
+                for ii, result in enumerate(results):
+                    if ii == 2:
+                        self.assertIsInstance(result, SecurityError)
+                    else:
+                        self.assertIs(result, True)
+                        
+        with self.assertRaises(ValueError):
+            gidc = self.thirdparty_1.unpack_identity(
+                self.secondparty_1a.packed
+            )
+            self.thirdparty_1.verify_many([(self.secondparty_1a, gidc)])
+        
+    def test_make_many_cipher1(self):
+        targets = [Ghid.pseudorandom(1) for ii in range(5)]
+        secrets = [self.firstparty_1a.new_secret() for ii in range(3)]
+        plaintexts = [_dummy_payload * ii for ii in range(1, 4)]
+        
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            for executor in (None, pool):
+                gobss = self.firstparty_1a.make_bind_static_many(
+                    targets,
+                    executor = executor
+                )
+                gdxxs = self.firstparty_1a.make_debind_many(
+                    [gobs.ghid for gobs in gobss],
+                    executor = executor
+                )
+                gobds = self.firstparty_1a.make_bind_dynamic_many(
+                    [(ii, (target,)) for ii, target in enumerate(targets)],
+                    executor = executor
+                )
+                geocs = self.firstparty_1a.make_containers(
+                    zip(secrets, plaintexts),
+                    executor = executor
+                )
+                
+                self.assertEqual([gobs.target for gobs in gobss], targets)
+                self.assertEqual(
+                    [gdxx.target for gdxx in gdxxs],
+                    [gobs.ghid for gobs in gobss]
+                )
+                self.assertEqual([gobd.counter for gobd in gobds],
+                                 list(range(len(targets))))
+                
+                objs = gobss + gdxxs + gobds + geocs
+                results = self.thirdparty_1.verify_many(
+                    [(self.secondparty_1a, obj) for obj in objs]
+                )
+                self.assertTrue(all(result is True for result in results))
+                
+                for secret, plaintext, geoc in zip(secrets, plaintexts, geocs):
+                    geoc = self.firstparty_1b.unpack_container(geoc.packed)
+                    self.assertEqual(
+                        self.firstparty_1b.receive_container(
+                            self.secondparty_1a,
+                            secret,
+                            geoc
+                        ),
+                        plaintext
+                    )
+        
+    def test_receive_container_many_cipher1(self):
+        secrets = [self.firstparty_1a.new_secret() for ii in range(4)]
+        plaintexts = [_dummy_payload * ii for ii in range(1, 5)]
+        geocs = [
+            self.firstparty_1b.unpack_container(geoc.packed)
+            for geoc in self.firstparty_1a.make_containers(
+                zip(secrets, plaintexts)
+            )
+        ]
+        triples = [
+            (self.secondparty_1a, secret, geoc)
+            for secret, geoc in zip(secrets, geocs)
+        ]
+        # Wrong author for the last one
+        triples[-1] = (self.secondparty_1b,) + triples[-1][1:]
+        expected = {
+            id(geoc): plaintext for geoc, plaintext in zip(geocs, plaintexts)
+        }
+        
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            for executor, prefetch in ((None, 16), (pool, 16), (pool, 1)):
+                results = list(self.firstparty_1b.receive_container_many(
+                    triples,
+                    executor = executor,
+                    prefetch = prefetch
+                ))
+                self.assertEqual(len(results), len(triples))
+                for geoc, plaintext in results:
+                    if geoc is geocs[-1]:
+                        self.assertIsInstance(plaintext, SecurityError)
+                    else:
+                        self.assertEqual(plaintext, expected[id(geoc)])
+        
+    def test_shared_cache_cipher1(self):
+        sender = self.firstparty_1a
+        recipient = self.firstparty_1b
+        sender.invalidate_shared()
+        recipient.invalidate_shared()
+        sender_misses = sender._shared_cache.cache_info().misses
+        recipient_misses = recipient._shared_cache.cache_info().misses
+        
+        for ii in range(3):
+            garq = sender.make_request(
+                recipient = self.secondparty_1b,
+                request = sender.make_ack(target=Ghid.pseudorandom(algo=1))
+            )
+            request = recipient.unpack_request(garq.packed)
+            recipient.receive_request(
+                requestor = self.secondparty_1a,
+                request = request
+            )
+            
+        self.assertEqual(
+            sender._shared_cache.cache_info().misses - sender_misses,
+            1
+        )
+        self.assertEqual(
+            recipient._shared_cache.cache_info().misses - recipient_misses,
+            1
+        )
+        # Both ends derive the same secret.
+        key = sender._get_shared(self.secondparty_1b)
+        self.assertEqual(key, recipient._get_shared(self.secondparty_1a))
+        self.assertEqual(key, sender._derive_shared(self.secondparty_1b))
+        
+        # Callers get copies; invalidation zeroes out the cached secret
+        # (but not those copies) and forces a rederive
+        cached = sender._shared_cache.get(self.secondparty_1b.ghid)
+        self.assertIsNot(key, cached)
+        sender.invalidate_shared(self.secondparty_1b.ghid)
+        self.assertEqual(cached, bytes(len(cached)))
+        self.assertEqual(key, sender._derive_shared(self.secondparty_1b))
+        self.assertEqual(
+            sender._get_shared(self.secondparty_1b),
+            recipient._get_shared(self.secondparty_1a)
+        )
+        
+    def test_key_pool_cipher1(self):
+        # Default worker processes, to make sure everything pickles.
+        pool = KeyPool(depth=1)
+        try:
+            pool.wait()
+            self.assertEqual(pool.metrics().ready, 1)
+            FirstParty1.KEY_POOL = pool
+            firstparty = FirstParty1()
+        finally:
+            FirstParty1.KEY_POOL = None
+            pool.close()
+            
+        metrics = pool.metrics()
+        self.assertEqual(metrics.hits, 1)
+        self.assertEqual(metrics.misses, 0)
+        self.assertIsNotNone(metrics.mean_refill_latency)
+        
+        # Make sure the pooled keys actually work.
+        gobs = firstparty.make_bind_static(target=Ghid.pseudorandom(1))
+        self.thirdparty_1.verify_object(firstparty.second_party, gobs)
+        
+    def test_verification_cache_cipher1(self):
+        thirdparty = ThirdParty1(verification_cache_size=16)
+        self.assertIsNone(self.thirdparty_1.verification_cache_info())
+        
+        gobs = self.firstparty_1a.make_bind_static(target=Ghid.pseudorandom(1))
+        gobs = thirdparty.unpack_bind_static(gobs.packed)
+        for ii in range(3):
+            self.assertTrue(thirdparty.verify_object(self.secondparty_1a, gobs))
+            
+        info = thirdparty.verification_cache_info()
+        self.assertEqual(info.hits, 2)
+        self.assertEqual(info.misses, 1)
+        
+        # Failures aren't cached, and don't use a different signer's result
+        for ii in range(2):
+            with self.assertRaises(SecurityError):
+                thirdparty.verify_object(self.secondparty_1b, gobs)
+        self.assertEqual(thirdparty.verification_cache_info().currsize, 1)
+        
+        # Still callable on the class, without a cache
+        self.assertTrue(ThirdParty1.verify_object(self.secondparty_1a, gobs))
+        self.assertEqual(
+            ThirdParty1.verify_many([(self.secondparty_1a, gobs)]),
+            [True]
+        )
+        self.assertIsNone(ThirdParty1.verification_cache_info())
+        
+    def test_identity_serialization_cipher2(self):
+        fid2_pack = self.firstparty_2a._serialize()
+        fid2_unpack = FirstParty2._from_serialized(fid2_pack)
+        self.assertEqual(fid2_unpack.ghid, self.firstparty_2a.ghid)
+        
+    def test_geoc_cipher2(self):
+        secret = self.firstparty_2a.new_secret()
+        container = self.firstparty_2a.make_container(
+            secret = secret,
+            plaintext = _dummy_payload
+        )
+        
+        geoc = self.firstparty_2b.unpack_container(
+            packed = container.packed
+        )
+        plaintext = self.firstparty_2b.receive_container(
+            author = self.secondparty_2a,
+            secret = secret,
+            container = geoc
+        )
+        self.assertEqual(plaintext, _dummy_payload)
+        
+        self.thirdparty_2.verify_object(
+            second_party = self.secondparty_2a,
+            obj = geoc
+        )
+        with self.assertRaises(SecurityError):
+            self.thirdparty_2.verify_object(
+                second_party = self.secondparty_2b,
+                obj = geoc
+            )
+        
+        # The wrong secret must fail authentication, not return garbage
+        with self.assertRaises(SecurityError):
+            self.firstparty_2b.receive_container(
+                author = self.secondparty_2a,
+                secret = self.firstparty_2a.new_secret(),
+                container = geoc
+            )
+        
+    def test_geoc_stream_cipher2(self):
+        secret = self.firstparty_2a.new_secret()
+        plaintext = bytes(range(256)) * 300
+        reference = self.firstparty_2a.make_container(secret, plaintext)
+        
+        stream = self.firstparty_2a.make_container_stream(
+            secret = secret,
+            source = io.BytesIO(plaintext),
+            length = len(plaintext),
+            chunk_size = 4096
+        )
+        packed = b''.join(stream)
+        self.assertEqual(stream.ghid, reference.ghid)
+        
+        # Chunk sizes that don't line up with the tag
+        chunked = [packed[ii:ii + 7] for ii in range(0, len(packed), 7)]
+        for received in (packed, iter(chunked)):
+            recovered = self.firstparty_2b.receive_container_stream(
+                author = self.secondparty_2a,
+                secret = secret,
+                source = received,
+                chunk_size = 5000
+            )
+            self.assertEqual(b''.join(recovered), plaintext)
+        
+    def test_gobs_cipher2(self):
+        target = Ghid.pseudorandom(algo=1)
+        bind = self.firstparty_2a.make_bind_static(target=target)
+        gobs = self.firstparty_2b.unpack_bind_static(packed=bind.packed)
+        self.assertEqual(
+            self.firstparty_2b.receive_bind_static(
+                binder = self.secondparty_2a,
+                binding = gobs
+            ),
+            target
+        )
+        self.thirdparty_2.verify_object(self.secondparty_2a, gobs)
+        
+    def test_gobd_cipher2(self):
+        bind = self.firstparty_2a.make_bind_dynamic(
+            counter = 0,
+            target_vector = (Ghid.pseudorandom(algo=1),)
+        )
+        bind2 = self.firstparty_2a.make_bind_dynamic(
+            ghid_dynamic = bind.ghid_dynamic,
+            counter = 1,
+            target_vector = (
+                Ghid.pseudorandom(algo=1),
+                Ghid.pseudorandom(algo=1)
+            )
+        )
+        for packed in (bind.packed, bind2.packed):
+            gobd = self.firstparty_2b.unpack_bind_dynamic(packed=packed)
+            self.firstparty_2b.receive_bind_dynamic(
+                binder = self.secondparty_2a,
+                binding = gobd
+            )
+            self.thirdparty_2.verify_object(self.secondparty_2a, gobd)
+        
+    def test_gdxx_cipher2(self):
+        debind = self.firstparty_2a.make_debind(
+            target = Ghid.pseudorandom(algo=1)
+        )
+        gdxx = self.firstparty_2b.unpack_debind(packed=debind.packed)
+        self.firstparty_2b.receive_debind(
+            debinder = self.secondparty_2a,
+            debinding = gdxx
+        )
+        self.thirdparty_2.verify_object(self.secondparty_2a, gdxx)
+        
+    def test_garq_cipher2(self):
+        secret = self.firstparty_2a.new_secret()
+        target = Ghid.pseudorandom(algo=1)
+        requests = (
+            self.firstparty_2a.make_handshake(target=target, secret=secret),
+            self.firstparty_2a.make_ack(target=target),
+            self.firstparty_2a.make_nak(target=target)
+        )
+        
+        for request in requests:
+            garq = self.firstparty_2a.make_request(
+                recipient = self.secondparty_2b,
+                request = request
+            )
+            garq_up = self.firstparty_2b.unpack_request(packed=garq.packed)
+            received = self.firstparty_2b.receive_request(
+                requestor = self.secondparty_2a,
+                request = garq_up
+            )
+            self.assertEqual(received.target, target)
+            
+            # Only the recipient can open the request
+            with self.assertRaises(SecurityError):
+                self.firstparty_2a.unpack_request(packed=garq.packed)
+            
+        self.assertEqual(received.__class__, requests[2].__class__)
+        
+    def test_address_algo2(self):
+        firstparty = FirstParty2(address_algo=2)
+        self.assertEqual(firstparty.ghid.algo, 2)
+        secondparty = SecondParty2.from_packed(firstparty.second_party.packed)
+        self.assertEqual(secondparty.ghid, firstparty.ghid)
+        
+        secret = firstparty.new_secret()
+        container = firstparty.make_container(secret, _dummy_payload)
+        self.assertEqual(container.ghid.algo, 2)
+        geoc = self.firstparty_2b.unpack_container(container.packed)
+        self.assertEqual(
+            self.firstparty_2b.receive_container(secondparty, secret, geoc),
+            _dummy_payload
+        )
+        self.thirdparty_2.verify_object(secondparty, geoc)
+        
+    def test_unpack_request_many_cipher2(self):
+        target = Ghid.pseudorandom(algo=1)
+        secret = self.firstparty_2a.new_secret()
+        requests = [
+            self.firstparty_2a.make_handshake(target=target, secret=secret),
+            self.firstparty_2a.make_ack(target=target),
+            self.firstparty_2a.make_nak(target=target, status=7)
+        ]
+        inbox = [
+            bytes(self.firstparty_2a.make_request(
+                recipient = self.secondparty_2b,
+                request = request
+            ).packed)
+            for request in requests
+        ]
+        # Someone else's request, and some junk
+        inbox.append(bytes(self.firstparty_2b.make_request(
+            recipient = self.secondparty_2a,
+            request = self.firstparty_2b.make_ack(target=target)
+        ).packed))
+        inbox.append(b'GARQ' + bytes(10))
+        inbox.append(bytes(
+            self.firstparty_2a.make_debind(target=target).packed
+        ))
+        # Addressed to us, but not decryptable by us
+        inbox.append(_tamper_request(
+            self.firstparty_2a,
+            self.firstparty_2b.unpack_request(inbox[1])
+        ))
+        
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            for pool, prefetch in ((None, 16), (executor, 16), (executor, 1)):
+                results = list(self.firstparty_2b.unpack_request_many(
+                    inbox,
+                    executor = pool,
+                    prefetch = prefetch
+                ))
+                by_packed = {
+                    bytes(packed): result for packed, result in results
+                }
+                
+                self.assertEqual(len(results), 6)
+                self.assertNotIn(inbox[3], by_packed)
+                self.assertIsInstance(by_packed[inbox[4]], ParseError)
+                self.assertIsInstance(by_packed[inbox[5]], ParseError)
+                self.assertIsInstance(by_packed[inbox[6]], SecurityError)
+                
+                for packed, request in zip(inbox, requests):
+                    received = self.firstparty_2b.receive_request(
+                        requestor = self.secondparty_2a,
+                        request = by_packed[packed]
+                    )
+                    self.assertEqual(type(received), type(request))
+                    self.assertEqual(received.target, target)
+                self.assertEqual(received.status, 7)
+        
     # Don't bother testing asymmetric in trashtest (should simply raise)
 
                 
@@ -0,0 +1,315 @@
+'''
+Scratchpad for test-based development. Unit tests for _codec.py.
+
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+
+import io
+import unittest
+import tracemalloc
+
+# These are normal inclusions
+from golix import Ghid
+from golix import ParseError
+
+# These are abnormal (don't use in production) inclusions.
+from golix import _getlow
+from golix import _codec
+from golix._getlow import GEOC
+from golix._getlow import GIDC
+from golix._getlow import GOBS
+from golix._getlow import GOBD
+from golix._getlow import GDXX
+from golix._getlow import GARQ
+
+from golix.crypto_utils import _dummy_signature
+from golix.crypto_utils import _dummy_mac
+from golix.crypto_utils import _dummy_asym
+from golix.crypto_utils import _dummy_pubkey
+from golix.crypto_utils import _dummy_pubkey_exchange
+from golix.utils import _dummy_ghid
+
+
+# ###############################################
+# Testing
+# ###############################################
+        
+        
+_dummy_payload = \
+    b'[[ PLACEHOLDER ENCRYPTED SYMMETRIC MESSAGE. Hello, world? ]]'
+_rls_author = Ghid.pseudorandom(1)
+
+
+def _new_objects():
+    ''' Create one of every object type, along with the (dummy)
+    signature to pack it with.
+    '''
+    gidc = GIDC(
+        signature_key = _dummy_pubkey,
+        encryption_key = _dummy_pubkey,
+        exchange_key = _dummy_pubkey_exchange,
+    )
+    geoc = GEOC(author=_rls_author, payload=_dummy_payload)
+    gobs = GOBS(binder=_rls_author, target=_dummy_ghid)
+    gobd = GOBD(
+        binder = _rls_author,
+        counter = 42,
+        target_vector = (_dummy_ghid,)
+    )
+    gobd_hist = GOBD(
+        binder = _rls_author,
+        counter = 43,
+        target_vector = (_dummy_ghid, Ghid.pseudorandom(1)),
+        ghid_dynamic = Ghid.pseudorandom(1)
+    )
+    gdxx = GDXX(debinder=_rls_author, target=_dummy_ghid)
+    garq = GARQ(recipient=_rls_author, payload=_dummy_asym)
+    
+    objs = [(gidc, None)]
+    for obj in (geoc, gobs, gobd, gobd_hist, gdxx):
+        objs.append((obj, _dummy_signature))
+    objs.append((garq, _dummy_mac))
+    return objs
+
+
+def _make_objects(address_algo):
+    ''' Create, pack, and sign one of every object type.
+    '''
+    objs = []
+    for obj, signature in _new_objects():
+        obj.pack(cipher=0, address_algo=address_algo)
+        if signature is not None:
+            obj.pack_signature(signature)
+        objs.append(obj)
+    return objs
+
+
+class CodecTest(unittest.TestCase):
+    ''' Make sure the struct codec is interchangeable with smartyparse.
+    '''
+    
+    def setUp(self):
+        self._engine = _getlow.get_engine()
+        
+    def tearDown(self):
+        _getlow.set_engine(self._engine)
+        
+    def test_byte_compatibility(self):
+        for address_algo in (0, 1):
+            # Ghids for GOBDs and the like are pseudorandom, so we need to
+            # repack the exact same objects with the other engine.
+            _getlow.set_engine('smartyparse')
+            objs = _make_objects(address_algo)
+            
+            for obj in objs:
+                sp_packed = bytes(obj.packed)
+                
+                _getlow.set_engine('struct')
+                self.assertEqual(
+                    bytes(type(obj).CODEC.pack(obj._control)),
+                    sp_packed
+                )
+                st_unpacked = type(obj).unpack(sp_packed)
+                self.assertEqual(obj, st_unpacked)
+                
+                _getlow.set_engine('smartyparse')
+                sp_unpacked = type(obj).unpack(sp_packed)
+                self.assertEqual(sp_unpacked, st_unpacked)
+                
+    def test_struct_roundtrip(self):
+        _getlow.set_engine('struct')
+        for obj in _make_objects(1):
+            unpacked = type(obj).unpack(obj.packed)
+            self.assertEqual(obj, unpacked)
+            # Trailing data is ignored, same as smartyparse.
+            unpacked = type(obj).unpack(bytes(obj.packed) + b'garbage')
+            self.assertEqual(obj, unpacked)
+            
+    def test_pack_into(self):
+        for engine in _getlow.ENGINES:
+            _getlow.set_engine(engine)
+            objs = _make_objects(1)
+            new_objs = _new_objects()
+            
+            sizes = [obj.packed_size(1, 0) for obj, signature in new_objs]
+            self.assertEqual(sizes, [len(obj.packed) for obj in objs])
+            
+            # Pack everything back-to-back into one buffer
+            segment = bytearray(sum(sizes) + 3)
+            offset = 3
+            for obj, signature in new_objs:
+                offset = obj.pack_into(segment, offset, 1, 0)
+                if signature is not None:
+                    obj.pack_signature(signature)
+            self.assertEqual(offset, len(segment))
+            
+            offset = 3
+            for obj, (new_obj, signature) in zip(objs, new_objs):
+                end = offset + len(obj.packed)
+                # Ghids for GOBDs without history are pseudorandom.
+                if obj.magic != b'GOBD':
+                    self.assertEqual(segment[offset:end], obj.packed)
+                self.assertEqual(new_obj.packed, segment[offset:end])
+                self.assertEqual(type(obj).unpack(new_obj.packed), new_obj)
+                offset = end
+                
+            with self.assertRaises(ValueError):
+                GOBS(
+                    binder = _rls_author,
+                    target = _dummy_ghid
+                ).pack_into(bytearray(10), 0, 1, 0)
+        
+    def test_empty_payload(self):
+        _getlow.set_engine('struct')
+        geoc = GEOC(author=_rls_author, payload=b'')
+        geoc.pack(cipher=0, address_algo=1)
+        geoc.pack_signature(_dummy_signature)
+        self.assertEqual(GEOC.unpack(geoc.packed).payload, b'')
+        
+    def test_zero_copy_unpack(self):
+        # Unpacking a big container shouldn't copy the payload (or the rest
+        # of the object, for hashing).
+        for engine in _getlow.ENGINES:
+            _getlow.set_engine(engine)
+            payload = bytes(8 * 1024 * 1024)
+            geoc = GEOC(author=_rls_author, payload=payload)
+            geoc.pack(cipher=0, address_algo=1)
+            geoc.pack_signature(_dummy_signature)
+            packed = bytes(geoc.packed)
+            del geoc
+            
+            tracemalloc.start()
+            try:
+                geoc_r = GEOC.unpack(packed)
+                __, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+                
+            self.assertLess(peak, len(payload) // 8)
+            self.assertIsInstance(geoc_r.payload, memoryview)
+            self.assertIs(geoc_r.payload.obj, packed)
+            self.assertEqual(geoc_r.payload, payload)
+        
+    def test_abstract_hooks(self):
+        # Subclasses missing a hook fail when created, not when packing
+        class Codec(_codec._CodecBase):
+            def _get_body_size(self, body, cipher):
+                return 0
+                
+        class Obj(_getlow._GolixObjectBase):
+            pass
+            
+        with self.assertRaisesRegex(TypeError, 'abstract'):
+            Codec()
+        with self.assertRaisesRegex(TypeError, 'abstract'):
+            Obj()
+            
+    def test_malformed(self):
+        _getlow.set_engine('struct')
+        geoc = _make_objects(1)[1]
+        packed = bytes(geoc.packed)
+        
+        with self.assertRaises(ParseError):
+            GEOC.unpack(packed[:-1])
+        with self.assertRaises(ParseError):
+            GEOC.unpack(packed[:3])
+        with self.assertRaises(ParseError):
+            GOBS.unpack(packed)
+        with self.assertRaises(ParseError):
+            # Bad version
+            GEOC.unpack(packed[:4] + b'\x00\x00\x00\x01' + packed[8:])
+        with self.assertRaises(ParseError):
+            # Bad cipher
+            GEOC.unpack(packed[:8] + b'\xff' + packed[9:])
+        with self.assertRaises(ParseError):
+            # Bad author address algo
+            GEOC.unpack(packed[:9] + b'\xff' + packed[10:])
+        with self.assertRaises(ParseError):
+            # Payload length running off the end
+            GEOC.unpack(packed[:74] + b'\xff' * 8 + packed[82:])
+        
+    def test_iter_packed_limits(self):
+        objs = _make_objects(1)
+        stream = b''.join(bytes(obj.packed) for obj in objs)
+        for source in (stream, io.BytesIO(stream)):
+            self.assertEqual(len(list(_getlow.iter_packed(source))), len(objs))
+            
+        geoc = bytes(objs[1].packed)
+        limits = {b'GEOC': len(geoc) - 1}
+        for source in (geoc, io.BytesIO(geoc)):
+            with self.assertRaises(ParseError):
+                list(_getlow.iter_packed(source, limits=limits))
+                
+        # A hostile payload length must not be read (or allocated)
+        hostile = geoc[:74] + b'\x7f' + b'\xff' * 7 + geoc[82:]
+        for limits in (None, {b'GEOC': 1 << 20}):
+            source = io.BytesIO(hostile)
+            with self.assertRaises(ParseError):
+                list(_getlow.iter_packed(source, limits=limits))
+            self.assertLess(source.tell(), len(geoc))
+        
+    def test_peek(self):
+        objs = _make_objects(1)
+        for obj in objs:
+            packed = bytes(obj.packed)
+            peeked = _getlow.peek(packed + b'trailing')
+            self.assertEqual(peeked.magic, obj.magic)
+            self.assertEqual(peeked.version, obj.version)
+            self.assertEqual(peeked.cipher, obj.cipher)
+            self.assertEqual(peeked.length, len(packed))
+            self.assertEqual(peeked.ghid, obj.ghid)
+            
+            with self.assertRaises(ParseError):
+                _getlow.peek(packed[:-1])
+            with self.assertRaises(ParseError):
+                _getlow.peek(packed, limits={obj.magic: len(packed) - 1})
+                
+        gidc, geoc, gobs, gobd, gobd_hist, gdxx, garq = objs
+        self.assertIsNone(_getlow.peek(gidc.packed).author)
+        self.assertEqual(_getlow.peek(geoc.packed).author, geoc.author)
+        self.assertEqual(_getlow.peek(gobs.packed).binder, gobs.binder)
+        self.assertEqual(_getlow.peek(gobd.packed).binder, gobd.binder)
+        self.assertEqual(
+            _getlow.peek(gobd_hist.packed).ghid_dynamic,
+            gobd_hist.ghid_dynamic
+        )
+        self.assertEqual(_getlow.peek(gdxx.packed).debinder, gdxx.debinder)
+        self.assertEqual(_getlow.peek(garq.packed).recipient, garq.recipient)
+        
+        # Oversized containers are rejected before reaching the ghid
+        huge = bytes(geoc.packed[:74]) + b'\xff' * 8
+        with self.assertRaisesRegex(ParseError, 'size limit'):
+            _getlow.peek(huge, limits={b'GEOC': 1 << 20})
+        
+        
+if __name__ == '__main__':
+    unittest.main()
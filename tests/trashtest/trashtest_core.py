@@ -0,0 +1,151 @@
+'''
+Scratchpad for test-based development. Unit tests for core.py.
+
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+
+import unittest
+
+# These are normal inclusions
+from golix import ParseError
+from golix import SecurityError
+from golix import SecondPartyRegistry
+
+# These are abnormal (don't use in production) inclusions.
+from golix.cipher import FirstParty1
+from golix.cipher import SecondParty1
+from golix.cipher import ThirdParty1
+from golix.utils import _LRUCache
+
+
+# ###############################################
+# Testing
+# ###############################################
+        
+        
+class LRUTest(unittest.TestCase):
+    def test_eviction(self):
+        evicted = []
+        cache = _LRUCache(2, on_evict=lambda key, value: evicted.append(key))
+        cache.put(1, 'a')
+        cache.put(2, 'b')
+        self.assertEqual(cache.get(1), 'a')
+        cache.put(3, 'c')
+        # 2 was least-recently used
+        self.assertEqual(evicted, [2])
+        self.assertIsNone(cache.get(2))
+        cache.discard(1)
+        self.assertEqual(evicted, [2, 1])
+        
+        info = cache.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.evictions, 1)
+        self.assertEqual(info.currsize, 1)
+        
+    def test_setdefault(self):
+        evicted = []
+        cache = _LRUCache(2, on_evict=lambda key, value: evicted.append(key))
+        self.assertEqual(cache.setdefault(1, 'a'), 'a')
+        # Existing entries are never replaced (or evicted)
+        self.assertEqual(cache.setdefault(1, 'b'), 'a')
+        self.assertEqual(evicted, [])
+        cache.setdefault(2, 'b')
+        cache.setdefault(1, 'c')
+        cache.setdefault(3, 'c')
+        self.assertEqual(evicted, [2])
+        self.assertEqual(cache.get(1), 'a')
+        
+        
+class RegistryTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.firstparties = [FirstParty1() for ii in range(3)]
+        
+    def test_registry(self):
+        registry = SecondPartyRegistry(maxsize=2)
+        packeds = [
+            bytes(firstparty.second_party.packed)
+            for firstparty in self.firstparties
+        ]
+        self.assertEqual(registry.preload(packeds[:2]), 2)
+        self.assertEqual(len(registry), 2)
+        
+        second_party = registry.load(packeds[0])
+        self.assertIs(registry.load(packeds[0]), second_party)
+        self.assertEqual(second_party.ghid, self.firstparties[0].ghid)
+        # Keys are built lazily
+        self.assertEqual(second_party._keys._unpacked, {})
+        
+        # Use it to verify something, which only needs the signature key
+        gobs = self.firstparties[0].make_bind_static(
+            target = self.firstparties[1].ghid
+        )
+        ThirdParty1().verify_object(second_party, gobs)
+        self.assertEqual(set(second_party._keys._unpacked), {'signature'})
+        
+        # Loading a third evicts the least-recently used
+        registry.load(packeds[2])
+        self.assertIn(self.firstparties[0].ghid, registry)
+        self.assertNotIn(self.firstparties[1].ghid, registry)
+        self.assertIsNone(registry.get(self.firstparties[1].ghid))
+        
+        info = registry.cache_info()
+        self.assertEqual(info.hits, 2)
+        self.assertEqual(info.misses, 4)
+        self.assertEqual(info.evictions, 1)
+        
+        with self.assertRaises(ParseError):
+            registry.load(gobs.packed)
+            
+    def test_reused_buffer(self):
+        ''' The registry must not depend on the buffer it loaded from.
+        '''
+        registry = SecondPartyRegistry()
+        first, evil = self.firstparties[:2]
+        buf = bytearray(first.second_party.packed)
+        second_party = registry.load(buf)
+        buf[:] = evil.second_party.packed
+        
+        self.assertEqual(
+            bytes(registry.get(first.ghid).packed),
+            bytes(first.second_party.packed)
+        )
+        gobs = evil.make_bind_static(target=first.ghid)
+        with self.assertRaises(SecurityError):
+            ThirdParty1().verify_object(second_party, gobs)
+        gobs = first.make_bind_static(target=evil.ghid)
+        self.assertTrue(ThirdParty1().verify_object(second_party, gobs))
+        
+        
+if __name__ == '__main__':
+    unittest.main()
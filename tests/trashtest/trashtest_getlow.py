@@ -35,10 +35,13 @@ golix: A python library for Golix protocol object manipulation.
 
 import unittest
 import sys
+import hashlib
 import collections
+import concurrent.futures
 
 # These are normal inclusions
 from golix import Ghid
+from golix import SecurityError
 
 # These are abnormal (don't use in production) inclusions.
 from golix._getlow import GEOC
@@ -53,6 +56,8 @@ from golix._getlow import GARQNak
 from golix._getlow import GARQElse
 
 from golix.crypto_utils import Secret
+from golix.crypto_utils import AddressAlgo1
+from golix.crypto_utils import AddressAlgo2
 from golix.crypto_utils import _dummy_signature
 from golix.crypto_utils import _dummy_mac
 from golix.crypto_utils import _dummy_asym
@@ -181,6 +186,67 @@ class TestLow(unittest.TestCase):
         
         self.assertEqual(gobd_2, gobd_2r)
         
+    def test_gobd_address_tamper(self):
+        gobd = GOBD(
+            binder = _rls_author,
+            counter = 0,
+            target_vector = (_dummy_ghid,)
+        )
+        gobd.pack(cipher=0, address_algo=1)
+        gobd.pack_signature(_dummy_signature)
+        
+        # The dynamic address is covered by the static one, and both are
+        # computed in one pass, so check that each is actually verified.
+        dynamic_offset = gobd._get_address_offset_dynamic()
+        static_offset = gobd._get_address_offset()
+        for offset in (dynamic_offset, static_offset):
+            tampered = bytearray(gobd.packed)
+            tampered[offset] ^= 1
+            with self.assertRaises(SecurityError):
+                GOBD.unpack(tampered)
+                
+    def test_segmented_address(self):
+        data = bytes(range(256)) * 10
+        view = memoryview(data)
+        segments = [view[:1], view[1:1000], view[1000:]]
+        address = AddressAlgo1.create(data)
+        self.assertEqual(AddressAlgo1.create_from(segments), address)
+        self.assertTrue(AddressAlgo1.verify_from(address, segments))
+        with self.assertRaises(SecurityError):
+            AddressAlgo1.verify_from(address, segments[1:])
+        
+    def test_blake2b_address(self):
+        # Known-answer check, plus round trips through segmented hashing
+        # and the GOBD single-pass dynamic address.
+        data = bytes(range(256)) * 10
+        address = AddressAlgo2.create(data)
+        self.assertEqual(address, hashlib.blake2b(data).digest())
+        self.assertTrue(AddressAlgo2.verify_from(
+            address,
+            (data[:100], data[100:])
+        ))
+        
+        geoc = GEOC(author=_rls_author, payload=_dummy_payload)
+        geoc.pack(cipher=0, address_algo=2)
+        geoc.pack_signature(_dummy_signature)
+        geoc_r = GEOC.unpack(geoc.packed)
+        self.assertEqual(geoc_r.ghid.algo, 2)
+        self.assertEqual(geoc, geoc_r)
+        
+        gobd = GOBD(
+            binder = _rls_author,
+            counter = 0,
+            target_vector = (_dummy_ghid,)
+        )
+        gobd.pack(cipher=0, address_algo=2)
+        gobd.pack_signature(_dummy_signature)
+        self.assertEqual(gobd, GOBD.unpack(gobd.packed))
+        
+        tampered = bytearray(geoc.packed)
+        tampered[20] ^= 1
+        with self.assertRaises(SecurityError):
+            GEOC.unpack(tampered)
+        
     def test_gobd_real_address_with_history(self):
         # GOBD actual address test, with history
         gobd_3 = GOBD(
@@ -301,6 +367,51 @@ class TestLow(unittest.TestCase):
         asel_1r = GARQElse.unpack(asel_1p)
         
         self.assertEqual(asel_1, asel_1r)
+        
+    def test_unpack_leaves_parsers_alone(self):
+        # Unpacking must not register anything on the shared parsers.
+        callbacks = {
+            parser: dict(parser['ghid'].callbacks)
+            for parser in (_gidc, _geoc, _gobs, _gobd, _gdxx, _garq)
+        }
+        callbacks_dynamic = dict(_gobd['ghid_dynamic'].callbacks)
+        
+        geoc_1 = GEOC(author=_rls_author, payload=_dummy_payload)
+        geoc_1.pack(cipher=0, address_algo=1)
+        geoc_1.pack_signature(_dummy_signature)
+        GEOC.unpack(geoc_1.packed)
+        
+        gobd_1 = GOBD(
+            binder = _rls_author,
+            counter = 0,
+            target_vector = (_dummy_ghid,)
+        )
+        gobd_1.pack(cipher=0, address_algo=1)
+        gobd_1.pack_signature(_dummy_signature)
+        GOBD.unpack(gobd_1.packed)
+        
+        for parser, before in callbacks.items():
+            self.assertEqual(before, parser['ghid'].callbacks)
+        self.assertEqual(callbacks_dynamic, _gobd['ghid_dynamic'].callbacks)
+        
+    def test_threaded_unpack(self):
+        # Concurrent unpacks of differently-sized objects must not trample
+        # each other's parser state.
+        geocs = []
+        for ii in range(1, 33):
+            geoc = GEOC(author=_rls_author, payload=_dummy_payload * ii)
+            geoc.pack(cipher=0, address_algo=1)
+            geoc.pack_signature(_dummy_signature)
+            geocs.append(geoc)
+            
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+            unpacked = list(pool.map(
+                GEOC.unpack,
+                [geoc.packed for geoc in geocs] * 4
+            ))
+            
+        for geoc, geoc_r in zip(geocs * 4, unpacked):
+            self.assertEqual(geoc, geoc_r)
 
 
 if __name__ == '__main__':
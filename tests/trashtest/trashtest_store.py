@@ -0,0 +1,567 @@
+'''
+Scratchpad for test-based development. Unit tests for the object store.
+
+
+golix: A python library for Golix protocol object manipulation.
+    Copyright (C) 2016 Muterra, Inc.
+    
+    Contributors
+    ------------
+    Nick Badger
+        badg@muterra.io | badg@nickbadger.com | nickbadger.com
+        
+    This library is free software; you can redistribute it and/or
+    modify it under the terms of the GNU Lesser General Public
+    License as published by the Free Software Foundation; either
+    version 2.1 of the License, or (at your option) any later version.
+    
+    This library is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+    Lesser General Public License for more details.
+    
+    You should have received a copy of the GNU Lesser General Public
+    License along with this library; if not, write to the
+    Free Software Foundation, Inc.,
+    51 Franklin Street,
+    Fifth Floor,
+    Boston, MA  02110-1301 USA
+
+------------------------------------------------------
+
+'''
+
+# Global dependencies
+import unittest
+import os
+import tempfile
+import struct
+import threading
+import concurrent.futures
+
+# These are normal inclusions
+from golix import Ghid
+from golix import ParseError
+from golix import SecurityError
+from golix.store import SegmentLog
+from golix.store import ObjectStore
+from golix.store import GhidIndex
+from golix.store import Location
+from golix.store import BindingGraph
+from golix.store import GarbageCollector
+
+# These are abnormal (don't use in production) inclusions.
+from golix.cipher import FirstParty2
+from golix._getlow import GEOC
+
+
+# ###############################################
+# Testing
+# ###############################################
+
+
+class ObjectStoreTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.firstparty = FirstParty2()
+        
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.directory = self._tempdir.name
+        
+    def tearDown(self):
+        self._tempdir.cleanup()
+        
+    def _make_objects(self, count):
+        secret = self.firstparty.new_secret()
+        objs = []
+        for ii in range(count):
+            objs.append(
+                self.firstparty.make_container(secret, bytes([ii]) * 100)
+            )
+            objs.append(
+                self.firstparty.make_bind_static(target=objs[-1].ghid)
+            )
+        return objs
+        
+    def test_put_get(self):
+        objs = self._make_objects(5)
+        with ObjectStore(self.directory) as store:
+            for obj in objs:
+                self.assertEqual(store.put(obj.packed), obj.ghid)
+            # Duplicates are ignored
+            store.put(objs[0].packed)
+            self.assertEqual(len(store), len(objs))
+            
+            for obj in objs:
+                self.assertIn(obj.ghid, store)
+                self.assertEqual(store.get(obj.ghid), obj.packed)
+                self.assertEqual(store.get_object(obj.ghid), obj)
+                
+            geoc = GEOC.unpack(store.get(objs[0].ghid))
+            self.assertEqual(bytes(geoc.payload), bytes(objs[0].payload))
+            self.assertEqual(store.locate(objs[0].ghid).magic, b'GEOC')
+            self.assertEqual(store.locate(objs[1].ghid).magic, b'GOBS')
+            
+            with self.assertRaises(KeyError):
+                store.get(Ghid.pseudorandom(1))
+                
+    def test_verify_on_put(self):
+        packed = bytearray(self._make_objects(1)[0].packed)
+        packed[-100] ^= 1
+        with ObjectStore(self.directory) as store:
+            with self.assertRaises(SecurityError):
+                store.put(packed)
+            with self.assertRaises(ParseError):
+                store.put(b'junk' + bytes(100))
+            self.assertEqual(len(store), 0)
+            
+    def test_trailing_data(self):
+        obj = self._make_objects(1)[0]
+        with ObjectStore(self.directory) as store:
+            store.put(bytes(obj.packed) + b'junk')
+            self.assertEqual(store.get(obj.ghid), obj.packed)
+            
+        with ObjectStore(self.directory) as store:
+            self.assertEqual(store.get(obj.ghid), obj.packed)
+            self.assertEqual(len(store), 1)
+            
+    def test_reopen(self):
+        objs = self._make_objects(20)
+        with ObjectStore(self.directory, segment_size=1000) as store:
+            store.put_many(b''.join(bytes(obj.packed) for obj in objs))
+            store.sync()
+            segments = len(store._log.segments)
+        self.assertGreater(segments, 1)
+        
+        with ObjectStore(self.directory, segment_size=1000) as store:
+            self.assertEqual(len(store), len(objs))
+            for obj in objs:
+                self.assertEqual(store.get(obj.ghid), obj.packed)
+            self.assertEqual(set(store), {obj.ghid for obj in objs})
+            
+    def test_torn_write(self):
+        objs = self._make_objects(3)
+        with ObjectStore(self.directory) as store:
+            for obj in objs:
+                store.put(obj.packed)
+            segment = store._log._path(store._log.segments[-1])
+            
+        # Simulate a crash partway through writing another object
+        with open(segment, 'ab') as f:
+            f.write(bytes(self._make_objects(1)[0].packed)[:50])
+            
+        with ObjectStore(self.directory) as store:
+            self.assertEqual(len(store), len(objs))
+            extra = self._make_objects(1)[0]
+            store.put(extra.packed)
+            
+        with ObjectStore(self.directory) as store:
+            self.assertEqual(len(store), len(objs) + 1)
+            self.assertEqual(store.get(extra.ghid), extra.packed)
+            
+        # Even if the torn write didn't get as far as the magic
+        with open(segment, 'ab') as f:
+            f.write(b'GE')
+        with ObjectStore(self.directory) as store:
+            self.assertEqual(len(store), len(objs) + 1)
+            
+    def test_corrupt_segment(self):
+        objs = self._make_objects(3)
+        with SegmentLog(self.directory) as log:
+            positions = [log.append(obj.packed) for obj in objs]
+            end = log.end
+        segment = os.path.join(self.directory, '00000000.seg')
+        with open(segment, 'r+b') as f:
+            f.seek(positions[1][1])
+            f.write(b'junk')
+            
+        # Corruption anywhere but a torn tail must not truncate the log
+        with self.assertRaises(ParseError):
+            SegmentLog(self.directory)
+        self.assertEqual(os.path.getsize(segment), end[1])
+        
+    def test_readonly_end(self):
+        objs = self._make_objects(2)
+        with SegmentLog(self.directory, readonly=True) as reader:
+            self.assertEqual(reader.end, (0, 0))
+            with SegmentLog(self.directory, segment_size=500) as writer:
+                for obj in objs:
+                    writer.append(obj.packed)
+                self.assertEqual(reader.end, writer.end)
+                
+    def test_unindexed_tail(self):
+        # Objects in the log that never made it into the index, eg from a
+        # crash between the two.
+        objs = self._make_objects(3)
+        with ObjectStore(self.directory) as store:
+            store.put(objs[0].packed)
+            segment = store._log._path(store._log.segments[-1])
+        with open(segment, 'ab') as f:
+            for obj in objs[1:]:
+                f.write(obj.packed)
+                
+        with ObjectStore(self.directory) as store:
+            self.assertEqual(len(store), len(objs))
+            for obj in objs:
+                self.assertEqual(store.get(obj.ghid), obj.packed)
+                
+    def test_index_ahead_of_log(self):
+        objs = self._make_objects(3)
+        with ObjectStore(self.directory) as store:
+            for obj in objs:
+                store.put(obj.packed)
+            segment = store._log._path(store._log.segments[-1])
+            end = store._log.end[1]
+            
+        # Lose the last object from the log
+        with open(segment, 'r+b') as f:
+            f.truncate(end - len(objs[-1].packed))
+            
+        with ObjectStore(self.directory) as store:
+            self.assertEqual(len(store), len(objs) - 1)
+            self.assertNotIn(objs[-1].ghid, store)
+            
+    def test_readonly(self):
+        objs = self._make_objects(30)
+        with ObjectStore(self.directory, segment_size=2000) as writer:
+            writer._index.close()
+            writer._index = GhidIndex(writer._index_path, capacity=8)
+            writer.put(objs[0].packed)
+            
+            with ObjectStore(self.directory, readonly=True) as reader:
+                self.assertEqual(reader.get(objs[0].ghid), objs[0].packed)
+                # These grow both the index and the log
+                for obj in objs[1:]:
+                    writer.put(obj.packed)
+                for obj in objs:
+                    self.assertEqual(reader.get(obj.ghid), obj.packed)
+                with self.assertRaises(TypeError):
+                    reader.put(objs[0].packed)
+
+
+class GhidIndexTest(unittest.TestCase):
+    def test_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'index')
+            ghids = [Ghid.pseudorandom(1) for ii in range(1000)]
+            
+            with GhidIndex(path, capacity=16) as index:
+                for ii, ghid in enumerate(ghids):
+                    index[ghid] = Location(ii, ii * 2, ii * 3, b'GOBS')
+                self.assertGreaterEqual(index.capacity, 1024)
+                index.set_high_water(5, 6)
+                index.sync()
+                
+            with GhidIndex(path, readonly=True) as index:
+                self.assertEqual(len(index), len(ghids))
+                self.assertEqual(index.high_water, (5, 6))
+                for ii, ghid in enumerate(ghids):
+                    self.assertEqual(
+                        index[ghid],
+                        Location(ii, ii * 2, ii * 3, b'GOBS')
+                    )
+                self.assertNotIn(Ghid.pseudorandom(1), index)
+                self.assertEqual(set(index), set(ghids))
+                
+                with self.assertRaises(TypeError):
+                    index[ghids[0]] = Location(0, 0, 0, b'GOBS')
+                    
+            # The header size is fixed, and recorded, regardless of platform
+            with open(path, 'rb') as f:
+                header = f.read(12)
+            self.assertEqual(struct.unpack('>I', header[8:12])[0], 4096)
+            self.assertEqual(
+                os.path.getsize(path),
+                4096 + index.capacity * 87
+            )
+            
+    def test_lookups_during_growth(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'index')
+            ghids = [Ghid.pseudorandom(1) for ii in range(2000)]
+            errors = []
+            done = threading.Event()
+            
+            def lookup():
+                try:
+                    while not done.is_set():
+                        for ghid in ghids[:50]:
+                            ghid in index
+                            index.get(ghid)
+                except Exception as exc:
+                    errors.append(exc)
+                    
+            with GhidIndex(path, capacity=8) as index:
+                thread = threading.Thread(target=lookup)
+                thread.start()
+                try:
+                    for ii, ghid in enumerate(ghids):
+                        index[ghid] = Location(0, ii, 1, b'GOBS')
+                finally:
+                    done.set()
+                    thread.join()
+                self.assertEqual(errors, [])
+                self.assertEqual(
+                    index.get(ghids[10]),
+                    Location(0, 10, 1, b'GOBS')
+                )
+
+
+class BindingGraphTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.alice = FirstParty2()
+        cls.bob = FirstParty2()
+        
+    def _scenario(self):
+        target = Ghid.pseudorandom(1)
+        other = Ghid.pseudorandom(1)
+        static = self.alice.make_bind_static(target=target)
+        bob_static = self.bob.make_bind_static(target=target)
+        frame0 = self.alice.make_bind_dynamic(
+            counter = 0,
+            target_vector = (target,)
+        )
+        frame1 = self.alice.make_bind_dynamic(
+            counter = 1,
+            target_vector = (other, frame0.ghid),
+            ghid_dynamic = frame0.ghid_dynamic
+        )
+        debind = self.alice.make_debind(target=static.ghid)
+        # Bob can't debind Alice's bindings
+        forged = self.bob.make_debind(target=frame0.ghid_dynamic)
+        objs = [static, bob_static, frame0, frame1, debind, forged]
+        return target, other, objs
+        
+    def _check(self, graph, target, other, objs):
+        static, bob_static, frame0, frame1, debind, forged = objs
+        dynamic = frame0.ghid_dynamic
+        
+        self.assertEqual(graph.bindings_of(target), {bob_static.ghid})
+        self.assertEqual(graph.binders_of(target), {self.bob.ghid})
+        self.assertEqual(graph.bindings_of(other), {dynamic})
+        self.assertEqual(graph.frame_of(dynamic), frame1.ghid)
+        self.assertEqual(graph.target_of(debind.ghid), static.ghid)
+        self.assertTrue(graph.is_debound(static.ghid))
+        self.assertEqual(graph.debindings_of(static.ghid), {debind.ghid})
+        self.assertFalse(graph.is_debound(dynamic))
+        self.assertFalse(graph.is_bound(Ghid.pseudorandom(1)))
+        
+    def test_any_order(self):
+        target, other, objs = self._scenario()
+        for ordering in (objs, objs[::-1], objs[2:] + objs[:2]):
+            graph = BindingGraph()
+            for obj in ordering:
+                self.assertTrue(graph.add(obj))
+            self._check(graph, target, other, objs)
+            
+        container = self.alice.make_container(
+            self.alice.new_secret(),
+            b'hello'
+        )
+        self.assertFalse(graph.add(container))
+        self.assertFalse(graph.add_packed(container.packed))
+        
+    def test_foreign_frames(self):
+        target = Ghid.pseudorandom(1)
+        other = Ghid.pseudorandom(1)
+        evil = Ghid.pseudorandom(1)
+        frame0 = self.alice.make_bind_dynamic(
+            counter = 0,
+            target_vector = (target,)
+        )
+        frame1 = self.alice.make_bind_dynamic(
+            counter = 1,
+            target_vector = (other, frame0.ghid),
+            ghid_dynamic = frame0.ghid_dynamic
+        )
+        # Bob can sign a frame claiming Alice's dynamic ghid, but can't
+        # make an initial frame for it.
+        squatter = self.bob.make_bind_dynamic(
+            counter = 100,
+            target_vector = (evil, frame0.ghid),
+            ghid_dynamic = frame0.ghid_dynamic
+        )
+        dynamic = frame0.ghid_dynamic
+        
+        graph = BindingGraph()
+        graph.add(squatter)
+        graph.add(frame1)
+        # Nobody owns it until the initial frame arrives
+        self.assertIsNone(graph.frame_of(dynamic))
+        self.assertFalse(graph.is_bound(evil))
+        graph.add(frame0)
+        
+        orderings = [
+            [squatter, frame0, frame1],
+            [squatter, frame1, frame0],
+            [frame1, squatter, frame0],
+        ]
+        graphs = [graph]
+        for ordering in orderings:
+            graphs.append(BindingGraph())
+            for obj in ordering:
+                graphs[-1].add(obj)
+        with tempfile.TemporaryDirectory() as directory:
+            with ObjectStore(directory) as store:
+                for obj in (squatter, frame1, frame0):
+                    store.put(obj.packed)
+                graphs.append(BindingGraph.from_store(store))
+                
+        for graph in graphs:
+            self.assertEqual(graph.frame_of(dynamic), frame1.ghid)
+            self.assertEqual(graph.initial_frame_of(dynamic), frame0.ghid)
+            self.assertEqual(graph.owner(dynamic), self.alice.ghid)
+            self.assertEqual(graph.bindings_of(other), {dynamic})
+            self.assertFalse(graph.is_bound(evil))
+            self.assertFalse(graph.is_bound(target))
+        
+    def test_from_store(self):
+        target, other, objs = self._scenario()
+        with tempfile.TemporaryDirectory() as directory:
+            with ObjectStore(directory) as store:
+                for obj in objs:
+                    store.put(obj.packed)
+                store.put(self.alice.second_party.packed)
+                
+                self._check(
+                    BindingGraph.from_store(store, chunk_size=2),
+                    target,
+                    other,
+                    objs
+                )
+                with concurrent.futures.ProcessPoolExecutor(2) as executor:
+                    graph = BindingGraph.from_store(
+                        store,
+                        executor = executor,
+                        chunk_size = 2
+                    )
+                self._check(graph, target, other, objs)
+
+
+class GarbageCollectorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.alice = FirstParty2()
+        cls.bob = FirstParty2()
+        cls.secret = cls.alice.new_secret()
+        
+    def _container(self):
+        return self.alice.make_container(self.secret, os.urandom(16))
+        
+    def test_static(self):
+        gc = GarbageCollector()
+        container = self._container()
+        unbound = self._container()
+        bind = self.alice.make_bind_static(target=container.ghid)
+        bob_bind = self.bob.make_bind_static(target=container.ghid)
+        for obj in (container, unbound, bind, bob_bind):
+            gc.ingest(obj)
+            
+        # Bounded slices
+        self.assertEqual(gc.step(budget=3), 3)
+        self.assertEqual(gc.pending, 1)
+        gc.run()
+        self.assertEqual(gc.collect(), {unbound.ghid})
+        
+        gc.ingest(self.alice.make_debind(target=bind.ghid))
+        gc.run()
+        self.assertEqual(gc.collect(), {bind.ghid})
+        # Bob can't debind Alice's binding, but can debind his own
+        gc.ingest(self.bob.make_debind(target=bind.ghid))
+        gc.ingest(self.bob.make_debind(target=bob_bind.ghid))
+        gc.run()
+        self.assertEqual(gc.collect(), {bob_bind.ghid, container.ghid})
+        
+    def test_dynamic(self):
+        gc = GarbageCollector()
+        first = self._container()
+        second = self._container()
+        frame0 = self.alice.make_bind_dynamic(
+            counter = 0,
+            target_vector = (first.ghid,)
+        )
+        frame1 = self.alice.make_bind_dynamic(
+            counter = 1,
+            target_vector = (second.ghid, frame0.ghid),
+            ghid_dynamic = frame0.ghid_dynamic
+        )
+        
+        for obj in (first, second, frame0):
+            gc.ingest(obj)
+        gc.run()
+        self.assertEqual(gc.collectable, {second.ghid})
+        # Binding it before collection rescues it. The initial frame proves
+        # ownership, so it's kept until debinding.
+        gc.ingest(frame1)
+        gc.ingest(frame0)
+        gc.run()
+        self.assertEqual(gc.collect(), {first.ghid})
+        
+        frame2 = self.alice.make_bind_dynamic(
+            counter = 2,
+            target_vector = (second.ghid, frame1.ghid, frame0.ghid),
+            ghid_dynamic = frame0.ghid_dynamic
+        )
+        gc.ingest(frame2)
+        gc.run()
+        self.assertEqual(gc.collect(), {frame1.ghid})
+        
+        gc.ingest(self.alice.make_debind(target=frame0.ghid_dynamic))
+        gc.run()
+        self.assertEqual(
+            gc.collect(),
+            {second.ghid, frame0.ghid, frame2.ghid}
+        )
+        
+    def test_foreign_frames(self):
+        target = self._container()
+        frame0 = self.alice.make_bind_dynamic(
+            counter = 0,
+            target_vector = (target.ghid,)
+        )
+        squatter = self.bob.make_bind_dynamic(
+            counter = 100,
+            target_vector = (Ghid.pseudorandom(1), frame0.ghid),
+            ghid_dynamic = frame0.ghid_dynamic
+        )
+        
+        gc = GarbageCollector()
+        for obj in (squatter, target, frame0):
+            gc.ingest(obj)
+        gc.run()
+        # Neither Alice's frame nor the squatter's is collectable
+        self.assertEqual(gc.collect(), set())
+        
+        # Bob can't debind it either
+        gc.ingest(self.bob.make_debind(target=frame0.ghid_dynamic))
+        gc.run()
+        self.assertEqual(gc.collect(), set())
+        
+    def test_debind_first(self):
+        container = self._container()
+        bind = self.alice.make_bind_static(target=container.ghid)
+        debind = self.alice.make_debind(target=bind.ghid)
+        
+        gc = GarbageCollector()
+        for obj in (debind, bind, container):
+            gc.ingest_packed(obj.packed)
+        gc.run()
+        self.assertEqual(gc.collect(), {bind.ghid, container.ghid})
+        
+    def test_from_store(self):
+        container = self._container()
+        orphan = self._container()
+        bind = self.alice.make_bind_static(target=container.ghid)
+        with tempfile.TemporaryDirectory() as directory:
+            with ObjectStore(directory) as store:
+                for obj in (container, orphan, bind):
+                    store.put(obj.packed)
+                gc = GarbageCollector.from_store(store, chunk_size=1)
+            gc.run()
+            self.assertEqual(gc.collect(), {orphan.ghid})
+
+
+if __name__ == '__main__':
+    unittest.main()